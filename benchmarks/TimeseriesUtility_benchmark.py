@@ -0,0 +1,26 @@
+"""Benchmarks for TimeseriesUtility."""
+from geomagio import TimeseriesUtility
+
+from synthetic import get_stream, split_stream
+
+
+def benchmark_merge_streams_minute(benchmark, size):
+    streams = split_stream(get_stream(size=size, interval="minute"), overlap=60)
+    benchmark(TimeseriesUtility.merge_streams, *streams)
+
+
+def benchmark_merge_streams_second(benchmark, size):
+    streams = split_stream(get_stream(size=size, interval="second"), overlap=3600)
+    benchmark.pedantic(TimeseriesUtility.merge_streams, args=streams, rounds=1)
+
+
+def benchmark_get_stream_gaps_second(benchmark, size):
+    stream = get_stream(size=size, interval="second")
+    benchmark(TimeseriesUtility.get_stream_gaps, stream)
+
+
+def benchmark_get_trace_values_second(benchmark):
+    stream = get_stream(size="day", interval="second")
+    traces = stream.select(channel="H")
+    times = [traces[0].stats.starttime + i * 60 for i in range(1440)]
+    benchmark(TimeseriesUtility.get_trace_values, traces, times)
@@ -0,0 +1,36 @@
+"""Benchmarks for algorithms."""
+from geomagio.algorithm import FilterAlgorithm, SqDistAlgorithm
+
+from synthetic import get_stream
+
+
+def benchmark_filter_tenhertz_to_second(benchmark, size):
+    # 10Hz data is large, limit to one channel
+    stream = get_stream(size=size, interval="tenhertz", channels=["H"])
+    algorithm = FilterAlgorithm(input_sample_period=0.1, output_sample_period=1.0)
+    benchmark.pedantic(algorithm.process, args=(stream,), rounds=1)
+
+
+def benchmark_filter_second_to_minute(benchmark, size):
+    stream = get_stream(size=size, interval="second")
+    algorithm = FilterAlgorithm(input_sample_period=1.0, output_sample_period=60.0)
+    benchmark.pedantic(algorithm.process, args=(stream,), rounds=3)
+
+
+def benchmark_filter_minute_to_hour(benchmark, size):
+    stream = get_stream(size=size, interval="minute")
+    algorithm = FilterAlgorithm(input_sample_period=60.0, output_sample_period=3600.0)
+    benchmark(algorithm.process, stream)
+
+
+def benchmark_sqdist_minute(benchmark, size):
+    stream = get_stream(size=size, interval="minute", channels=["H"])
+
+    def process():
+        # new algorithm each round, sqdist keeps state between calls
+        algorithm = SqDistAlgorithm(
+            alpha=2.3148e-5, beta=0, gamma=3.3333e-2, m=1440, smooth=180
+        )
+        return algorithm.process(stream)
+
+    benchmark.pedantic(process, rounds=1)
@@ -0,0 +1,17 @@
+import pytest
+
+from synthetic import SIZES
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--sizes",
+        default="day,month",
+        help="Comma separated benchmark sizes, from {}".format(",".join(SIZES)),
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("sizes").split(",")
+        metafunc.parametrize("size", sizes)
@@ -0,0 +1,64 @@
+"""Benchmarks for parsers and writers."""
+import io
+
+from geomagio.iaga2002 import IAGA2002Parser, IAGA2002Writer
+from geomagio.imfjson import IMFJSONWriter
+from geomagio.imfv283 import IMFV283Parser
+
+from synthetic import SIZES, get_stream
+
+
+CHANNELS = ["H", "E", "Z", "F"]
+
+# GOES message with 12 minutes of FRD data
+IMFV283_MESSAGE = (
+    b"75C2102614023012927G43-0NN027EUP00191bx@WyhD{"
+    + b"a\x7fDB~@X@{Bb@@@@@@@@@@@@@@@@@@@@@@@@@@@@[DAV[@cUAjT@[EAVZ@cUAjT@["
+    + b"BAVZ@cVAjS@[DAVZ@cUAjS@[DAVZ@cUAjS@[GAV\\@cTAjT@[DAV[@cUAjT@[BAVY"
+    + b"@cVAjT@[CAVW@cWAjT@[CAVT@cWAjU@[AAVO@cYAjV@Z}AVK@c[AjV"
+)
+
+
+def get_iaga2002(stream):
+    out = io.BytesIO()
+    IAGA2002Writer().write(out, stream, CHANNELS)
+    return out.getvalue().decode("utf8")
+
+
+def benchmark_iaga2002_parse_minute(benchmark, size):
+    data = get_iaga2002(get_stream(size=size, interval="minute"))
+    benchmark(lambda: IAGA2002Parser().parse(data))
+
+
+def benchmark_iaga2002_parse_second(benchmark, size):
+    data = get_iaga2002(get_stream(size=size, interval="second"))
+    benchmark.pedantic(lambda: IAGA2002Parser().parse(data), rounds=1)
+
+
+def benchmark_imfv283_parse(benchmark, size):
+    data = b"\n".join([IMFV283_MESSAGE] * (SIZES[size] // 720))
+    benchmark(lambda: IMFV283Parser().parse(data))
+
+
+def benchmark_iaga2002_write_minute(benchmark, size):
+    stream = get_stream(size=size, interval="minute")
+    benchmark(lambda: IAGA2002Writer().write(io.BytesIO(), stream, CHANNELS))
+
+
+def benchmark_iaga2002_write_second(benchmark, size):
+    stream = get_stream(size=size, interval="second")
+    benchmark.pedantic(
+        lambda: IAGA2002Writer().write(io.BytesIO(), stream, CHANNELS), rounds=1
+    )
+
+
+def benchmark_imfjson_write_minute(benchmark, size):
+    stream = get_stream(size=size, interval="minute")
+    benchmark(lambda: IMFJSONWriter().write(io.BytesIO(), stream, CHANNELS))
+
+
+def benchmark_imfjson_write_second(benchmark, size):
+    stream = get_stream(size=size, interval="second")
+    benchmark.pedantic(
+        lambda: IMFJSONWriter().write(io.BytesIO(), stream, CHANNELS), rounds=1
+    )
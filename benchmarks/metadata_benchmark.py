@@ -0,0 +1,19 @@
+"""Benchmarks for observatory and instrument metadata lookups."""
+from geomagio.Metadata import get_instrument
+from geomagio.ObservatoryMetadata import ObservatoryMetadata
+from obspy.core import Stats, UTCDateTime
+
+
+def set_metadata(observatory_metadata, count):
+    for _ in range(count):
+        observatory_metadata.set_metadata(Stats(), "BOU", "H", "variation", "second")
+
+
+def benchmark_set_metadata(benchmark):
+    benchmark(set_metadata, ObservatoryMetadata(), 1000)
+
+
+def benchmark_get_instrument(benchmark):
+    starttime = UTCDateTime("2020-01-01T00:00:00Z")
+    endtime = UTCDateTime("2020-01-02T00:00:00Z")
+    benchmark(get_instrument, "LLO", starttime, endtime)
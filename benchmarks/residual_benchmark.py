@@ -0,0 +1,21 @@
+"""Benchmarks for residual absolute calculations."""
+from geomagio.residual import calculate, calculate_many, SpreadsheetAbsolutesFactory
+
+
+def get_readings(count):
+    reading = SpreadsheetAbsolutesFactory().parse_spreadsheet(
+        path="etc/residual/DED-20140952332.xlsm"
+    )
+    return [reading] * count
+
+
+def calculate_each(readings):
+    return [calculate(reading) for reading in readings]
+
+
+def benchmark_calculate(benchmark):
+    benchmark(calculate_each, get_readings(500))
+
+
+def benchmark_calculate_many(benchmark):
+    benchmark(calculate_many, get_readings(500))
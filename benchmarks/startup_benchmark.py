@@ -0,0 +1,68 @@
+"""Benchmarks for startup time of geomag.py.
+
+Each round starts a new interpreter with "python -X importtime", and the
+cumulative import time of top level modules (in microseconds) is saved as
+extra info, along with the slowest imports.
+"""
+import os
+import subprocess
+import sys
+
+
+# root of repository, so geomagio is importable
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# parse arguments and create factories, as geomag.py does before processing
+GEOMAG_SCRIPT = """
+from geomagio.Controller import get_input_factory, get_output_factory, parse_args
+args = parse_args([
+    "--input", "iaga2002", "--input-stdin",
+    "--output", "iaga2002", "--output-stdout",
+    "--observatory", "BOU",
+])
+get_input_factory(args)
+get_output_factory(args)
+"""
+
+
+def run_importtime(script):
+    """Run script in a new interpreter.
+
+    Returns
+    -------
+    list
+        (module, self microseconds, cumulative microseconds) tuples,
+        for top level imports.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        check=True,
+        cwd=ROOT,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    imports = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit() or name.startswith("  "):
+            # header, or nested import
+            continue
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def benchmark_startup_import(benchmark):
+    benchmark.pedantic(run_importtime, args=("import geomagio",), rounds=5)
+    imports = run_importtime("import geomagio")
+    benchmark.extra_info["import_us"] = sum(i[2] for i in imports)
+
+
+def benchmark_startup_geomag(benchmark):
+    benchmark.pedantic(run_importtime, args=(GEOMAG_SCRIPT,), rounds=5)
+    imports = run_importtime(GEOMAG_SCRIPT)
+    benchmark.extra_info["import_us"] = sum(i[2] for i in imports)
+    benchmark.extra_info["slowest"] = [
+        i[0] for i in sorted(imports, key=lambda i: -i[2])[:5]
+    ]
@@ -0,0 +1,143 @@
+"""Synthetic timeseries for benchmarks.
+
+Generated data is deterministic for a given seed, so results from
+different runs (and different commits) measure the same work.
+"""
+import numpy
+from obspy.core import Stream, Trace, UTCDateTime
+
+from geomagio import TimeseriesUtility
+from geomagio.ObservatoryMetadata import ObservatoryMetadata
+
+
+# number of seconds in each benchmark size
+SIZES = {
+    "day": 86400,
+    "month": 30 * 86400,
+    "year": 365 * 86400,
+}
+
+# start of generated data
+STARTTIME = UTCDateTime("2020-01-01T00:00:00Z")
+
+
+def get_stream(
+    size="day",
+    interval="minute",
+    channels=("H", "E", "Z", "F"),
+    observatory="BOU",
+    type="variation",
+    starttime=STARTTIME,
+    gaps=True,
+    seed=0,
+):
+    """Generate a stream with realistic values and gaps.
+
+    Parameters
+    ----------
+    size : {'day', 'month', 'year'}
+        amount of data to generate.
+    interval : {'tenhertz', 'second', 'minute', 'hour', 'day'}
+        data interval.
+    channels : array_like
+        channels to generate.
+    observatory : str
+        observatory code, used for metadata.
+    type : str
+        data type, used for metadata.
+    starttime : obspy.core.UTCDateTime
+        time of first sample.
+    gaps : bool
+        whether to add gaps to the data.
+    seed : int
+        random seed.
+
+    Returns
+    -------
+    obspy.core.Stream
+        stream with one trace per channel.
+    """
+    random = numpy.random.RandomState(seed)
+    delta = TimeseriesUtility.get_delta_from_interval(interval)
+    npts = int(SIZES[size] / delta)
+    times = numpy.arange(npts) * delta
+    metadata = ObservatoryMetadata()
+    stream = Stream()
+    for i, channel in enumerate(channels):
+        # daily variation, slow secular drift, and noise
+        data = (
+            20000.0 * (i + 1)
+            + 30.0 * numpy.sin(2 * numpy.pi * times / 86400.0 + i)
+            + 1e-6 * times
+            + random.normal(scale=0.5, size=npts)
+        )
+        if gaps:
+            add_gaps(data, delta, random)
+        trace = Trace(data)
+        trace.stats.starttime = starttime
+        trace.stats.delta = delta
+        trace.stats.network = "NT"
+        trace.stats.station = observatory
+        trace.stats.location = "R0"
+        metadata.set_metadata(trace.stats, observatory, channel, type, interval)
+        stream += trace
+    return stream
+
+
+def add_gaps(data, delta, random):
+    """Add gaps to data, in place.
+
+    Adds many short dropouts (a few samples), and a few outages (up to an
+    hour), at random locations.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        data to modify.
+    delta : float
+        seconds between samples.
+    random : numpy.random.RandomState
+        source of random numbers.
+    """
+    npts = len(data)
+    days = max(1, int(npts * delta / 86400))
+    # short dropouts, roughly 20 per day
+    for start in random.randint(0, npts, size=20 * days):
+        data[start : start + random.randint(1, 5)] = numpy.nan
+    # outages, roughly 1 every 10 days
+    outage = max(1, int(3600 / delta))
+    for start in random.randint(0, npts, size=max(1, days // 10)):
+        data[start : start + random.randint(1, outage)] = numpy.nan
+
+
+def split_stream(stream, parts=2, overlap=0):
+    """Split stream into overlapping pieces, for merge benchmarks.
+
+    Parameters
+    ----------
+    stream : obspy.core.Stream
+        stream to split.
+    parts : int
+        number of pieces.
+    overlap : int
+        number of samples shared by adjacent pieces.
+
+    Returns
+    -------
+    list<obspy.core.Stream>
+        pieces of stream.
+    """
+    pieces = []
+    for part in range(parts):
+        piece = Stream()
+        for trace in stream:
+            size = len(trace.data) // parts
+            start = max(0, part * size - overlap)
+            end = len(trace.data) if part == parts - 1 else (part + 1) * size
+            new_trace = Trace(trace.data[start:end].copy(), trace.stats.copy())
+            new_trace.stats.starttime = (
+                trace.stats.starttime + start * trace.stats.delta
+            )
+            piece += new_trace
+        pieces.append(piece)
+    return pieces
@@ -14,8 +14,8 @@ except ImportError:
 import argparse
 import sys
 from obspy.core import UTCDateTime
-import geomagio.TimeseriesUtility as TimeseriesUtility
 import geomagio.edge as edge
+from geomagio.Monitor import GapIndex, Monitor, get_json
 
 
 def calculate_warning_threshold(warning_threshold, interval):
@@ -34,18 +34,6 @@ def calculate_warning_threshold(warning_threshold, interval):
     return warning_threshold
 
 
-def calculate_gap_percentage(total, trace):
-    """Calculate the percentage of missing values
-    Parameters
-    ----------
-    total: int
-        Total number of missing values
-    trace: obspy.core.Trace
-        a stream containing a single channel of data
-    """
-    return (float(total) / float(trace.stats.npts)) * 100.0, trace.stats.npts
-
-
 def format_time(date):
     """Print UTCDateTime in YYYY-MM-DD HH:MM:SS format
     Parameters
@@ -60,50 +48,13 @@ def get_gaps(gaps):
     gaps: array
         Array of gaps
     """
-    gap_string = ""
-    if len(gaps):
-        for gap in gaps:
-            gap_string += "&nbsp;&nbsp;&nbsp;&nbsp; %s to %s <br>\n" % (
-                format_time(gap[0]),
-                format_time(gap[1]),
-            )
-    else:
-        gap_string = "&nbsp;&nbsp;&nbsp;&nbsp;None<br>"
-    return gap_string
-
-
-def get_gap_total(gaps, interval):
-    """Get total length of time for all gaps in a channel
-    Parameters
-    ----------
-    gaps: array
-        Array of gaps
-    interval: string
-        the interval being warned against
-    """
-    total = 0
-    divisor = 1
-    if interval == "minute":
-        divisor = 60
-    for gap in gaps:
-        total += int(gap[2] - gap[0]) / divisor
-    return total
-
-
-def get_last_time(gaps, endtime):
-    """Return the last time that a channel has in it.
-    Parameters
-    ----------
-    gaps: array
-        Array of gaps
-    endtime: UTCDateTime
-        The endtime specified in the arguments
-    """
-    length = len(gaps) - 1
-    if length > -1 and gaps[length][2] >= endtime:
-        return gaps[length][0]
-    else:
-        return endtime
+    if not len(gaps):
+        return "&nbsp;&nbsp;&nbsp;&nbsp;None<br>"
+    return "".join(
+        "&nbsp;&nbsp;&nbsp;&nbsp; %s to %s <br>\n"
+        % (format_time(gap[0]), format_time(gap[1]))
+        for gap in gaps
+    )
 
 
 def get_table_header():
@@ -140,15 +91,15 @@ def get_table_header():
     )
 
 
-def has_gaps(gaps):
-    """Returns True if gaps dictionary has gaps in it.
+def has_gaps(channels):
+    """Returns True if any channel summary has gaps in it.
     Parameters
     ----------
-    gaps: dictionary
-        Dictionary of Channel:gaps arrays
+    channels: dictionary
+        Dictionary of Channel:summary, see Monitor.get_channel_summary
     """
-    for channel in gaps:
-        if len(gaps[channel]):
+    for channel in channels:
+        if len(channels[channel]["gaps"]):
             return True
     return False
 
@@ -183,98 +134,118 @@ def print_html_header(starttime, endtime, title):
     )
 
 
-def print_observatories(args):
+def get_monitor(args):
+    """Create a monitor from command line arguments.
+    Parameters
+    ----------
+    args: dictionary
+        Holds all the command line arguments. See parse_args
+    """
+    return Monitor(
+        get_factory=lambda observatory, interval: edge.EdgeFactory(
+            host=args.edge_host,
+            port=2060,
+            observatory=observatory,
+            type=args.type,
+            channels=args.channels,
+            locationCode=args.locationcode,
+            interval=interval,
+        ),
+        channels=args.channels,
+        type=args.type,
+        gap_index=GapIndex(args.gap_index),
+        max_workers=args.max_workers,
+    )
+
+
+def get_warning_channels(result, warning_threshold):
+    """Get channels whose last value is older than warning_threshold.
+    Parameters
+    ----------
+    result: dictionary
+        result for one observatory and interval, see Monitor.check
+    warning_threshold: int
+        the warning_threshold from the command line.
+    """
+    threshold = calculate_warning_threshold(warning_threshold, result["interval"])
+    return [
+        channel
+        for channel, summary in result["channels"].items()
+        if result["endtime"] - summary["last_time"] > threshold
+    ]
+
+
+def print_observatories(args, results=None):
     """Print all the observatories
     Parameters
     ---------
     args: dictionary
         Holds all the command line arguments. See parse_args
+    results: list
+        results from Monitor.check, checked using args when None.
 
     Returns
     -------
     Boolean: if a warning was issued.
 
     """
-    intervals = args.intervals
-    channels = args.channels
-    starttime = args.starttime
-    endtime = args.endtime
-    host = args.edge_host
+    if results is None:
+        results = get_monitor(args).check(
+            args.observatories, args.intervals, args.starttime, args.endtime
+        )
     table_header = get_table_header()
     warning_issued = False
     table_end = "</tbody>\n" + "</table>\n"
-
-    for observatory in args.observatories:
-        summary_table = ""
-        gap_details = ""
+    by_observatory = {}
+    for result in results:
+        by_observatory.setdefault(result["observatory"], []).append(result)
+
+    for observatory, observatory_results in by_observatory.items():
+        summary_header = ["<p>Observatory: %s </p>\n" % observatory]
+        summary_table = [table_header]
+        gap_details = []
         print_it = False
-        summary_header = "<p>Observatory: %s </p>\n" % observatory
-        summary_table += table_header
-        for interval in intervals:
-            factory = edge.EdgeFactory(
-                host=host,
-                port=2060,
-                observatory=observatory,
-                type=args.type,
-                channels=channels,
-                locationCode=args.locationcode,
-                interval=interval,
-            )
-
-            timeseries = factory.get_timeseries(starttime=starttime, endtime=endtime)
-            gaps = TimeseriesUtility.get_stream_gaps(timeseries)
-            if args.gaps_only and not has_gaps(gaps):
+        for result in observatory_results:
+            interval = result["interval"]
+            if args.gaps_only and not has_gaps(result["channels"]):
                 continue
             else:
                 print_it = True
-
-            warning = ""
-            warning_threshold = calculate_warning_threshold(
-                args.warning_threshold, interval
+            summary_table.append(
+                '<tr><td style="text-align:center;">'
+                + " %sS \n </td></tr>\n" % interval.upper()
             )
-
-            summary_table += "<tr>"
-            summary_table += '<td style="text-align:center;">'
-            summary_table += " %sS \n </td></tr>\n" % interval.upper()
-            gap_details += "&nbsp;&nbsp;%sS <br>\n" % interval.upper()
-            for channel in channels:
-                gap = gaps[channel]
-                trace = timeseries.select(channel=channel)[0]
-                total = get_gap_total(gap, interval)
-                percentage, count = calculate_gap_percentage(total, trace)
-                last = get_last_time(gap, endtime)
-                summary_table += "<tr>\n"
-                summary_table += '<td style="text-align:center;">%s</td>' % channel
-                summary_table += '<td style="text-align:center;">%s</td>' % format_time(
-                    last
-                )
-                summary_table += '<td style="text-align:center;">%d</td>' % len(gap)
-                summary_table += '<td style="text-align:center;">%d %s</td>' % (
-                    total,
-                    interval,
-                )
-                summary_table += (
-                    '<td style="text-align:center;">%0.2f%%</td>' % percentage
+            gap_details.append("&nbsp;&nbsp;%sS <br>\n" % interval.upper())
+            for channel, summary in result["channels"].items():
+                summary_table.append(
+                    "<tr>\n"
+                    + '<td style="text-align:center;">%s</td>' % channel
+                    + '<td style="text-align:center;">%s</td>'
+                    % format_time(summary["last_time"])
+                    + '<td style="text-align:center;">%d</td>' % len(summary["gaps"])
+                    + '<td style="text-align:center;">%d %s</td>'
+                    % (summary["gap_total"], interval)
+                    + '<td style="text-align:center;">%0.2f%%</td>'
+                    % summary["percentage"]
+                    + '<td style="text-align:center;">%d</td>' % summary["count"]
+                    + "</tr>\n"
                 )
-                summary_table += '<td style="text-align:center;">%d</td>' % count
-                summary_table += "</tr>\n"
-                if endtime - last > warning_threshold:
-                    warning += "%s " % channel
-                    warning_issued = True
                 # Gap Detail
-                gap_details += "&nbsp;&nbsp;Channel: %s <br>\n" % channel
-                gap_details += get_gaps(gap) + "\n"
+                gap_details.append("&nbsp;&nbsp;Channel: %s <br>\n" % channel)
+                gap_details.append(get_gaps(summary["gaps"]) + "\n")
+            warning = get_warning_channels(result, args.warning_threshold)
             if len(warning):
-                summary_header += (
+                warning_issued = True
+                summary_header.append(
                     "Warning: Channels older then "
                     + "warning-threshold "
-                    + "%s %ss<br>\n" % (warning, interval)
+                    + "%s %ss<br>\n" % ("".join(c + " " for c in warning), interval)
                 )
-        summary_table += table_end
+        summary_table.append(table_end)
         if print_it:
-            print(summary_header)
-            print(summary_table)
-            print(gap_details)
+            print("".join(summary_header))
+            print("".join(summary_table))
+            print("".join(gap_details))
 
     return warning_issued
 
@@ -289,12 +260,20 @@ def main(args):
     Notes
     -----
     parses command line options using argparse
-    Output is in HTML.
+    Output is in HTML, or JSON when --format json is used.
     """
-    print_html_header(args.starttime, args.endtime, args.title)
-
-    warning_issued = print_observatories(args)
-    print("</body>\n" + "</html>\n")
+    results = get_monitor(args).check(
+        args.observatories, args.intervals, args.starttime, args.endtime
+    )
+    if args.format == "json":
+        print(get_json(results))
+        warning_issued = any(
+            get_warning_channels(result, args.warning_threshold) for result in results
+        )
+    else:
+        print_html_header(args.starttime, args.endtime, args.title)
+        warning_issued = print_observatories(args, results)
+        print("</body>\n" + "</html>\n")
 
     sys.exit(warning_issued)
 
@@ -346,7 +325,7 @@ def parse_args(args):
         "--intervals",
         nargs="*",
         default=["minute"],
-        choices=["hourly", "minute", "second"],
+        choices=["hour", "minute", "second"],
     )
     parser.add_argument(
         "--locationcode", default="R0", choices=["R0", "R1", "RM", "Q0", "D0", "C0"]
@@ -369,6 +348,23 @@ def parse_args(args):
         help="Only print Observatories with gaps.",
     )
     parser.add_argument("--title", default="", help="Title for the top of the report")
+    parser.add_argument(
+        "--format",
+        default="html",
+        choices=["html", "json"],
+        help="Output format",
+    )
+    parser.add_argument(
+        "--gap-index",
+        default=None,
+        help="JSON file where gaps are saved, so later runs only read new data",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Maximum number of observatories and intervals read at once",
+    )
 
     return parser.parse_args(args)
 
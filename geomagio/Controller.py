@@ -3,24 +3,48 @@ from __future__ import absolute_import, print_function
 from builtins import str as unicode
 
 import argparse
+import copy
+import functools
+import importlib
+import json
+import signal
 import sys
 from io import BytesIO
 from obspy.core import Stream, UTCDateTime
 from .algorithm import algorithms, AlgorithmException
-from .PlotTimeseriesFactory import PlotTimeseriesFactory
+from .Daemon import Daemon, DaemonJob
+from .JobGraph import JobGraph
+from .edge import LocationCode
+from .Pipeline import Pipeline, PipelineStage
 from .StreamTimeseriesFactory import StreamTimeseriesFactory
-from . import TimeseriesUtility, Util
-
-# factory packages
-from . import binlog
-from . import edge
-from . import iaga2002
-from . import imfjson
-from . import pcdcp
-from . import imfv122
-from . import imfv283
-from . import temperature
-from . import vbf
+from . import Metrics, TimeseriesUtility, Util
+
+
+# factory classes by --input format, imported when selected
+INPUT_FACTORIES = {
+    "archive": ".archive:ArchiveFactory",
+    "edge": ".edge:EdgeFactory",
+    "goes": ".imfv283:GOESIMFV283Factory",
+    "iaga2002": ".iaga2002:IAGA2002Factory",
+    "imfv122": ".imfv122:IMFV122Factory",
+    "imfv283": ".imfv283:IMFV283Factory",
+    "miniseed": ".edge:MiniSeedFactory",
+    "pcdcp": ".pcdcp:PCDCPFactory",
+}
+
+# factory classes by --output format, imported when selected
+OUTPUT_FACTORIES = {
+    "archive": ".archive:ArchiveFactory",
+    "binlog": ".binlog:BinLogFactory",
+    "edge": ".edge:EdgeFactory",
+    "iaga2002": ".iaga2002:IAGA2002Factory",
+    "imfjson": ".imfjson:IMFJSONFactory",
+    "miniseed": ".edge:EdgeFactory",
+    "pcdcp": ".pcdcp:PCDCPFactory",
+    "plot": ".PlotTimeseriesFactory:PlotTimeseriesFactory",
+    "temperature": ".temperature:TEMPFactory",
+    "vbf": ".vbf:VBFFactory",
+}
 
 
 class Controller(object):
@@ -84,12 +108,21 @@ class Controller(object):
             )
             if input_start is None or input_end is None:
                 continue
-            timeseries += self._inputFactory.get_timeseries(
+            with Metrics.timer(
+                "get_timeseries",
+                factory=type(self._inputFactory).__name__,
                 observatory=obs,
                 starttime=input_start,
                 endtime=input_end,
-                channels=channels,
-            )
+            ) as fields:
+                data = self._inputFactory.get_timeseries(
+                    observatory=obs,
+                    starttime=input_start,
+                    endtime=input_end,
+                    channels=channels,
+                )
+                fields.update(Metrics.get_stream_fields(data))
+            timeseries += data
         return timeseries
 
     def _rename_channels(self, timeseries, renames):
@@ -135,11 +168,71 @@ class Controller(object):
         """
         timeseries = Stream()
         for obs in observatory:
-            timeseries += self._outputFactory.get_timeseries(
-                observatory=obs, starttime=starttime, endtime=endtime, channels=channels
-            )
+            with Metrics.timer(
+                "get_timeseries",
+                factory=type(self._outputFactory).__name__,
+                observatory=obs,
+                starttime=starttime,
+                endtime=endtime,
+            ) as fields:
+                data = self._outputFactory.get_timeseries(
+                    observatory=obs,
+                    starttime=starttime,
+                    endtime=endtime,
+                    channels=channels,
+                )
+                fields.update(Metrics.get_stream_fields(data))
+            timeseries += data
         return timeseries
 
+    def _process(self, timeseries):
+        """Process timeseries using algorithm, and record timing.
+
+        Parameters
+        ----------
+        timeseries : obspy.core.Stream
+            stream to process.
+
+        Returns
+        -------
+        obspy.core.Stream
+            processed stream.
+        """
+        with Metrics.timer(
+            "process", algorithm=type(self._algorithm).__name__
+        ) as fields:
+            processed = self._algorithm.process(timeseries)
+            fields.update(Metrics.get_stream_fields(processed))
+        return processed
+
+    def _put_output_timeseries(self, timeseries, starttime, endtime, channels):
+        """Put timeseries using the output factory, and record timing.
+
+        Parameters
+        ----------
+        timeseries : obspy.core.Stream
+            stream to write.
+        starttime : obspy.core.UTCDateTime
+            time of first sample to write.
+        endtime : obspy.core.UTCDateTime
+            time of last sample to write.
+        channels : array_like
+            channels to write.
+        """
+        with Metrics.timer(
+            "put_timeseries",
+            factory=type(self._outputFactory).__name__,
+            starttime=starttime,
+            endtime=endtime,
+            **Metrics.get_stream_fields(timeseries)
+        ):
+            self._outputFactory.put_timeseries(
+                timeseries=timeseries,
+                starttime=starttime,
+                endtime=endtime,
+                channels=channels,
+            )
+
     def run(self, options, input_timeseries=None):
         """run controller
         Parameters
@@ -150,6 +243,12 @@ class Controller(object):
         input_timeseries : obspy.core.Stream
             Used by run_as_update to save a double input read, since it has
             already read the input to confirm data can be produced.
+
+        Returns
+        -------
+        obspy.core.Stream
+            timeseries that was written to the output factory,
+            or None when there is no input data.
         """
         algorithm = self._algorithm
         input_channels = options.inchannels or algorithm.get_input_channels()
@@ -185,7 +284,7 @@ class Controller(object):
             timeseries = self._rename_channels(
                 timeseries=timeseries, renames=options.rename_input_channel
             )
-        processed = algorithm.process(timeseries)
+        processed = self._process(timeseries)
         # trim if --no-trim is not set
         if not options.no_trim:
             processed.trim(starttime=starttime, endtime=endtime)
@@ -194,12 +293,134 @@ class Controller(object):
                 timeseries=processed, renames=options.rename_output_channel
             )
         # output
-        self._outputFactory.put_timeseries(
+        self._put_output_timeseries(
             timeseries=processed,
             starttime=starttime,
             endtime=endtime,
             channels=output_channels,
         )
+        return processed
+
+    def get_input_requests(self, options):
+        """Get the input timeseries that run() reads for options.
+
+        Parameters
+        ----------
+        options: dictionary
+            The dictionary of all the command line arguments.
+
+        Returns
+        -------
+        list
+            (observatory, channels, starttime, endtime) tuples,
+            for each observatory with data to read.
+        """
+        algorithm = self._algorithm
+        channels = options.inchannels or algorithm.get_input_channels()
+        starttime = algorithm.get_next_starttime() or options.starttime
+        requests = []
+        for obs in options.observatory:
+            input_start, input_end = algorithm.get_input_interval(
+                start=starttime, end=options.endtime, observatory=obs, channels=channels
+            )
+            if input_start is None or input_end is None:
+                continue
+            requests.append((obs, channels, input_start, input_end))
+        return requests
+
+    def run_pipelined(self, options, chunk_size=86400, queue_depth=1):
+        """Run controller in chunks, overlapping read, process, and write.
+
+        The interval [options.starttime, options.endtime] is divided into
+        chunks of `chunk_size` seconds.  Each chunk is read, processed, and
+        written by separate stages so the read of chunk N+1 overlaps the
+        processing of chunk N and the write of chunk N-1.
+
+        Parameters
+        ----------
+        options: dictionary
+            The dictionary of all the command line arguments. Could in theory
+            contain other options passed in by the controller.
+        chunk_size : int
+            number of seconds in each chunk.
+        queue_depth : int
+            number of chunks that may wait between stages.
+
+        Returns
+        -------
+        Pipeline
+            the completed pipeline, for access to stage metrics.
+        """
+        algorithm = self._algorithm
+        if algorithm.get_next_starttime() is not None:
+            raise AlgorithmException("Stateful algorithms cannot use run_pipelined")
+        input_channels = options.inchannels or algorithm.get_input_channels()
+        output_channels = options.outchannels or algorithm.get_output_channels()
+        delta = TimeseriesUtility.get_delta_from_interval(
+            options.output_interval or options.interval
+        )
+        chunks = []
+        for interval in Util.get_intervals(
+            starttime=options.starttime,
+            endtime=options.endtime,
+            size=chunk_size,
+            trim=True,
+        ):
+            chunk_end = interval["end"]
+            if chunk_end < options.endtime:
+                # intervals are [start, end), omit sample at end
+                chunk_end = chunk_end - delta
+            chunks.append((interval["start"], chunk_end))
+
+        def read(chunk):
+            starttime, endtime = chunk
+            timeseries = self._get_input_timeseries(
+                observatory=options.observatory,
+                starttime=starttime,
+                endtime=endtime,
+                channels=input_channels,
+            )
+            return starttime, endtime, timeseries
+
+        def process(chunk):
+            starttime, endtime, timeseries = chunk
+            if timeseries.count() == 0:
+                # no data to process
+                return starttime, endtime, timeseries
+            if options.rename_input_channel:
+                timeseries = self._rename_channels(
+                    timeseries=timeseries, renames=options.rename_input_channel
+                )
+            processed = self._process(timeseries)
+            if not options.no_trim:
+                processed.trim(starttime=starttime, endtime=endtime)
+            if options.rename_output_channel:
+                processed = self._rename_channels(
+                    timeseries=processed, renames=options.rename_output_channel
+                )
+            return starttime, endtime, processed
+
+        def write(chunk):
+            starttime, endtime, processed = chunk
+            if processed.count() == 0:
+                return
+            self._put_output_timeseries(
+                timeseries=processed,
+                starttime=starttime,
+                endtime=endtime,
+                channels=output_channels,
+            )
+
+        pipeline = Pipeline(
+            stages=[
+                PipelineStage("read", read),
+                PipelineStage("process", process),
+                PipelineStage("write", write),
+            ],
+            queue_depth=queue_depth,
+        )
+        pipeline.run(chunks)
+        return pipeline
 
     def run_as_update(self, options, update_count=0):
         """Updates data.
@@ -293,6 +514,26 @@ class Controller(object):
             self.run(options, input_timeseries)
 
 
+def get_factory_class(factories, name):
+    """Import a factory class.
+
+    Parameters
+    ----------
+    factories : dict
+        INPUT_FACTORIES or OUTPUT_FACTORIES.
+    name : str
+        format name.
+
+    Returns
+    -------
+    type
+        TimeseriesFactory subclass for format.
+    """
+    module_name, _, class_name = factories[name].partition(":")
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, class_name)
+
+
 def get_input_factory(args):
     """Parse input factory arguments.
 
@@ -324,18 +565,24 @@ def get_input_factory(args):
         if "{" in args.input_url:
             input_factory_args["urlInterval"] = args.input_url_interval
             input_factory_args["urlTemplate"] = args.input_url
+            input_factory_args["urlWorkers"] = args.input_url_workers
         else:
             input_stream = BytesIO(Util.read_url(args.input_url))
     input_type = args.input
-    if input_type == "edge":
-        input_factory = edge.EdgeFactory(
+    factory_class = get_factory_class(INPUT_FACTORIES, input_type)
+    if input_type == "archive":
+        input_factory = factory_class(
+            directory=args.input_archive_directory, **input_factory_args
+        )
+    elif input_type == "edge":
+        input_factory = factory_class(
             host=args.input_host,
             port=args.input_port,
             locationCode=args.locationcode,
             **input_factory_args
         )
     elif input_type == "miniseed":
-        input_factory = edge.MiniSeedFactory(
+        input_factory = factory_class(
             host=args.input_host,
             port=args.input_port,
             locationCode=args.locationcode,
@@ -344,7 +591,8 @@ def get_input_factory(args):
         )
     elif input_type == "goes":
         # TODO: deal with other goes arguments
-        input_factory = imfv283.GOESIMFV283Factory(
+        input_factory = factory_class(
+            cache_directory=args.input_goes_cache_directory,
             directory=args.input_goes_directory,
             getdcpmessages=args.input_goes_getdcpmessages,
             password=args.input_goes_password,
@@ -354,14 +602,7 @@ def get_input_factory(args):
         )
     else:
         # stream compatible factories
-        if input_type == "iaga2002":
-            input_factory = iaga2002.IAGA2002Factory(**input_factory_args)
-        elif input_type == "imfv122":
-            input_factory = imfv122.IMFV122Factory(**input_factory_args)
-        elif input_type == "imfv283":
-            input_factory = imfv283.IMFV283Factory(**input_factory_args)
-        elif input_type == "pcdcp":
-            input_factory = pcdcp.PCDCPFactory(**input_factory_args)
+        input_factory = factory_class(**input_factory_args)
         # wrap stream
         if input_stream is not None:
             input_factory = StreamTimeseriesFactory(
@@ -409,10 +650,15 @@ def get_output_factory(args):
         output_factory_args["urlTemplate"] = output_url
 
     output_type = args.output
-    if output_type == "edge":
+    factory_class = get_factory_class(OUTPUT_FACTORIES, output_type)
+    if output_type == "archive":
+        output_factory = factory_class(
+            directory=args.output_archive_directory, **output_factory_args
+        )
+    elif output_type == "edge":
         # TODO: deal with other edge arguments
         locationcode = args.outlocationcode or args.locationcode or None
-        output_factory = edge.EdgeFactory(
+        output_factory = factory_class(
             host=args.output_host,
             port=args.output_read_port,
             write_port=args.output_port,
@@ -424,7 +670,7 @@ def get_output_factory(args):
     elif output_type == "miniseed":
         # TODO: deal with other miniseed arguments
         locationcode = args.outlocationcode or args.locationcode or None
-        output_factory = edge.EdgeFactory(
+        output_factory = factory_class(
             host=args.output_host,
             port=args.output_read_port,
             write_port=args.output_port,
@@ -432,21 +678,10 @@ def get_output_factory(args):
             **output_factory_args
         )
     elif output_type == "plot":
-        output_factory = PlotTimeseriesFactory()
+        output_factory = factory_class()
     else:
         # stream compatible factories
-        if output_type == "binlog":
-            output_factory = binlog.BinLogFactory(**output_factory_args)
-        elif output_type == "iaga2002":
-            output_factory = iaga2002.IAGA2002Factory(**output_factory_args)
-        elif output_type == "imfjson":
-            output_factory = imfjson.IMFJSONFactory(**output_factory_args)
-        elif output_type == "pcdcp":
-            output_factory = pcdcp.PCDCPFactory(**output_factory_args)
-        elif output_type == "temperature":
-            output_factory = temperature.TEMPFactory(**output_factory_args)
-        elif output_type == "vbf":
-            output_factory = vbf.VBFFactory(**output_factory_args)
+        output_factory = factory_class(**output_factory_args)
         # wrap stream
         if output_stream is not None:
             output_factory = StreamTimeseriesFactory(
@@ -455,19 +690,14 @@ def get_output_factory(args):
     return output_factory
 
 
-def main(args):
-    """command line factory for geomag algorithms
+def _configure_args(args):
+    """Validate arguments, and fill in values derived from other arguments.
 
-    Inputs
-    ------
-    use geomag.py --help to see inputs, or see parse_args.
-
-    Notes
-    -----
-    parses command line options using argparse, then calls the controller
-    with instantiated I/O factories, and algorithm(s)
+    Parameters
+    ----------
+    args : argparse.Namespace
+        command line arguments, updated in place.
     """
-
     # only try to parse deprecated arguments if they've been enabled
     if args.enable_deprecated_arguments:
         parse_deprecated_arguments(args)
@@ -486,39 +716,83 @@ def main(args):
     if args.output_stdout and args.update:
         raise Exception("Cannot combine" + " --output-stdout and --update")
 
-    # translate realtime into start/end times
-    if args.realtime:
-        if args.realtime is True:
-            # convert interval to number of seconds
-            if args.interval == "minute":
-                args.realtime = 3600
+    if args.pipeline_chunk_size and (args.update or args.realtime):
+        raise Exception(
+            "Cannot combine" + " --pipeline-chunk-size and --update or --realtime"
+        )
+
+    _set_realtime_times(args)
+
+
+def _set_realtime_times(args, now=None):
+    """Translate --realtime into start and end times.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        command line arguments, updated in place.
+    now : obspy.core.UTCDateTime
+        current time, default UTCDateTime().
+    """
+    if not args.realtime:
+        return
+    if args.realtime is True:
+        # convert interval to number of seconds
+        if args.interval == "minute":
+            args.realtime = 3600
+        else:
+            args.realtime = 600
+    # calculate endtime/starttime
+    now = now or UTCDateTime()
+    args.endtime = UTCDateTime(now.year, now.month, now.day, now.hour, now.minute)
+    args.starttime = args.endtime - args.realtime
+
+
+def main(args):
+    """command line factory for geomag algorithms
+
+    Inputs
+    ------
+    use geomag.py --help to see inputs, or see parse_args.
+
+    Notes
+    -----
+    parses command line options using argparse, then calls the controller
+    with instantiated I/O factories, and algorithm(s)
+    """
+    if args.daemon or args.job_graph:
+        with Metrics.instrument(
+            metrics_file=args.metrics_file, profile_file=args.profile
+        ):
+            if args.daemon:
+                run_daemon(args)
             else:
-                args.realtime = 600
-        # calculate endtime/starttime
-        now = UTCDateTime()
-        args.endtime = UTCDateTime(now.year, now.month, now.day, now.hour, now.minute)
-        args.starttime = args.endtime - args.realtime
-
-    if args.observatory_foreach:
-        observatory = args.observatory
-        observatory_exception = None
-        for obs in observatory:
-            args.observatory = (obs,)
-            args.output_observatory = (obs,)
-            try:
-                _main(args)
-            except Exception as e:
-                print(
-                    "Exception processing observatory {}".format(obs),
-                    str(e),
-                    file=sys.stderr,
-                )
-        if observatory_exception:
-            print("Exceptions occurred during processing", file=sys.stderr)
-            sys.exit(1)
+                run_job_graph(args)
+        return
+
+    _configure_args(args)
+
+    with Metrics.instrument(metrics_file=args.metrics_file, profile_file=args.profile):
+        if args.observatory_foreach:
+            observatory = args.observatory
+            observatory_exception = None
+            for obs in observatory:
+                args.observatory = (obs,)
+                args.output_observatory = (obs,)
+                try:
+                    _main(args)
+                except Exception as e:
+                    print(
+                        "Exception processing observatory {}".format(obs),
+                        str(e),
+                        file=sys.stderr,
+                    )
+            if observatory_exception:
+                print("Exceptions occurred during processing", file=sys.stderr)
+                sys.exit(1)
 
-    else:
-        _main(args)
+        else:
+            _main(args)
 
 
 def _main(args):
@@ -538,10 +812,315 @@ def _main(args):
 
     if args.update:
         controller.run_as_update(args)
+    elif args.pipeline_chunk_size:
+        pipeline = controller.run_pipelined(
+            args,
+            chunk_size=args.pipeline_chunk_size,
+            queue_depth=args.pipeline_queue_depth,
+        )
+        pipeline.print_metrics()
     else:
         controller.run(args)
 
 
+def get_daemon_job(name, arguments, interval=60, jitter=0):
+    """Create a daemon job that runs a controller.
+
+    Factories, algorithm, and algorithm state are created once and reused
+    by every run.  Stateful algorithms do not save state after each run,
+    the daemon saves it using the job checkpoint.
+
+    Parameters
+    ----------
+    name : str
+        name of job.
+    arguments : list<str>
+        command line arguments for the job, see parse_args.
+    interval : float
+        seconds between runs.
+    jitter : float
+        maximum random delay for each run, in seconds.
+
+    Returns
+    -------
+    DaemonJob
+        job that runs the controller.
+    """
+    args = parse_args(arguments)
+    if args.daemon or args.observatory_foreach:
+        raise Exception(
+            "Cannot combine" + " daemon jobs and --daemon or --observatory-foreach"
+        )
+    _configure_args(args)
+    input_factory = get_input_factory(args)
+    output_factory = get_output_factory(args)
+    algorithm = algorithms[args.algorithm]()
+    algorithm.configure(args)
+    controller = Controller(input_factory, output_factory, algorithm)
+    checkpoint = None
+    if getattr(algorithm, "autosave", False):
+        algorithm.autosave = False
+        checkpoint = algorithm.save_state
+
+    def run():
+        # runs update start and end times, each run starts from the job arguments
+        run_args = copy.copy(args)
+        _set_realtime_times(run_args)
+        if run_args.update:
+            controller.run_as_update(run_args)
+        else:
+            controller.run(run_args)
+
+    return DaemonJob(
+        name=name,
+        function=run,
+        interval=interval,
+        jitter=jitter,
+        checkpoint=checkpoint,
+    )
+
+
+def run_daemon(args):
+    """Run jobs from a daemon configuration file until interrupted.
+
+    The configuration file is JSON, with a list of jobs:
+
+        {"jobs": [
+            {
+                "name": "BOU sqdist",
+                "interval": 60,
+                "jitter": 10,
+                "arguments": ["--input", "edge", "--observatory", "BOU", ...]
+            }
+        ]}
+
+    Each job is passed to get_daemon_job.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        command line arguments, uses daemon and daemon_checkpoint_interval.
+    """
+    with open(args.daemon, "r") as f:
+        config = json.load(f)
+    jobs = [get_daemon_job(**job) for job in config["jobs"]]
+    daemon = Daemon(jobs, checkpoint_interval=args.daemon_checkpoint_interval)
+    # save state and exit after running jobs complete
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        pass
+
+
+def get_job_graph(config, now=None):
+    """Create a job graph from a job graph configuration.
+
+    Jobs read from a named input, or from the output of another job.
+    Each input is read once for all jobs that use it, and is passed to
+    jobs in memory.  Jobs that do not depend on each other run at the
+    same time.
+
+        {
+            "arguments": ["--observatory", "BOU", "--realtime"],
+            "inputs": {
+                "variation": ["--input", "edge", "--interval", "second"]
+            },
+            "jobs": {
+                "adjusted": {"input": "variation", "arguments": [...]},
+                "filter": {"input": "variation", "arguments": [...]},
+                "sqdist": {"input": "filter", "arguments": [...]}
+            }
+        }
+
+    Arguments for each job are the shared "arguments", then arguments of
+    the input it reads (directly, or through other jobs), then the job
+    "arguments".  Jobs that share an input should not change input
+    arguments, every job writes to its own output.
+
+    Parameters
+    ----------
+    config : dict
+        job graph configuration.
+    now : obspy.core.UTCDateTime
+        time used by --realtime, default UTCDateTime().
+
+    Returns
+    -------
+    JobGraph
+        graph with a job for each input and job in config.
+    """
+    shared = config.get("arguments", [])
+    inputs = config.get("inputs", {})
+    jobs = config["jobs"]
+    now = now or UTCDateTime()
+
+    def get_root_input(name, path=()):
+        if name in inputs:
+            return name
+        if name not in jobs:
+            raise Exception("Unknown job graph input {}".format(name))
+        if name in path:
+            raise Exception("Job graph cycle at {}".format(name))
+        return get_root_input(jobs[name]["input"], path + (name,))
+
+    # parse arguments for each job
+    roots = {}
+    job_args = {}
+    for name, job in jobs.items():
+        roots[name] = get_root_input(name)
+        args = parse_args(shared + inputs[roots[name]] + job.get("arguments", []))
+        if args.update or args.observatory_foreach or args.daemon or args.job_graph:
+            raise Exception(
+                "Cannot combine job graph jobs and"
+                + " --update, --observatory-foreach, --daemon, or --job-graph"
+            )
+        _configure_args(args)
+        _set_realtime_times(args, now)
+        job_args[name] = args
+    # create input factories, using arguments of the first job that reads it
+    input_factories = {}
+    for name, root in roots.items():
+        if root not in input_factories:
+            input_factories[root] = get_input_factory(job_args[name])
+    controllers = {}
+    for name, args in job_args.items():
+        algorithm = algorithms[args.algorithm]()
+        algorithm.configure(args)
+        controllers[name] = Controller(
+            input_factories[roots[name]], get_output_factory(args), algorithm
+        )
+
+    graph = JobGraph()
+    for name, input_factory in input_factories.items():
+        readers = [
+            (controllers[job], job_args[job])
+            for job in jobs
+            if jobs[job]["input"] == name
+        ]
+        graph.add(
+            name, functools.partial(_read_job_graph_input, input_factory, readers)
+        )
+
+    def add_job(name):
+        if name in graph.nodes:
+            return
+        dependency = jobs[name]["input"]
+        if dependency in jobs:
+            add_job(dependency)
+        graph.add(
+            name,
+            functools.partial(_run_job_graph_job, controllers[name], job_args[name]),
+            dependencies=[dependency],
+        )
+
+    for name in jobs:
+        add_job(name)
+    return graph
+
+
+def _read_job_graph_input(input_factory, readers):
+    """Read input for all jobs that read from an input factory.
+
+    Parameters
+    ----------
+    input_factory : TimeseriesFactory
+        factory to read.
+    readers : list
+        (controller, args) tuples for jobs that read from input_factory.
+
+    Returns
+    -------
+    obspy.core.Stream
+        union of channels and time intervals that jobs read.
+    """
+    merged = {}
+    for controller, args in readers:
+        for obs, channels, start, end in controller.get_input_requests(args):
+            if obs not in merged:
+                merged[obs] = (channels and list(channels), start, end)
+                continue
+            merged_channels, merged_start, merged_end = merged[obs]
+            if channels is None or merged_channels is None:
+                merged_channels = None
+            else:
+                merged_channels += [c for c in channels if c not in merged_channels]
+            merged[obs] = (
+                merged_channels,
+                min(start, merged_start),
+                max(end, merged_end),
+            )
+    timeseries = Stream()
+    for obs, (channels, start, end) in merged.items():
+        with Metrics.timer(
+            "get_timeseries",
+            factory=type(input_factory).__name__,
+            observatory=obs,
+            starttime=start,
+            endtime=end,
+        ) as fields:
+            data = input_factory.get_timeseries(
+                observatory=obs, starttime=start, endtime=end, channels=channels
+            )
+            fields.update(Metrics.get_stream_fields(data))
+        timeseries += data
+    return timeseries
+
+
+def _run_job_graph_job(controller, args, timeseries):
+    """Run one job with timeseries read by its input.
+
+    Parameters
+    ----------
+    controller : Controller
+        controller for job.
+    args : argparse.Namespace
+        arguments for job.
+    timeseries : obspy.core.Stream
+        output of the input or job this job reads.
+
+    Returns
+    -------
+    obspy.core.Stream
+        timeseries written by job.
+    """
+    # copy, so jobs reading the same input do not change each other's data
+    selected = Stream()
+    for obs, channels, start, end in controller.get_input_requests(args):
+        for trace in timeseries.select(station=obs):
+            if channels is None or trace.stats.channel in channels:
+                selected += trace.copy().trim(start, end)
+    if selected.count() == 0:
+        return Stream()
+    return controller.run(args, input_timeseries=selected) or Stream()
+
+
+def run_job_graph(args):
+    """Run jobs from a job graph configuration file.
+
+    Files ending with .yml or .yaml are parsed as YAML, which requires
+    PyYAML, otherwise as JSON.  See get_job_graph for the format.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        command line arguments, uses job_graph.
+    """
+    with open(args.job_graph, "r") as f:
+        if args.job_graph.endswith((".yml", ".yaml")):
+            # wait to import yaml until it is needed
+            import yaml
+
+            config = yaml.safe_load(f)
+        else:
+            config = json.load(f)
+    graph = get_job_graph(config)
+    try:
+        graph.run()
+    finally:
+        graph.print_metrics()
+
+
 def parse_args(args):
     """parse input arguments
 
@@ -560,14 +1139,13 @@ def parse_args(args):
             Use @ to read arguments from a file.""",
         fromfile_prefix_chars="@",
     )
-
     # Input group
     input_group = parser.add_argument_group("Input", "How data is read.")
 
-    input_type_group = input_group.add_mutually_exclusive_group(required=True)
+    input_type_group = input_group.add_mutually_exclusive_group()
     input_type_group.add_argument(
         "--input",
-        choices=("edge", "goes", "iaga2002", "imfv122", "imfv283", "miniseed", "pcdcp"),
+        choices=sorted(INPUT_FACTORIES),
         default="edge",
         help='Input format (Default "edge")',
     )
@@ -615,6 +1193,16 @@ def parse_args(args):
         metavar="N",
         type=int,
     )
+    input_group.add_argument(
+        "--input-url-workers",
+        default=1,
+        help="""
+                Number of processes used to read and parse "file://" urls
+                (default 1)
+                """,
+        metavar="N",
+        type=int,
+    )
 
     input_group.add_argument(
         "--inchannels", nargs="*", help="Channels H, E, Z, etc", metavar="CHANNEL"
@@ -633,9 +1221,9 @@ def parse_args(args):
                 instead of "--type"
                 """,
         metavar="CODE",
-        type=edge.LocationCode,
+        type=LocationCode,
     )
-    input_group.add_argument(
+    observatory_action = input_group.add_argument(
         "--observatory",
         default=(None,),
         help="""
@@ -647,7 +1235,6 @@ def parse_args(args):
         metavar="OBS",
         nargs="*",
         type=str,
-        required=True,
     )
     input_group.add_argument(
         "--observatory-foreach",
@@ -728,22 +1315,12 @@ def parse_args(args):
 
     # Output group
     output_group = parser.add_argument_group("Output", "How data is written.")
-    output_type_group = output_group.add_mutually_exclusive_group(required=True)
+    output_type_group = output_group.add_mutually_exclusive_group()
 
     # output arguments
     output_type_group.add_argument(
         "--output",
-        choices=(
-            "binlog",
-            "edge",
-            "iaga2002",
-            "imfjson",
-            "miniseed",
-            "pcdcp",
-            "plot",
-            "temperature",
-            "vbf",
-        ),
+        choices=sorted(OUTPUT_FACTORIES),
         # TODO: set default to 'iaga2002'
         help="Output format",
     )
@@ -820,7 +1397,7 @@ def parse_args(args):
         "--outlocationcode",
         help="Defaults to --locationcode",
         metavar="CODE",
-        type=edge.LocationCode,
+        type=LocationCode,
     )
     output_group.add_argument(
         "--output-edge-forceout",
@@ -871,11 +1448,110 @@ def parse_args(args):
         default=False,
         help="Ensures output data will not be trimmed down",
     )
+    processing_group.add_argument(
+        "--pipeline-chunk-size",
+        type=int,
+        default=None,
+        help="""
+                Process in chunks of N seconds, overlapping
+                reads, processing, and writes of separate chunks.
+                """,
+        metavar="N",
+    )
+    processing_group.add_argument(
+        "--pipeline-queue-depth",
+        type=int,
+        default=1,
+        help="Number of chunks that may wait between pipeline stages",
+        metavar="N",
+    )
+
+    # Instrumentation parameters
+    instrumentation_group = parser.add_argument_group(
+        "Instrumentation", "How processing is measured."
+    )
+    instrumentation_group.add_argument(
+        "--metrics-file",
+        default=None,
+        help="""
+                Append timing records for factory requests, url reads,
+                socket sends, and processing to FILE as JSON lines.
+                """,
+        metavar="FILE",
+    )
+    instrumentation_group.add_argument(
+        "--profile",
+        default=None,
+        help="Write cProfile statistics to FILE",
+        metavar="FILE",
+    )
+
+    # Job graph parameters
+    job_graph_group = parser.add_argument_group(
+        "Job graph", "How jobs that share inputs are run."
+    )
+    job_graph_group.add_argument(
+        "--job-graph",
+        default=None,
+        help="""
+                Run the jobs in JSON or YAML configuration FILE,
+                reading each input once for all jobs that use it.
+                """,
+        metavar="FILE",
+    )
+
+    # Daemon parameters
+    daemon_group = parser.add_argument_group(
+        "Daemon", "How jobs are run by a long running process."
+    )
+    daemon_group.add_argument(
+        "--daemon",
+        default=None,
+        help="""
+                Run the jobs in JSON configuration FILE on their cadence,
+                keeping factories and algorithm state between runs.
+                """,
+        metavar="FILE",
+    )
+    daemon_group.add_argument(
+        "--daemon-checkpoint-interval",
+        type=int,
+        default=300,
+        help="Seconds between saving algorithm state files (Default 300)",
+        metavar="N",
+    )
+
+    # Archive parameters
+    archive_group = parser.add_argument_group(
+        "Archive parameters",
+        'Used to configure "--input archive" and "--output archive"',
+    )
+    archive_group.add_argument(
+        "--input-archive-directory",
+        default=".",
+        help="Directory of binary archive files for archive input",
+        metavar="PATH",
+    )
+    archive_group.add_argument(
+        "--output-archive-directory",
+        default=".",
+        help="Directory of binary archive files for archive output",
+        metavar="PATH",
+    )
 
     # GOES parameters
     goes_group = parser.add_argument_group(
         "GOES parameters", 'Used to configure "--input goes"'
     )
+    goes_group.add_argument(
+        "--input-goes-cache-directory",
+        default=None,
+        help="""
+                Directory where retrieved goes messages are stored,
+                so only new time windows are requested from the server
+                """,
+        metavar="PATH",
+    )
     goes_group.add_argument(
         "--input-goes-directory",
         default=".",
@@ -932,7 +1608,15 @@ def parse_args(args):
         help="(Deprecated, Unused) Conversion factor (nT/bin) for bins",
     )
 
-    return parser.parse_args(args)
+    parsed = parser.parse_args(args)
+    if parsed.daemon is None and parsed.job_graph is None:
+        # input and output arguments are only read from daemon or job graph
+        # files, otherwise parse again so argparse reports missing arguments
+        input_type_group.required = True
+        observatory_action.required = True
+        output_type_group.required = True
+        parsed = parser.parse_args(args)
+    return parsed
 
 
 def add_deprecated_args(parser, input_group, output_group):
@@ -0,0 +1,217 @@
+"""Run jobs on a fixed cadence in a long running process."""
+from __future__ import absolute_import, print_function
+
+import math
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import Metrics
+
+
+class DaemonJob(object):
+    """A function called on a fixed cadence.
+
+    Parameters
+    ----------
+    name : str
+        name of job, used for logging and metrics.
+    function : callable
+        called without arguments each time the job runs.
+    interval : float
+        seconds between runs.
+        runs are aligned to multiples of interval since the epoch.
+    jitter : float
+        each run is delayed by a random number of seconds in [0, jitter),
+        so jobs with the same interval do not all start at once.
+    checkpoint : callable
+        called without arguments to save job state, optional.
+    """
+
+    def __init__(self, name, function, interval=60, jitter=0, checkpoint=None):
+        self.name = name
+        self.function = function
+        self.interval = interval
+        self.jitter = min(jitter, interval)
+        self.checkpoint = checkpoint
+        self.next_time = None
+        self.running = False
+        self.changed = False
+        self.count = 0
+        self.errors = 0
+        self.skipped = 0
+        self.elapsed = 0.0
+
+    def get_metrics(self):
+        """Get timing metrics for this job.
+
+        Returns
+        -------
+        dict
+            count : number of completed runs
+            errors : number of runs that raised an exception
+            skipped : number of runs skipped because the job was still running
+            elapsed : seconds spent in `function`
+        """
+        return {
+            "name": self.name,
+            "count": self.count,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "elapsed": self.elapsed,
+        }
+
+    def schedule(self, now):
+        """Set the time of the next run.
+
+        Parameters
+        ----------
+        now : float
+            current time, in seconds since the epoch.
+        """
+        next_time = (math.floor(now / self.interval) + 1) * self.interval
+        self.next_time = next_time + random.uniform(0, self.jitter)
+
+    def run(self, out=sys.stderr):
+        """Run the job once, and log how long it took.
+
+        Exceptions are logged and counted, so one failed run does not stop
+        the daemon.
+
+        Parameters
+        ----------
+        out : file
+            where timing and errors are logged, default stderr.
+        """
+        start = time.time()
+        try:
+            with Metrics.timer("daemon.job", job=self.name):
+                self.function()
+            status = "completed"
+        except Exception as e:
+            self.errors += 1
+            status = "failed ({})".format(e)
+        finally:
+            elapsed = time.time() - start
+            self.count += 1
+            self.elapsed += elapsed
+            self.changed = True
+            self.running = False
+        print(
+            "job {} {} in {:.3f}s".format(self.name, status, elapsed),
+            file=out,
+        )
+
+    def save_checkpoint(self):
+        """Save job state, if it has changed since the last checkpoint.
+
+        Returns
+        -------
+        bool
+            whether a checkpoint was saved.
+        """
+        if self.checkpoint is None or not self.changed or self.running:
+            return False
+        self.changed = False
+        self.checkpoint()
+        return True
+
+
+class Daemon(object):
+    """Run jobs on their cadence until stopped.
+
+    Each job runs in a worker thread, so a slow job does not delay the
+    others.  A job that is still running when it is due again is skipped
+    instead of overlapping with itself.
+
+    Parameters
+    ----------
+    jobs : list<DaemonJob>
+        jobs to run.
+    checkpoint_interval : float
+        seconds between job checkpoints.
+        jobs are also checkpointed when the daemon stops.
+    max_workers : int
+        maximum number of jobs that run at once, default number of jobs.
+    out : file
+        where timing and errors are logged, default stderr.
+    """
+
+    def __init__(self, jobs, checkpoint_interval=300, max_workers=None, out=None):
+        self.jobs = jobs
+        self.checkpoint_interval = checkpoint_interval
+        self.max_workers = max_workers or max(1, len(jobs))
+        self.out = out or sys.stderr
+        self._stop = threading.Event()
+
+    def checkpoint(self):
+        """Save state of jobs that changed since the last checkpoint."""
+        for job in self.jobs:
+            try:
+                job.save_checkpoint()
+            except Exception as e:
+                print(
+                    "job {} checkpoint failed ({})".format(job.name, e), file=self.out
+                )
+
+    def get_metrics(self):
+        """Get timing metrics for all jobs.
+
+        Returns
+        -------
+        list<dict>
+            metrics for each job, see DaemonJob.get_metrics.
+        """
+        return [job.get_metrics() for job in self.jobs]
+
+    def run(self, duration=None):
+        """Run jobs until stop() is called.
+
+        Parameters
+        ----------
+        duration : float
+            stop after this many seconds, optional.
+        """
+        self._stop.clear()
+        now = time.time()
+        stop_time = duration is not None and now + duration or None
+        next_checkpoint = now + self.checkpoint_interval
+        for job in self.jobs:
+            job.schedule(now)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while not self._stop.is_set():
+                now = time.time()
+                if stop_time is not None and now >= stop_time:
+                    break
+                for job in self.jobs:
+                    if job.next_time > now:
+                        continue
+                    job.schedule(now)
+                    if job.running:
+                        job.skipped += 1
+                        print(
+                            "job {} skipped, previous run still running".format(
+                                job.name
+                            ),
+                            file=self.out,
+                        )
+                        continue
+                    job.running = True
+                    executor.submit(job.run, self.out)
+                if now >= next_checkpoint:
+                    self.checkpoint()
+                    next_checkpoint = now + self.checkpoint_interval
+                wait = min([job.next_time for job in self.jobs] + [next_checkpoint])
+                if stop_time is not None:
+                    wait = min(wait, stop_time)
+                self._stop.wait(max(0, wait - time.time()))
+        finally:
+            executor.shutdown(wait=True)
+            self.checkpoint()
+
+    def stop(self):
+        """Stop a running daemon, after running jobs complete."""
+        self._stop.set()
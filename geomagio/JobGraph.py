@@ -0,0 +1,170 @@
+"""Run jobs that depend on results of other jobs."""
+from __future__ import absolute_import, print_function
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobGraphNode(object):
+    """One job in a graph.
+
+    Parameters
+    ----------
+    name : str
+        name of job, used for results and metrics.
+    function : callable
+        called with the result of each dependency, in order.
+        return value is the result of this job.
+    dependencies : list<str>
+        names of jobs whose results are passed to function.
+    """
+
+    def __init__(self, name, function, dependencies=None):
+        self.name = name
+        self.function = function
+        self.dependencies = dependencies or []
+        self.elapsed = 0.0
+        self.wait = 0.0
+        self.error = None
+
+    def get_metrics(self):
+        """Get timing metrics for this job.
+
+        Returns
+        -------
+        dict
+            elapsed : seconds spent in `function`
+            wait : seconds spent waiting for dependencies
+            error : exception raised by job or a dependency, or None
+        """
+        return {
+            "name": self.name,
+            "elapsed": self.elapsed,
+            "wait": self.wait,
+            "error": self.error,
+        }
+
+
+class JobGraph(object):
+    """Run a directed acyclic graph of jobs.
+
+    Each job runs in its own thread as soon as its dependencies complete,
+    so independent branches run at the same time.  Results are passed
+    between jobs in memory, and a job that several others depend on runs
+    once.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+
+    def add(self, name, function, dependencies=None):
+        """Add a job to the graph.
+
+        Parameters
+        ----------
+        name : str
+            unique name of job.
+        function : callable
+            called with the result of each dependency.
+        dependencies : list<str>
+            names of jobs this job depends on.
+            jobs must be added before jobs that depend on them.
+
+        Returns
+        -------
+        JobGraphNode
+            the added job.
+
+        Raises
+        ------
+        ValueError
+            if name is already used, or a dependency has not been added.
+        """
+        if name in self.nodes:
+            raise ValueError("duplicate job {}".format(name))
+        for dependency in dependencies or []:
+            if dependency not in self.nodes:
+                raise ValueError(
+                    "job {} depends on unknown job {}".format(name, dependency)
+                )
+        node = JobGraphNode(name, function, dependencies)
+        self.nodes[name] = node
+        return node
+
+    def get_metrics(self):
+        """Get timing metrics for all jobs.
+
+        Returns
+        -------
+        list<dict>
+            metrics for each job, see JobGraphNode.get_metrics.
+        """
+        return [node.get_metrics() for node in self.nodes.values()]
+
+    def print_metrics(self, out=sys.stderr):
+        """Print a summary of job metrics.
+
+        Parameters
+        ----------
+        out : file
+            where summary is written, default stderr.
+        """
+        for metrics in self.get_metrics():
+            print(
+                "job {name}: elapsed={elapsed:.3f}s, wait={wait:.3f}s".format(
+                    **metrics
+                ),
+                "error={}".format(metrics["error"]) if metrics["error"] else "",
+                file=out,
+            )
+
+    def run(self):
+        """Run all jobs.
+
+        Jobs that do not depend on a failed job run to completion
+        before the first error is raised.
+
+        Returns
+        -------
+        dict
+            results of each job, by name.
+
+        Raises
+        ------
+        Exception
+            the first exception raised by any job.
+        """
+        futures = {}
+        # one worker per job, so jobs waiting on dependencies cannot
+        # prevent their dependencies from running
+        executor = ThreadPoolExecutor(max_workers=max(1, len(self.nodes)))
+        try:
+            for name, node in self.nodes.items():
+                dependencies = [futures[d] for d in node.dependencies]
+                futures[name] = executor.submit(self._run_node, node, dependencies)
+        finally:
+            executor.shutdown(wait=True)
+        errors = [node.error for node in self.nodes.values() if node.error]
+        if errors:
+            raise errors[0]
+        return {name: future.result() for name, future in futures.items()}
+
+    def _run_node(self, node, dependencies):
+        """Wait for dependencies, then run one job."""
+        start = time.time()
+        try:
+            args = [future.result() for future in dependencies]
+        except Exception as e:
+            node.error = e
+            raise
+        finally:
+            node.wait = time.time() - start
+        start = time.time()
+        try:
+            return node.function(*args)
+        except Exception as e:
+            node.error = e
+            raise
+        finally:
+            node.elapsed = time.time() - start
@@ -0,0 +1,84 @@
+"""Import package attributes on first use (PEP 562).
+
+Packages list their attributes, and the modules that define them:
+
+    __getattr__, __dir__ = LazyImport.lazy_import(
+        __name__,
+        {
+            "Controller": ".Controller:Controller",
+            "Util": ".Util",
+        },
+    )
+
+so importing the package does not import every module it exports.
+"""
+from __future__ import absolute_import
+
+import importlib
+import importlib.util
+import sys
+import types
+
+
+class LazyPackage(types.ModuleType):
+    """Module type for packages that import attributes on first use.
+
+    Importing a submodule binds it to its package, which would hide a
+    class with the same name as its module (``geomagio.Controller``).
+    Those bindings are replaced with the class, as an eager
+    ``from .Controller import Controller`` would.
+    """
+
+    def __setattr__(self, name, value):
+        if isinstance(value, types.ModuleType):
+            target = self.__dict__.get("_lazy_attributes", {}).get(name)
+            if target and target.split(":")[-1] == name:
+                value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+def lazy_import(package, attributes):
+    """Configure a package to import attributes on first use.
+
+    Parameters
+    ----------
+    package : str
+        package name, usually ``__name__``.
+    attributes : dict
+        keys are attribute names.
+        values are a relative module name for attributes that are modules,
+        or "module:name" for attributes defined by a module.
+        other submodules of package are also imported on first use.
+
+    Returns
+    -------
+    tuple
+        ``__getattr__`` and ``__dir__`` functions for the package.
+    """
+    module = sys.modules[package]
+    module.__class__ = LazyPackage
+    module._lazy_attributes = attributes
+
+    def __getattr__(name):
+        try:
+            target = attributes[name]
+        except KeyError:
+            # other submodules, like an eager import of every module would
+            if not name.startswith("__") and importlib.util.find_spec(
+                "{}.{}".format(package, name)
+            ):
+                return importlib.import_module("{}.{}".format(package, name))
+            raise AttributeError(
+                "module {!r} has no attribute {!r}".format(package, name)
+            )
+        module_name, _, attribute = target.partition(":")
+        value = importlib.import_module(module_name, package)
+        if attribute:
+            value = getattr(value, attribute)
+        setattr(module, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(module.__dict__) | set(attributes))
+
+    return __getattr__, __dir__
@@ -1,5 +1,6 @@
 """Simulate metadata service until it is implemented.
 """
+import bisect
 
 
 def get_instrument(observatory, start_time=None, end_time=None, metadata=None):
@@ -14,13 +15,68 @@ def get_instrument(observatory, start_time=None, end_time=None, metadata=None):
       list of matching metadata
     """
     metadata = metadata or _INSTRUMENT_METADATA
-    return [
-        m
-        for m in metadata
-        if m["station"] == observatory
-        and (end_time is None or m["start_time"] is None or m["start_time"] < end_time)
-        and (start_time is None or m["end_time"] is None or m["end_time"] > start_time)
-    ]
+    entries, start_times, end_times = _get_index(metadata).get(
+        observatory, _EMPTY_INDEX
+    )
+    # entries are sorted by start time, skip entries that start too late
+    count = (
+        len(entries)
+        if end_time is None
+        else bisect.bisect_left(start_times, end_time.ns)
+    )
+    start = _NEGATIVE_INFINITY if start_time is None else start_time.ns
+    return [entries[i] for i in range(count) if end_times[i] > start]
+
+
+_EMPTY_INDEX = ([], [], [])
+_NEGATIVE_INFINITY = float("-inf")
+_POSITIVE_INFINITY = float("inf")
+# indexes by id of metadata list, see _get_index
+_INDEXES = {}
+
+
+def _get_index(metadata):
+    """Index metadata by station, sorted by start time.
+
+    Indexes are computed on first use, so metadata lists must not be
+    modified after they are used.
+
+    Args:
+      metadata: list of metadata
+    Returns:
+      dict of station to tuple of
+        list of metadata sorted by start time,
+        list of start times in nanoseconds (negative infinity for None),
+        list of end times in nanoseconds (infinity for None).
+    """
+    cached = _INDEXES.get(id(metadata))
+    if cached is not None and cached[0] is metadata:
+        return cached[1]
+    index = {}
+    for m in metadata:
+        index.setdefault(m["station"], []).append(m)
+    for station, entries in index.items():
+        entries.sort(
+            key=lambda m: _NEGATIVE_INFINITY
+            if m["start_time"] is None
+            else m["start_time"].ns
+        )
+        index[station] = (
+            entries,
+            [
+                _NEGATIVE_INFINITY if m["start_time"] is None else m["start_time"].ns
+                for m in entries
+            ],
+            [
+                _POSITIVE_INFINITY if m["end_time"] is None else m["end_time"].ns
+                for m in entries
+            ],
+        )
+    if len(_INDEXES) > 16:
+        # custom lists are usually temporary, do not keep them alive
+        _INDEXES.clear()
+    _INDEXES[id(metadata)] = (metadata, index)
+    return index
 
 
 """
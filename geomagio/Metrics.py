@@ -0,0 +1,153 @@
+"""Timing instrumentation for factories, algorithms, and clients.
+
+Instrumented code calls `timer()`, which does nothing unless a recorder
+has been configured with `set_recorder()`.
+"""
+from __future__ import absolute_import
+
+import contextlib
+import json
+import sys
+import threading
+import time
+
+
+# recorder used by timer(), None when instrumentation is disabled
+_recorder = None
+
+
+class MetricsRecorder(object):
+    """Write timing records as JSON lines.
+
+    Parameters
+    ----------
+    stream : file
+        where records are written, default stderr.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stderr
+        self.lock = threading.Lock()
+
+    def record(self, name, elapsed, **fields):
+        """Write one record.
+
+        Parameters
+        ----------
+        name : str
+            name of the instrumented operation.
+        elapsed : float
+            seconds spent in operation.
+        **fields
+            additional json serializable values, such as bytes or samples.
+        """
+        record = {"name": name, "time": time.time(), "elapsed": elapsed}
+        record.update(fields)
+        line = json.dumps(record, default=str)
+        with self.lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+def get_recorder():
+    """Get the configured recorder.
+
+    Returns
+    -------
+    MetricsRecorder
+        configured recorder, or None if instrumentation is disabled.
+    """
+    return _recorder
+
+
+def set_recorder(recorder):
+    """Configure the recorder used by timer().
+
+    Parameters
+    ----------
+    recorder : MetricsRecorder
+        recorder to use, or None to disable instrumentation.
+    """
+    global _recorder
+    _recorder = recorder
+
+
+@contextlib.contextmanager
+def timer(name, **fields):
+    """Time a block of code.
+
+    Yields a dictionary of fields, the block may add values (such as bytes
+    or samples) that are included in the record.
+
+    Parameters
+    ----------
+    name : str
+        name of the instrumented operation.
+    **fields
+        initial values for the record.
+    """
+    recorder = _recorder
+    if recorder is None:
+        yield fields
+        return
+    start = time.time()
+    try:
+        yield fields
+    finally:
+        recorder.record(name, time.time() - start, **fields)
+
+
+def get_stream_fields(stream):
+    """Summarize a stream for a timing record.
+
+    Parameters
+    ----------
+    stream : obspy.core.Stream
+        stream to summarize.
+
+    Returns
+    -------
+    dict
+        traces : number of traces
+        samples : total number of samples
+        bytes : total number of bytes of sample data
+    """
+    return {
+        "traces": len(stream),
+        "samples": sum(len(trace.data) for trace in stream),
+        "bytes": sum(trace.data.nbytes for trace in stream),
+    }
+
+
+@contextlib.contextmanager
+def instrument(metrics_file=None, profile_file=None):
+    """Enable instrumentation for a block of code.
+
+    Parameters
+    ----------
+    metrics_file : str
+        append timing records to this file as JSON lines, optional.
+    profile_file : str
+        write cProfile statistics to this file, optional.
+    """
+    stream = None
+    previous = _recorder
+    profile = None
+    if metrics_file is not None:
+        stream = open(metrics_file, "a")
+        set_recorder(MetricsRecorder(stream))
+    if profile_file is not None:
+        # wait to import cProfile until it is needed
+        import cProfile
+
+        profile = cProfile.Profile()
+        profile.enable()
+    try:
+        yield
+    finally:
+        if profile is not None:
+            profile.disable()
+            profile.dump_stats(profile_file)
+        if stream is not None:
+            set_recorder(previous)
+            stream.close()
@@ -0,0 +1,325 @@
+"""Find gaps in recent data for many observatories at once."""
+from __future__ import absolute_import
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+
+from obspy.core import UTCDateTime
+
+from . import TimeseriesUtility
+
+
+class GapIndex(object):
+    """Gaps found by earlier monitor runs.
+
+    Each channel has the time range it was last checked, and its gaps in
+    that range, so later runs only read data since the last check.
+
+    Parameters
+    ----------
+    path : str
+        json file where index is saved, optional.
+        when None, the index is only kept in memory.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def get(self, key):
+        """Get the last check of a channel.
+
+        Parameters
+        ----------
+        key : str
+            channel key, see Monitor.get_key.
+
+        Returns
+        -------
+        tuple (start, checked, gaps), or None if channel has not been checked.
+            start : UTCDateTime
+                start of last check.
+            checked : UTCDateTime
+                end of last check.
+            gaps : list<list<UTCDateTime>>
+                gaps between start and checked,
+                see TimeseriesUtility.get_trace_gaps.
+        """
+        entry = self.entries.get(key)
+        if entry is None or "start" not in entry:
+            # entries saved without start can not be reused
+            return None
+        return (
+            UTCDateTime(entry["start"]),
+            UTCDateTime(entry["checked"]),
+            [[UTCDateTime(t) for t in gap] for gap in entry["gaps"]],
+        )
+
+    def save(self):
+        """Save index to path, if set."""
+        if not self.path:
+            return
+        temp_path = "{}.{}.tmp".format(self.path, os.getpid())
+        with open(temp_path, "w") as f:
+            json.dump(self.entries, f)
+        os.replace(temp_path, self.path)
+
+    def update(self, key, start, checked, gaps):
+        """Set the last check of a channel.
+
+        Parameters
+        ----------
+        key : str
+            channel key, see Monitor.get_key.
+        start : UTCDateTime
+            start of check.
+        checked : UTCDateTime
+            end of check.
+        gaps : list<list<UTCDateTime>>
+            gaps between start and checked.
+        """
+        self.entries[key] = {
+            "start": start.isoformat(),
+            "checked": checked.isoformat(),
+            "gaps": [[t.isoformat() for t in gap] for gap in gaps],
+        }
+
+
+class Monitor(object):
+    """Check observatories for gaps in recent data.
+
+    All observatory and interval combinations are read at the same time,
+    using a bounded pool of threads.
+
+    Parameters
+    ----------
+    get_factory : callable
+        called with (observatory, interval), returns a TimeseriesFactory.
+        factories are not shared between threads.
+    channels : list<str>
+        channels to check.
+    type : str
+        data type to check.
+    gap_index : GapIndex
+        gaps from earlier runs, default is a new in-memory index.
+    max_workers : int
+        maximum number of reads at the same time.
+    """
+
+    def __init__(
+        self,
+        get_factory,
+        channels=("H", "E", "Z", "F"),
+        type="variation",
+        gap_index=None,
+        max_workers=8,
+    ):
+        self.get_factory = get_factory
+        self.channels = list(channels)
+        self.type = type
+        self.gap_index = gap_index or GapIndex()
+        self.max_workers = max_workers
+
+    def check(self, observatories, intervals, starttime, endtime):
+        """Check observatories for gaps.
+
+        Parameters
+        ----------
+        observatories : list<str>
+            observatories to check.
+        intervals : list<str>
+            intervals to check for each observatory.
+        starttime : UTCDateTime
+            start of checked time range.
+        endtime : UTCDateTime
+            end of checked time range.
+
+        Returns
+        -------
+        list<dict>
+            one result for each observatory and interval, in order.
+            see check_observatory.
+        """
+        checks = [
+            (observatory, interval)
+            for observatory in observatories
+            for interval in intervals
+        ]
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_workers, len(checks)))
+        ) as executor:
+            results = list(
+                executor.map(
+                    lambda check: self.check_observatory(
+                        check[0], check[1], starttime, endtime
+                    ),
+                    checks,
+                )
+            )
+        self.gap_index.save()
+        return results
+
+    def check_observatory(self, observatory, interval, starttime, endtime):
+        """Check one observatory and interval for gaps.
+
+        Only data after the previous check of each channel is read, and gaps
+        before then come from the gap index.
+
+        Returns
+        -------
+        dict
+            observatory : str
+            interval : str
+            starttime, endtime : UTCDateTime
+            channels : dict
+                summary for each channel, see get_channel_summary.
+        """
+        delta = TimeseriesUtility.get_delta_from_interval(interval)
+        keys = {
+            channel: self.get_key(observatory, interval, channel)
+            for channel in self.channels
+        }
+        previous = {
+            channel: self._get_previous(keys[channel], starttime, endtime)
+            for channel in self.channels
+        }
+        read_start = min(
+            [self._get_read_start(starttime, *previous[c]) for c in self.channels]
+        )
+        timeseries = self.get_factory(observatory, interval).get_timeseries(
+            starttime=read_start,
+            endtime=endtime,
+            observatory=observatory,
+            channels=self.channels,
+            type=self.type,
+            interval=interval,
+        )
+        new_gaps = TimeseriesUtility.get_stream_gaps(timeseries)
+        summaries = {}
+        for channel in self.channels:
+            if channel in new_gaps:
+                read_gaps = new_gaps[channel]
+            else:
+                # no data for channel
+                read_gaps = [[read_start, endtime, endtime + delta]]
+            gaps = _combine_gaps(previous[channel][1], read_gaps, read_start, delta)
+            gaps = [
+                [max(gap[0], starttime), gap[1], gap[2]]
+                for gap in gaps
+                if gap[1] >= starttime
+            ]
+            self.gap_index.update(keys[channel], starttime, endtime, gaps)
+            summaries[channel] = get_channel_summary(gaps, starttime, endtime, delta)
+        return {
+            "observatory": observatory,
+            "interval": interval,
+            "starttime": starttime,
+            "endtime": endtime,
+            "channels": summaries,
+        }
+
+    def get_key(self, observatory, interval, channel):
+        """Key for one channel in the gap index."""
+        return "{}.{}.{}.{}".format(observatory, self.type, interval, channel)
+
+    def _get_previous(self, key, starttime, endtime):
+        """Get previous check that can be reused for this range.
+
+        The previous check must start at or before starttime, so it covers
+        all data before the time it was checked.
+
+        Returns
+        -------
+        tuple (checked, gaps)
+            checked is None when the previous check cannot be used.
+        """
+        previous = self.gap_index.get(key)
+        if previous is None:
+            return (None, [])
+        start, checked, gaps = previous
+        if not (start <= starttime <= checked <= endtime):
+            return (None, [])
+        return (checked, gaps)
+
+    def _get_read_start(self, starttime, checked, gaps):
+        """Get the start of data to read for a channel."""
+        if checked is None:
+            return starttime
+        if gaps and gaps[-1][1] >= checked:
+            # gap was open at the end of the last check, it may be filled now
+            return max(starttime, gaps[-1][0])
+        return checked
+
+
+def get_channel_summary(gaps, starttime, endtime, delta):
+    """Summarize gaps for one channel.
+
+    Parameters
+    ----------
+    gaps : list<list<UTCDateTime>>
+        gaps between starttime and endtime.
+    starttime : UTCDateTime
+        start of checked time range.
+    endtime : UTCDateTime
+        end of checked time range.
+    delta : float
+        seconds between samples.
+
+    Returns
+    -------
+    dict
+        gaps : gaps in channel.
+        last_time : time of last value, or endtime when data is current.
+        gap_total : number of missing samples.
+        count : number of samples between starttime and endtime.
+        percentage : percentage of missing samples.
+    """
+    first = UTCDateTime(-(-starttime.timestamp // delta) * delta)
+    count = int((endtime - first) // delta) + 1
+    gap_total = sum(int(round((gap[2] - gap[0]) / delta)) for gap in gaps)
+    last_time = endtime
+    if gaps and gaps[-1][2] >= endtime:
+        last_time = gaps[-1][0]
+    return {
+        "gaps": gaps,
+        "last_time": last_time,
+        "gap_total": gap_total,
+        "count": count,
+        "percentage": count and 100.0 * gap_total / count or 0.0,
+    }
+
+
+def get_json(results):
+    """Format monitor results as json.
+
+    Parameters
+    ----------
+    results : list<dict>
+        results from Monitor.check.
+
+    Returns
+    -------
+    str
+        json, with times formatted as ISO8601 strings.
+    """
+    return json.dumps(
+        results,
+        default=lambda o: o.isoformat() if isinstance(o, UTCDateTime) else str(o),
+    )
+
+
+def _combine_gaps(previous_gaps, read_gaps, read_start, delta):
+    """Combine gaps before read_start with gaps found since read_start."""
+    combined = []
+    for gap in previous_gaps:
+        if gap[0] >= read_start:
+            continue
+        if gap[1] >= read_start:
+            # data since read_start was read again
+            gap = [gap[0], read_start - delta, read_start]
+        combined.append(gap)
+    return TimeseriesUtility.get_merged_gaps({"previous": combined, "read": read_gaps})
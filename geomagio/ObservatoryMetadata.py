@@ -1,4 +1,26 @@
 """Factory that loads metadata for an observatory"""
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from obspy.core import Stats
+from obspy.core.util import AttribDict
+
+# keys that Stats converts, or uses to derive other keys, when they are set
+_STATS_CONVERTED_KEYS = frozenset(
+    [
+        "calib",
+        "channel",
+        "component",
+        "delta",
+        "endtime",
+        "location",
+        "network",
+        "npts",
+        "sampling_rate",
+        "starttime",
+        "station",
+    ]
+)
 
 
 # default metadata for the 14 USGS observatories.
@@ -949,6 +971,18 @@ DEFAULT_INTERVAL_SPECIFIC = {
 class ObservatoryMetadata(object):
     """Helper class for providing all the metadata needed for a geomag
           timeseries.
+
+    Attributes
+    ----------
+    metadata : dict
+        metadata by observatory.
+    interval_specific : dict
+        metadata by interval, for observatories without interval_specific
+        metadata.
+        metadata and interval_specific are cached for each observatory, type,
+        and interval the first time they are used, and later changes are not
+        used.  Create a new ObservatoryMetadata after changing them.
+
     Notes
     -----
     Currently the only method is set_metadata.  Eventually this will probably
@@ -958,6 +992,52 @@ class ObservatoryMetadata(object):
     def __init__(self, metadata=None, interval_specific=None):
         self.metadata = metadata or DEFAULT_METADATA
         self.interval_specific = interval_specific or DEFAULT_INTERVAL_SPECIFIC
+        # templates by (observatory, type, interval), see get_template
+        self._templates = {}
+        # names of template values that Stats converts to AttribDict
+        self._template_mappings = {}
+
+    def get_template(self, observatory, type, interval):
+        """Get the metadata that set_metadata copies into stats.
+
+        Templates are computed on first use, and values are shared with
+        metadata, so template values must not be modified.
+
+        Parameters
+        ----------
+        observatory : string
+            the observatory code to look up.
+        type : {'variation', 'quasi-definitive'}
+            data type.
+        interval : {'minute', 'second'}
+            data interval.
+
+        Returns
+        -------
+        mappingproxy
+            read only mapping of metadata keys to values.
+        """
+        key = (observatory, type, interval)
+        template = self._templates.get(key)
+        if template is not None:
+            return template
+        values = {"data_interval": interval, "data_type": type}
+        if observatory in self.metadata:
+            # copy in standard metadata
+            values.update(self.metadata[observatory]["metadata"])
+            # copy in interval specific metadata
+            interval_specific = self.metadata[observatory].get(
+                "interval_specific", self.interval_specific
+            )
+            values.update(interval_specific.get(interval, {}))
+        template = MappingProxyType(values)
+        self._templates[key] = template
+        self._template_mappings[key] = tuple(
+            name
+            for name, value in values.items()
+            if isinstance(value, Mapping) and not isinstance(value, AttribDict)
+        )
+        return template
 
     def set_metadata(self, stats, observatory, channel, type, interval):
         """Set timeseries metadata (aka a traces stats)
@@ -982,19 +1062,12 @@ class ObservatoryMetadata(object):
           the combined stats and the default metadata.
         """
         stats["channel"] = channel
-        stats["data_interval"] = interval
-        stats["data_type"] = type
-        if observatory not in self.metadata:
-            return
-        # copy in standard metadata
-        metadata = self.metadata[observatory]["metadata"]
-        for key in metadata:
-            stats[key] = metadata[key]
-        # copy in interval specific metadata
-        interval_specific = self.interval_specific
-        if "interval_specific" in self.metadata[observatory]:
-            interval_specific = self.metadata[observatory]["interval_specific"]
-        # stats['data_interval_type'] = data_interval_type[interval]
-        if interval in interval_specific:
-            for key in interval_specific[interval]:
-                stats[key] = interval_specific[interval][key]
+        template = self.get_template(observatory, type, interval)
+        if isinstance(stats, Stats) and _STATS_CONVERTED_KEYS.isdisjoint(template):
+            # skip Stats.__setitem__ for each key
+            stats.__dict__.update(template)
+            # like Stats, each trace gets its own copy of mappings
+            for name in self._template_mappings[(observatory, type, interval)]:
+                stats.__dict__[name] = AttribDict(template[name])
+        else:
+            stats.update(template)
@@ -0,0 +1,205 @@
+"""Staged pipeline execution with bounded queues."""
+from __future__ import absolute_import
+
+import sys
+import threading
+import time
+
+try:
+    # python 3
+    import queue
+except ImportError:
+    # python 2
+    import Queue as queue
+
+
+# marker passed between stages when there are no more items
+_DONE = object()
+
+
+class PipelineStage(object):
+    """One stage of a pipeline.
+
+    Parameters
+    ----------
+    name : str
+        name of stage, used for metrics.
+    function : callable
+        called with each item from the previous stage,
+        return value is passed to the next stage.
+        first stage is called with items from the pipeline source.
+    """
+
+    def __init__(self, name, function):
+        self.name = name
+        self.function = function
+        self.count = 0
+        self.elapsed = 0.0
+        self.wait = 0.0
+
+    def get_metrics(self):
+        """Get timing metrics for this stage.
+
+        Returns
+        -------
+        dict
+            count : number of items processed
+            elapsed : seconds spent in `function`
+            wait : seconds spent waiting for input or output queue space
+        """
+        return {
+            "name": self.name,
+            "count": self.count,
+            "elapsed": self.elapsed,
+            "wait": self.wait,
+        }
+
+
+class Pipeline(object):
+    """Run items through stages concurrently.
+
+    Each stage runs in its own thread, and stages are connected by bounded
+    queues.  While stage N processes item i, stage N-1 may already be
+    working on item i+1.  Items are processed in order by every stage.
+
+    Parameters
+    ----------
+    stages : list<PipelineStage>
+        stages to run, in order.
+    queue_depth : int
+        maximum number of items waiting between two stages.
+    """
+
+    def __init__(self, stages, queue_depth=1):
+        self.stages = stages
+        self.queue_depth = queue_depth
+        self.results = []
+
+    def get_metrics(self):
+        """Get timing metrics for all stages.
+
+        Returns
+        -------
+        list<dict>
+            metrics for each stage, see PipelineStage.get_metrics.
+        """
+        return [stage.get_metrics() for stage in self.stages]
+
+    def print_metrics(self, out=sys.stderr):
+        """Print a summary of stage metrics.
+
+        Parameters
+        ----------
+        out : file
+            where summary is written, default stderr.
+        """
+        for metrics in self.get_metrics():
+            print(
+                "stage {name}: count={count}, elapsed={elapsed:.3f}s,"
+                " wait={wait:.3f}s".format(**metrics),
+                file=out,
+            )
+
+    def run(self, items):
+        """Run items through pipeline.
+
+        Parameters
+        ----------
+        items : iterable
+            items passed to the first stage.
+
+        Returns
+        -------
+        list
+            return values from last stage.
+
+        Raises
+        ------
+        Exception
+            the first exception raised by any stage.
+        """
+        self.results = []
+        errors = []
+        abort = threading.Event()
+        queues = [
+            queue.Queue(maxsize=self.queue_depth) for _ in range(len(self.stages) + 1)
+        ]
+        threads = [
+            threading.Thread(
+                target=self._run_stage,
+                args=(stage, queues[i], queues[i + 1], abort, errors),
+            )
+            for i, stage in enumerate(self.stages)
+        ]
+        results = threading.Thread(
+            target=self._collect, args=(queues[-1], abort, errors)
+        )
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        results.daemon = True
+        results.start()
+        try:
+            for item in items:
+                if not self._put(queues[0], item, abort):
+                    break
+        except Exception as e:
+            errors.append(e)
+            abort.set()
+        self._put(queues[0], _DONE, abort)
+        for thread in threads:
+            thread.join()
+        results.join()
+        if errors:
+            raise errors[0]
+        return self.results
+
+    def _collect(self, input_queue, abort, errors):
+        """Collect output of last stage."""
+        while True:
+            item = self._get(input_queue, abort)
+            if item is _DONE:
+                break
+            self.results.append(item)
+
+    def _get(self, input_queue, abort):
+        """Get next item from a queue, or _DONE when aborted."""
+        while not abort.is_set():
+            try:
+                return input_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return _DONE
+
+    def _put(self, output_queue, item, abort):
+        """Put item in a queue, returns False when aborted."""
+        while not abort.is_set():
+            try:
+                output_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _run_stage(self, stage, input_queue, output_queue, abort, errors):
+        """Thread target that processes items for one stage."""
+        while True:
+            start = time.time()
+            item = self._get(input_queue, abort)
+            stage.wait += time.time() - start
+            if item is _DONE:
+                break
+            start = time.time()
+            try:
+                result = stage.function(item)
+            except Exception as e:
+                errors.append(e)
+                abort.set()
+                break
+            stage.elapsed += time.time() - start
+            stage.count += 1
+            start = time.time()
+            if not self._put(output_queue, result, abort):
+                break
+            stage.wait += time.time() - start
+        self._put(output_queue, _DONE, abort)
@@ -1,6 +1,9 @@
 """Abstract Timeseries Factory Interface."""
 from __future__ import absolute_import, print_function
 
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+import itertools
 import numpy
 import obspy.core
 import os
@@ -21,6 +24,10 @@ class TimeseriesFactory(object):
         - implementing `write_file`
         - or, overriding `put_timeseries`
 
+    Factories whose `write_file` outputs headers followed by one fixed
+    width row per sample may set `fixed_width_rows`, so `put_timeseries`
+    overwrites rows of existing files in place instead of rewriting them.
+
     Attributes
     ----------
     observatory : str
@@ -41,8 +48,14 @@ class TimeseriesFactory(object):
     urlInterval : int
         Interval in seconds between URLs.
         Intervals begin at the unix epoch (1970-01-01T00:00:00Z)
+    urlWorkers : int
+        Number of processes used to read and parse file:// urls.
+        default 1, which reads urls in the calling process.
     """
 
+    # whether write_file outputs one fixed width row per sample
+    fixed_width_rows = False
+
     def __init__(
         self,
         observatory=None,
@@ -51,6 +64,7 @@ class TimeseriesFactory(object):
         interval="minute",
         urlTemplate="",
         urlInterval=-1,
+        urlWorkers=1,
     ):
         self.observatory = observatory
         self.channels = channels
@@ -58,6 +72,7 @@ class TimeseriesFactory(object):
         self.interval = interval
         self.urlTemplate = urlTemplate
         self.urlInterval = urlInterval
+        self.urlWorkers = urlWorkers
 
     def get_timeseries(
         self,
@@ -109,41 +124,53 @@ class TimeseriesFactory(object):
         type = type or self.type
         interval = interval or self.interval
 
-        timeseries = obspy.core.Stream()
         urlIntervals = Util.get_intervals(
             starttime=starttime, endtime=endtime, size=self.urlInterval
         )
-        for urlInterval in urlIntervals:
-            url = self._get_url(
+        urls = [
+            self._get_url(
                 observatory=observatory,
                 date=urlInterval["start"],
                 type=type,
                 interval=interval,
                 channels=channels,
             )
-            try:
-                data = Util.read_url(url)
-            except IOError as e:
-                print("Error reading url: %s, continuing" % str(e), file=sys.stderr)
-                continue
-            try:
-                timeseries += self.parse_string(
-                    data,
-                    observatory=observatory,
-                    type=type,
-                    interval=interval,
-                    channels=channels,
+            for urlInterval in urlIntervals
+        ]
+        parse_args = {
+            "observatory": observatory,
+            "type": type,
+            "interval": interval,
+            "channels": channels,
+        }
+        if (
+            self.urlWorkers > 1
+            and len(urls) > 1
+            and all(url.startswith("file://") for url in urls)
+        ):
+            # parsing is cpu bound, use processes
+            with ProcessPoolExecutor(max_workers=self.urlWorkers) as executor:
+                streams = list(
+                    executor.map(
+                        _read_timeseries_url,
+                        itertools.repeat(self),
+                        urls,
+                        itertools.repeat(parse_args),
+                    )
                 )
-            except NotImplementedError:
-                raise NotImplementedError('"get_timeseries" not implemented')
-            except Exception as e:
-                print("Error parsing data: " + str(e), file=sys.stderr)
-                print(data, file=sys.stderr)
+        else:
+            streams = [_read_timeseries_url(self, url, parse_args) for url in urls]
+        timeseries = obspy.core.Stream()
+        for stream in streams:
+            timeseries += stream
         if channels is not None:
             filtered = obspy.core.Stream()
             for channel in channels:
                 filtered += timeseries.select(channel=channel)
             timeseries = filtered
+        combined = self._combine_timeseries(timeseries, starttime, endtime)
+        if combined is not None:
+            return combined
         timeseries.merge()
         timeseries.trim(
             starttime=starttime,
@@ -154,6 +181,69 @@ class TimeseriesFactory(object):
         )
         return timeseries
 
+    def _combine_timeseries(self, timeseries, starttime, endtime):
+        """Copy traces into one preallocated trace per channel.
+
+        Avoids concatenating and merging traces, when each channel has one
+        trace id and all traces are on the sample grid of starttime.
+
+        Parameters
+        ----------
+        timeseries : obspy.core.Stream
+            traces parsed from each url, in order.
+        starttime : UTCDateTime
+            time of first sample.
+        endtime : UTCDateTime
+            time of last sample.
+
+        Returns
+        -------
+        obspy.core.Stream
+            one trace per channel covering [starttime, endtime],
+            with gaps filled with numpy.nan.
+            None if traces cannot be combined this way.
+        """
+        if len(timeseries) == 0:
+            return None
+        delta = timeseries[0].stats.delta
+        samples = (endtime - starttime) / delta
+        if abs(samples - round(samples)) < 1e-6:
+            samples = round(samples)
+        npts = int(samples) + 1
+        if npts <= 0:
+            return None
+        # trace for each channel, in order of first trace
+        combined = {}
+        for trace in timeseries:
+            stats = trace.stats
+            offset = (stats.starttime - starttime) / delta
+            if (
+                stats.delta != delta
+                or abs(offset - round(offset)) > 1e-6
+                or trace.data.dtype.kind != "f"
+                or isinstance(trace.data, numpy.ma.MaskedArray)
+            ):
+                return None
+            if stats.channel not in combined:
+                out = obspy.core.Trace(header=stats.copy())
+                out.stats.starttime = starttime
+                out.data = numpy.full(npts, numpy.nan)
+                combined[stats.channel] = out
+            out = combined[stats.channel]
+            if out.id != trace.id:
+                return None
+            # copy samples within [starttime, endtime] into slot
+            offset = int(round(offset))
+            start = max(0, -offset)
+            end = min(len(trace.data), npts - offset)
+            if start >= end:
+                continue
+            data = trace.data[start:end]
+            slot = out.data[offset + start : offset + end]
+            valid = ~numpy.isnan(data)
+            slot[valid] = data[valid]
+        return obspy.core.Stream(list(combined.values()))
+
     def parse_string(self, data, **kwargs):
         """Creates error message that this functions is not implemented by
         TimeseriesFactory.
@@ -239,6 +329,17 @@ class TimeseriesFactory(object):
                 endtime=interval_end,
             )
             url_file = Util.get_file_from_url(url, createParentDirectory=True)
+            # existing data file, update rows in place when possible
+            if os.path.isfile(url_file) and self._update_file(
+                url_file=url_file,
+                timeseries=url_data,
+                channels=channels,
+                type=type,
+                interval=interval,
+                starttime=interval_start,
+                endtime=interval_end,
+            ):
+                continue
             # existing data file, merge new data into existing
             if os.path.isfile(url_file):
                 try:
@@ -280,6 +381,158 @@ class TimeseriesFactory(object):
                 except NotImplementedError:
                     raise NotImplementedError('"put_timeseries" not implemented')
 
+    def _update_file(
+        self, url_file, timeseries, channels, type, interval, starttime, endtime
+    ):
+        """Update rows of an existing file in place.
+
+        Only rows between the first and last sample of timeseries, and the
+        rows next to them, are read and merged with timeseries.
+        Rows between the first and last sample are overwritten,
+        with the same result as merging timeseries into the whole file.
+
+        Parameters
+        ----------
+        url_file : str
+            path to existing file.
+        timeseries : obspy.core.Stream
+            stream containing traces to store.
+        channels : array_like
+            list of channels to store.
+        type : str
+            data type.
+        interval : str
+            data interval.
+        starttime : UTCDateTime
+            time of first row in file.
+        endtime : UTCDateTime
+            time of last row in file.
+
+        Returns
+        -------
+        bool
+            True if rows were updated,
+            False if file must be rewritten because headers changed,
+            or file does not have one fixed width row per sample.
+        """
+        if not self.fixed_width_rows or len(timeseries) == 0:
+            return False
+        delta = timeseries[0].stats.delta
+        window_start, window_end = TimeseriesUtility.get_stream_start_end_times(
+            timeseries
+        )
+        window_start = max(window_start, starttime)
+        window_end = min(window_end, endtime)
+        row_count = int(round((endtime - starttime) / delta)) + 1
+        first_row = int(round((window_start - starttime) / delta))
+        rows = int(round((window_end - window_start) / delta)) + 1
+        if (
+            rows <= 0
+            or rows >= row_count
+            or starttime + first_row * delta != window_start
+        ):
+            return False
+        window = timeseries.copy()
+        window.trim(
+            starttime=window_start,
+            endtime=window_end,
+            nearest_sample=False,
+            pad=True,
+            fill_value=numpy.nan,
+        )
+        new_file = self._format_file(window, channels)
+        # headers are the same when file has the same layout
+        row_length, remainder = divmod(
+            os.path.getsize(url_file) - len(new_file), row_count - rows
+        )
+        header_length = len(new_file) - rows * row_length
+        if remainder != 0 or row_length <= 0 or header_length < 0:
+            return False
+        header = new_file[:header_length]
+        with open(url_file, "r+b") as fh:
+            if fh.read(header_length) != header:
+                return False
+            # merge_streams uses data from the run of values with the last
+            # endtime, read the rows next to the window to find which existing
+            # runs continue outside it (this also gives parsers the two rows
+            # they need to determine sample rate)
+            read_first = max(first_row - 1, 0)
+            read_rows = min(first_row + rows, row_count - 1) - read_first + 1
+            fh.seek(header_length + read_first * row_length)
+            existing_rows = fh.read(read_rows * row_length)
+            if not self._is_fixed_width(existing_rows, read_rows, row_length):
+                return False
+            existing_data = self.parse_string(
+                (header + existing_rows).decode(),
+                observatory=window[0].stats.station,
+                type=type,
+                interval=interval,
+                channels=channels,
+            )
+            for trace in existing_data:
+                if (
+                    trace.stats.starttime != starttime + read_first * delta
+                    or trace.stats.npts != read_rows
+                ):
+                    return False
+                # make location codes match, like put_timeseries
+                trace.stats.location = window[0].stats.location
+            merged = TimeseriesUtility.merge_streams(existing_data, window)
+            for trace in merged:
+                # merged traces may start or end outside the window,
+                # copy their values for rows in the window
+                offset = int(round((trace.stats.starttime - window_start) / delta))
+                start = max(offset, 0)
+                end = min(offset + len(trace.data), rows)
+                data = numpy.full(rows, numpy.nan)
+                if start < end:
+                    data[start:end] = trace.data[start - offset : end - offset]
+                trace.data = data
+                trace.stats.starttime = window_start
+            new_rows = self._format_file(merged, channels)[-rows * row_length :]
+            if not self._is_fixed_width(new_rows, rows, row_length):
+                return False
+            fh.seek(header_length + first_row * row_length)
+            fh.write(new_rows)
+        return True
+
+    def _format_file(self, timeseries, channels):
+        """Format timeseries using write_file.
+
+        Writers may modify timeseries, so a copy is written.
+
+        Returns
+        -------
+        bytes
+            file contents.
+        """
+        out = BytesIO()
+        self.write_file(out, timeseries.copy(), channels)
+        return out.getvalue()
+
+    def _is_fixed_width(self, data, rows, row_length):
+        """Check whether data contains rows of row_length bytes.
+
+        Parameters
+        ----------
+        data : bytes
+            rows to check.
+        rows : int
+            expected number of rows.
+        row_length : int
+            expected bytes per row, including newline.
+
+        Returns
+        -------
+        bool
+            True if data has expected number of rows, each ending with newline.
+        """
+        return (
+            len(data) == rows * row_length
+            and data.count(b"\n") == rows
+            and data[row_length - 1 :: row_length] == b"\n" * rows
+        )
+
     def write_file(self, fh, timeseries, channels):
         """Write timeseries data to the given file object.
 
@@ -502,3 +755,37 @@ class TimeseriesFactory(object):
         else:
             raise TimeseriesFactoryException('Unsupported type "%s"' % type)
         return type_name
+
+
+def _read_timeseries_url(factory, url, parse_args):
+    """Read and parse one url for TimeseriesFactory.get_timeseries.
+
+    Module level function, so it can be called in worker processes.
+
+    Parameters
+    ----------
+    factory : TimeseriesFactory
+        factory used to parse data.
+    url : str
+        url to read.
+    parse_args : dict
+        keyword arguments for factory.parse_string.
+
+    Returns
+    -------
+    obspy.core.Stream
+        parsed data, or empty stream if url could not be read or parsed.
+    """
+    try:
+        data = Util.read_url(url)
+    except IOError as e:
+        print("Error reading url: %s, continuing" % str(e), file=sys.stderr)
+        return obspy.core.Stream()
+    try:
+        return factory.parse_string(data, **parse_args)
+    except NotImplementedError:
+        raise NotImplementedError('"get_timeseries" not implemented')
+    except Exception as e:
+        print("Error parsing data: " + str(e), file=sys.stderr)
+        print(data, file=sys.stderr)
+    return obspy.core.Stream()
@@ -188,29 +188,22 @@ def get_trace_gaps(trace):
     array of gaps, which is empty when there are no gaps.
     each gap is an array [start of gap, end of gap, next sample]
     """
-    gaps = []
-    gap = None
-    data = trace.data
     stats = trace.stats
     starttime = stats.starttime
-    length = len(data)
     delta = stats.delta
-    for i in range(0, length):
-        if numpy.isnan(data[i]):
-            if gap is None:
-                # start of a gap
-                gap = [starttime + i * delta]
-        else:
-            if gap is not None:
-                # end of a gap
-                gap.extend([starttime + (i - 1) * delta, starttime + i * delta])
-                gaps.append(gap)
-                gap = None
-    # check for gap at end
-    if gap is not None:
-        gap.extend([starttime + (length - 1) * delta, starttime + length * delta])
-        gaps.append(gap)
-    return gaps
+    missing = numpy.ma.filled(numpy.isnan(trace.data), False)
+    # indexes where gaps start and where data resumes
+    changes = numpy.flatnonzero(
+        numpy.diff(numpy.concatenate(([0], missing.astype(numpy.int8), [0])))
+    )
+    return [
+        [
+            starttime + start * delta,
+            starttime + (end - 1) * delta,
+            starttime + end * delta,
+        ]
+        for start, end in zip(changes[::2], changes[1::2])
+    ]
 
 
 def get_merged_gaps(gaps):
@@ -303,6 +296,49 @@ def get_trace_value(traces, time, default=None):
     return default
 
 
+def get_trace_values(traces, times, defaults=None):
+    """Get values at many times.
+
+    Same as calling get_trace_value for each time, but uses one
+    searchsorted per trace instead of one per time.
+
+    Parameters
+    ----------
+    traces : list<obspy.core.Trace>
+        traces to search, values from earlier traces are used first.
+    times : list<obspy.core.UTCDateTime>
+        times of values.
+    defaults : list
+        default for each time, when no value is found or value is NaN.
+        default None.
+
+    Returns
+    -------
+    list
+        value from traces at each time, or default.
+    """
+    values = list(defaults) if defaults is not None else [None] * len(times)
+    if len(times) == 0:
+        return values
+    times_ns = numpy.array([time.ns for time in times], dtype=numpy.int64)
+    found = numpy.zeros(len(times), dtype=bool)
+    for trace in traces:
+        if trace.stats.npts == 0:
+            continue
+        delta_ns = int(round(trace.stats.delta * 1e9))
+        trace_ns = trace.stats.starttime.ns + delta_ns * numpy.arange(
+            trace.stats.npts, dtype=numpy.int64
+        )
+        index = numpy.minimum(trace_ns.searchsorted(times_ns), len(trace_ns) - 1)
+        matches = (trace_ns[index] == times_ns) & ~found
+        for i in numpy.flatnonzero(matches):
+            trace_value = trace.data[index[i]]
+            if not numpy.isnan(trace_value):
+                values[i] = trace_value
+        found |= matches
+    return values
+
+
 def has_all_channels(stream, channels, starttime, endtime):
     """Check whether all channels have any data within time range.
 
@@ -415,6 +451,13 @@ def unmask_stream(stream):
 def merge_streams(*streams):
     """Merge one or more streams.
 
+    Traces with the same network, station, location, and channel are
+    combined on a common sample grid.
+    Where traces overlap, data from the trace with the last endtime is used.
+    Traces that were combined from more than one trace come first,
+    followed by traces that were not, each sorted by network, station,
+    location, and channel.
+
     Parameters
     ----------
     *streams : obspy.core.Stream
@@ -431,6 +474,234 @@ def merge_streams(*streams):
     for stream in streams:
         merged += stream
 
+    groups = {}
+    for trace in merged:
+        stats = trace.stats
+        key = (stats.network, stats.station, stats.location, stats.channel)
+        groups.setdefault(key, []).append(trace)
+    fragments = {}
+    for key, traces in groups.items():
+        fragments[key] = _get_merge_fragments(traces)
+        if fragments[key] is None:
+            # traces not on a common grid, use obspy
+            return _merge_streams_obspy(merged)
+
+    # like obspy, traces that were combined come before those that were not,
+    # each sorted by network, station, location, and channel.
+    # (obspy orders traces by id(), which is not always this order when
+    # memory of a removed trace is reused for a combined trace)
+    combined = obspy.core.Stream()
+    single = obspy.core.Stream()
+    for key in sorted(groups):
+        if len(fragments[key][0]) == 0:
+            # only empty traces
+            continue
+        trace, count = _merge_fragments(groups[key], *fragments[key])
+        if count > 1:
+            combined += trace
+        else:
+            single += trace
+    return combined + single
+
+
+def _get_merge_fragments(traces):
+    """Find contiguous runs of data in traces with the same id.
+
+    Parameters
+    ----------
+    traces : list of obspy.core.Trace
+        traces with the same network, station, location, and channel.
+
+    Returns
+    -------
+    tuple
+        (starts, ends, sources, offsets)
+        starts, ends : numpy.ndarray
+            inclusive sample index of each run on the common grid,
+            sorted by start and end.
+        sources : numpy.ndarray
+            index of trace containing each run.
+        offsets : numpy.ndarray
+            sample index of each trace start on the common grid.
+        None when traces can not be merged on a common grid.
+    """
+    valid = []
+    for trace in traces:
+        data = trace.data
+        if isinstance(data, numpy.ma.MaskedArray) or data.dtype.kind != "f":
+            return None
+        valid.append(numpy.isfinite(data))
+    if not any(v.any() for v in valid):
+        if any(len(trace.data) == 0 for trace in traces):
+            # like obspy split(), empty traces hide traces without valid data
+            valid = []
+        else:
+            # no valid data, traces are merged as they are (including nan)
+            valid = [numpy.ones(len(trace.data), dtype=bool) for trace in traces]
+    contributing = [i for i, v in enumerate(valid) if v.any()]
+    if not contributing:
+        return (numpy.array([], dtype=int),) * 4
+    first = traces[contributing[0]].stats
+    delta_ns = int(round(first.delta * 1e9))
+    if delta_ns <= 0 or abs(first.delta * 1e9 - delta_ns) > 1e-3:
+        return None
+    offsets = numpy.zeros(len(traces), dtype=numpy.int64)
+    for i in contributing:
+        trace = traces[i]
+        stats = trace.stats
+        offset, remainder = divmod(stats.starttime.ns - first.starttime.ns, delta_ns)
+        if (
+            remainder != 0
+            or stats.sampling_rate != first.sampling_rate
+            or stats.calib != first.calib
+            or trace.data.dtype != traces[contributing[0]].data.dtype
+        ):
+            return None
+        offsets[i] = offset
+    starts, ends, sources = [], [], []
+    for i in contributing:
+        # +1 where a run starts, -1 after a run ends
+        edges = numpy.diff(numpy.concatenate(([0], valid[i].view(numpy.int8), [0])))
+        run_starts = numpy.flatnonzero(edges == 1)
+        starts.append(run_starts + offsets[i])
+        ends.append(numpy.flatnonzero(edges == -1) - 1 + offsets[i])
+        sources.append(numpy.full(len(run_starts), i))
+    starts = numpy.concatenate(starts)
+    ends = numpy.concatenate(ends)
+    sources = numpy.concatenate(sources)
+    # same order as obspy, which sorts by starttime and endtime (stable)
+    order = numpy.lexsort((sources, ends, starts))
+    return starts[order], ends[order], sources[order], offsets
+
+
+def _merge_fragments(traces, starts, ends, sources, offsets):
+    """Combine runs of data found by _get_merge_fragments.
+
+    Runs that do not overlap, or touch, other runs are copied directly.
+    Other runs are combined the same way as obspy.core.Stream.merge(method=1),
+    where consistent or adjacent runs are joined first, and then data from
+    the run with the last endtime is used.
+
+    Returns
+    -------
+    tuple
+        (trace, count)
+        trace : obspy.core.Trace
+            merged trace.
+        count : int
+            number of traces combined after joining consistent runs.
+    """
+    first_sample = starts[0]
+    dtype = traces[sources[0]].data.dtype
+    data = numpy.full(ends.max() - first_sample + 1, numpy.nan, dtype=dtype)
+    # runs that overlap or touch a previous run
+    max_end = numpy.maximum.accumulate(ends)
+    touches = numpy.zeros(len(starts), dtype=bool)
+    touches[1:] = starts[1:] <= max_end[:-1] + 1
+    # clusters of runs that touch, as [start, stop) indices
+    cluster_starts = numpy.flatnonzero(~touches)
+    cluster_stops = numpy.append(cluster_starts[1:], len(starts))
+    clustered = numpy.repeat(
+        cluster_stops - cluster_starts > 1, cluster_stops - cluster_starts
+    )
+    # copy isolated runs
+    for source in numpy.unique(sources[~clustered]):
+        selected = ~clustered & (sources == source)
+        trace_data = traces[source].data
+        # +1 at run start, -1 after run end
+        marks = numpy.zeros(len(trace_data) + 1, dtype=numpy.int64)
+        numpy.add.at(marks, starts[selected] - offsets[source], 1)
+        numpy.add.at(marks, ends[selected] - offsets[source] + 1, -1)
+        indices = numpy.flatnonzero(numpy.cumsum(marks[:-1]))
+        data[indices + offsets[source] - first_sample] = trace_data[indices]
+    count = numpy.count_nonzero(~clustered)
+    first_source = sources[0]
+    # combine clusters of touching runs
+    for begin, stop in zip(cluster_starts, cluster_stops):
+        if stop - begin == 1:
+            continue
+        joined = _join_fragments(
+            traces, starts[begin:stop], ends[begin:stop], sources[begin:stop], offsets
+        )
+        count += len(joined)
+        # obspy sorts again, joined runs may have later endtimes
+        joined.sort(key=lambda j: (j[0], j[1]))
+        if begin == 0:
+            first_source = joined[0][2][0][0]
+        run_end = None
+        for start, end, pieces in joined:
+            if run_end is not None and end <= run_end:
+                # contained, keep earlier data
+                continue
+            for source, piece_start, piece_end in pieces:
+                data[
+                    piece_start - first_sample : piece_end - first_sample + 1
+                ] = traces[source].data[
+                    piece_start - offsets[source] : piece_end - offsets[source] + 1
+                ]
+            run_end = end
+    stats = traces[first_source].stats.copy()
+    stats.starttime += stats.delta * int(first_sample - offsets[first_source])
+    trace = obspy.core.Trace(header=stats)
+    trace.data = data
+    return trace, count
+
+
+def _join_fragments(traces, starts, ends, sources, offsets):
+    """Join consistent or adjacent runs, like obspy.core.Stream._cleanup.
+
+    Returns
+    -------
+    list
+        (start, end, pieces) for each joined run,
+        where pieces is a list of (source, start, end).
+    """
+
+    def get_data(pieces, start, end):
+        values = [
+            traces[source].data[
+                max(start, piece_start)
+                - offsets[source] : min(end, piece_end)
+                - offsets[source]
+                + 1
+            ]
+            for source, piece_start, piece_end in pieces
+            if piece_start <= end and piece_end >= start
+        ]
+        return numpy.concatenate(values)
+
+    joined = []
+    current = None
+    for start, end, source in zip(starts, ends, sources):
+        if current is not None:
+            current_start, current_end, pieces = current
+            if start <= current_end:
+                # overlap, join when data is the same
+                overlap_end = min(current_end, end)
+                if numpy.array_equal(
+                    get_data(pieces, start, overlap_end),
+                    get_data([(source, start, end)], start, overlap_end),
+                ):
+                    if end > current_end:
+                        pieces.append((source, current_end + 1, end))
+                        current = (current_start, end, pieces)
+                    continue
+            elif start == current_end + 1:
+                # adjacent
+                pieces.append((source, start, end))
+                current = (current_start, end, pieces)
+                continue
+            joined.append(current)
+        current = (start, end, [(source, start, end)])
+    joined.append(current)
+    return joined
+
+
+def _merge_streams_obspy(merged):
+    """Merge traces using obspy.core.Stream.merge.
+
+    Used by merge_streams when traces are not on a common sample grid.
+    """
     split = mask_stream(merged)
 
     # split traces that contain gaps
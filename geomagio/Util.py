@@ -2,6 +2,7 @@ import numpy
 import os
 from obspy.core import Stats, Trace
 from io import BytesIO
+from . import Metrics
 
 
 class ObjectView(object):
@@ -146,6 +147,19 @@ def read_url(url, connect_timeout=15, max_redirects=5, timeout=300):
     IOError
         if any occurs
     """
+    with Metrics.timer("read_url", url=url) as fields:
+        content = _read_url(
+            url,
+            connect_timeout=connect_timeout,
+            max_redirects=max_redirects,
+            timeout=timeout,
+        )
+        fields["bytes"] = len(content)
+    return content
+
+
+def _read_url(url, connect_timeout=15, max_redirects=5, timeout=300):
+    """Open and read url contents, see read_url."""
     try:
         # short circuit file urls
         filepath = get_file_from_url(url)
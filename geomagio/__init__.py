@@ -3,17 +3,26 @@ Geomag Algorithm Module
 """
 from __future__ import absolute_import
 
-from . import ChannelConverter
-from . import StreamConverter
-from . import TimeseriesUtility
-from . import Util
+from . import LazyImport
 
-from .Controller import Controller
-from .ObservatoryMetadata import ObservatoryMetadata
-from .PlotTimeseriesFactory import PlotTimeseriesFactory
-from .TimeseriesFactory import TimeseriesFactory
-from .TimeseriesFactoryException import TimeseriesFactoryException
-from .WebService import WebService
+# modules are imported on first use, so scripts only import what they use
+__getattr__, __dir__ = LazyImport.lazy_import(
+    __name__,
+    {
+        "ChannelConverter": ".ChannelConverter",
+        "Controller": ".Controller:Controller",
+        "ObservatoryMetadata": ".ObservatoryMetadata:ObservatoryMetadata",
+        "PlotTimeseriesFactory": ".PlotTimeseriesFactory:PlotTimeseriesFactory",
+        "StreamConverter": ".StreamConverter",
+        "TimeseriesFactory": ".TimeseriesFactory:TimeseriesFactory",
+        "TimeseriesFactoryException": (
+            ".TimeseriesFactoryException:TimeseriesFactoryException"
+        ),
+        "TimeseriesUtility": ".TimeseriesUtility",
+        "Util": ".Util",
+        "WebService": ".WebService:WebService",
+    },
+)
 
 __all__ = [
     "ChannelConverter",
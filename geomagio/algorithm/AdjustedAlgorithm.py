@@ -5,14 +5,35 @@
 from __future__ import absolute_import
 
 from .Algorithm import Algorithm
+from .AlgorithmException import AlgorithmException
+from .. import Util
 import json
 import numpy as np
-from obspy.core import Stream, Stats
+from obspy.core import Stream, Stats, UTCDateTime
 import sys
 
 
+# times used for metadata without a starttime or endtime
+_MIN_NS = np.iinfo(np.int64).min
+_MAX_NS = np.iinfo(np.int64).max
+
+
 class AdjustedAlgorithm(Algorithm):
-    """Adjusted Data Algorithm"""
+    """Adjusted Data Algorithm
+
+    Uses one matrix and pier correction from the statefile, unless
+    metadata_url is set.
+
+    Parameters
+    ----------
+    metadata_url : str
+        url template for adjusted-matrix metadata,
+        "{observatory}" is replaced with the observatory code.
+        Returns a json list of metadata (the /ws/metadata format) with
+        "matrix" and "pier_correction" in each "metadata" value, and each
+        sample is adjusted by the matrix that covers its time.
+        Samples that no matrix covers are NaN.
+    """
 
     def __init__(
         self,
@@ -23,6 +44,7 @@ class AdjustedAlgorithm(Algorithm):
         location=None,
         inchannels=None,
         outchannels=None,
+        metadata_url=None,
     ):
         inchannels = inchannels or ["H", "E", "Z", "F"]
         outchannels = outchannels or ["X", "Y", "Z", "F"]
@@ -37,6 +59,9 @@ class AdjustedAlgorithm(Algorithm):
         self.statefile = statefile
         self.data_type = data_type
         self.location = location
+        self.metadata_url = metadata_url
+        # matrix segments by observatory, see get_matrix_segments
+        self._matrix_segments = {}
         # load matrix with statefile
         if matrix is None:
             self.load_state()
@@ -65,6 +90,63 @@ class AdjustedAlgorithm(Algorithm):
                 self.matrix[row, col] = np.float64(data[f"M{row+1}{col+1}"])
         self.pier_correction = np.float64(data["PC"])
 
+    def get_matrix_segments(self, observatory):
+        """Get time varying matrices for an observatory.
+
+        Metadata is read from metadata_url once per observatory.
+        Where metadata overlaps, higher priority and then later starttime
+        is used.
+
+        Parameters
+        ----------
+        observatory : str
+            observatory code.
+
+        Returns
+        -------
+        list
+            (start, end, matrix, pier_correction) tuples sorted by start.
+            start and end are nanoseconds since the epoch (end exclusive).
+        """
+        if observatory in self._matrix_segments:
+            return self._matrix_segments[observatory]
+        # wait to import metadata models until they are needed
+        from ..metadata import MetadataCategory
+
+        url = self.metadata_url.format(observatory=observatory)
+        entries = []
+        for metadata in json.loads(Util.read_url(url)):
+            if metadata.get("category") != MetadataCategory.ADJUSTED_MATRIX:
+                continue
+            if metadata.get("station") not in (None, observatory):
+                continue
+            starttime = metadata.get("starttime")
+            endtime = metadata.get("endtime")
+            entries.append(
+                (
+                    _MIN_NS if starttime is None else UTCDateTime(starttime).ns,
+                    _MAX_NS if endtime is None else UTCDateTime(endtime).ns,
+                    metadata.get("priority", 1),
+                    np.array(metadata["metadata"]["matrix"], dtype=np.float64),
+                    np.float64(metadata["metadata"].get("pier_correction", 0)),
+                )
+            )
+        # split time at every boundary, and find entry used in each interval
+        times = sorted(set([e[0] for e in entries] + [e[1] for e in entries]))
+        segments = []
+        for start, end in zip(times[:-1], times[1:]):
+            covering = [e for e in entries if e[0] <= start and e[1] >= end]
+            if not covering:
+                continue
+            entry = max(covering, key=lambda e: (e[2], e[0]))
+            if segments and segments[-1][2] is entry[3] and segments[-1][1] == start:
+                # same matrix as previous interval
+                segments[-1] = (segments[-1][0], end, entry[3], entry[4])
+            else:
+                segments.append((start, end, entry[3], entry[4]))
+        self._matrix_segments[observatory] = segments
+        return segments
+
     def save_state(self):
         """Save algorithm state to a file.
         File name is self.statefile.
@@ -134,7 +216,11 @@ class AdjustedAlgorithm(Algorithm):
             ]
             + [np.ones_like(stream[0].data)]
         )
-        adjusted = np.matmul(self.matrix, raws)
+        if self.metadata_url is None:
+            adjusted = np.matmul(self.matrix, raws)
+            pier_correction = self.pier_correction
+        else:
+            adjusted, pier_correction = self._adjust_segments(stream[0].stats, raws)
         out = Stream(
             [
                 self.create_trace(
@@ -147,9 +233,42 @@ class AdjustedAlgorithm(Algorithm):
         )
         if "F" in inchannels and "F" in outchannels:
             f = stream.select(channel="F")[0]
-            out += self.create_trace("F", f.stats, f.data + self.pier_correction)
+            out += self.create_trace("F", f.stats, f.data + pier_correction)
         return out
 
+    def _adjust_segments(self, stats, raws):
+        """Adjust each sample using the matrix that covers its time.
+
+        Parameters
+        ----------
+        stats : obspy.core.Stats
+            stats of first input trace, for observatory and sample times.
+        raws : numpy.array
+            input channels (and row of ones) to adjust.
+
+        Returns
+        -------
+        tuple
+            adjusted array, and array of pier corrections for each sample.
+        """
+        times = stats.starttime.ns + np.arange(raws.shape[1], dtype=np.int64) * int(
+            round(stats.delta * 1e9)
+        )
+        adjusted = np.full(raws.shape, np.nan)
+        pier_correction = np.full(raws.shape[1], np.nan)
+        for start, end, matrix, pc in self.get_matrix_segments(stats.station):
+            if matrix.shape != (raws.shape[0], raws.shape[0]):
+                raise AlgorithmException(
+                    "Adjusted matrix shape {} does not match {} channels".format(
+                        matrix.shape, raws.shape[0] - 1
+                    )
+                )
+            first, last = np.searchsorted(times, [start, end])
+            if first < last:
+                adjusted[:, first:last] = np.matmul(matrix, raws[:, first:last])
+                pier_correction[first:last] = pc
+        return adjusted, pier_correction
+
     def can_produce_data(self, starttime, endtime, stream):
         """Can Product data
         Parameters
@@ -194,6 +313,17 @@ class AdjustedAlgorithm(Algorithm):
             default=None,
             help="File to store state between calls to algorithm",
         )
+        parser.add_argument(
+            "--adjusted-metadata-url",
+            default=None,
+            help="""
+                Read time varying matrices from adjusted-matrix metadata,
+                "{observatory}" is replaced with observatory code
+                (for example: /ws/metadata?category=adjusted-matrix
+                &station={observatory}&starttime=1900-01-01)
+                """,
+            metavar="URL",
+        )
 
     def configure(self, arguments):
         """Configure algorithm using comand line arguments.
@@ -204,4 +334,6 @@ class AdjustedAlgorithm(Algorithm):
         """
         Algorithm.configure(self, arguments)
         self.statefile = arguments.adjusted_statefile
+        self.metadata_url = arguments.adjusted_metadata_url
+        self._matrix_segments = {}
         self.load_state()
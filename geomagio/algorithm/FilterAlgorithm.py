@@ -1,3 +1,4 @@
+import functools
 import json
 import sys
 from typing import Dict
@@ -5,42 +6,62 @@ from typing import Dict
 import numpy as np
 from numpy.lib import stride_tricks as npls
 from obspy.core import Stream, Stats
-import scipy.signal as sps
 
 from .Algorithm import Algorithm
 from .. import TimeseriesUtility
 
 
-STEPS = [
-    {  # 10 Hz to one second filter
-        "name": "10Hz",
-        "input_sample_period": 0.1,
-        "output_sample_period": 1.0,
-        "window": sps.firwin(123, 0.25, window="blackman", fs=10.0),
-        "type": "firfilter",
-    },
-    {  # one second to one minute filter
-        "name": "Intermagnet One Minute",
-        "input_sample_period": 1.0,
-        "output_sample_period": 60.0,
-        "window": sps.get_window(window=("gaussian", 15.8734), Nx=91),
-        "type": "firfilter",
-    },
-    {  # one minute to one hour filter
-        "name": "One Hour",
-        "input_sample_period": 60.0,
-        "output_sample_period": 3600.0,
-        "window": sps.windows.boxcar(60),
-        "type": "average",
-    },
-    {  # one minute to one hour filter
-        "name": "One Day",
-        "input_sample_period": 60.0,
-        "output_sample_period": 86400,
-        "window": sps.windows.boxcar(1440),
-        "type": "average",
-    },
-]
+@functools.lru_cache(maxsize=None)
+def get_steps():
+    """Default filter steps.
+
+    Windows are computed on first use, and memoized, because scipy.signal
+    is slow to import.
+
+    Returns
+    -------
+    list
+        list of step dictionaries.
+    """
+    import scipy.signal as sps
+
+    return [
+        {  # 10 Hz to one second filter
+            "name": "10Hz",
+            "input_sample_period": 0.1,
+            "output_sample_period": 1.0,
+            "window": sps.firwin(123, 0.25, window="blackman", fs=10.0),
+            "type": "firfilter",
+        },
+        {  # one second to one minute filter
+            "name": "Intermagnet One Minute",
+            "input_sample_period": 1.0,
+            "output_sample_period": 60.0,
+            "window": sps.get_window(window=("gaussian", 15.8734), Nx=91),
+            "type": "firfilter",
+        },
+        {  # one minute to one hour filter
+            "name": "One Hour",
+            "input_sample_period": 60.0,
+            "output_sample_period": 3600.0,
+            "window": sps.windows.boxcar(60),
+            "type": "average",
+        },
+        {  # one minute to one hour filter
+            "name": "One Day",
+            "input_sample_period": 60.0,
+            "output_sample_period": 86400,
+            "window": sps.windows.boxcar(1440),
+            "type": "average",
+        },
+    ]
+
+
+def __getattr__(name):
+    # STEPS is computed on first use
+    if name == "STEPS":
+        return get_steps()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 
 def get_nearest_time(step, output_time, left=True):
@@ -159,7 +180,7 @@ class FilterAlgorithm(Algorithm):
             return self.steps
 
         steps = []
-        for step in STEPS:
+        for step in get_steps():
             if (
                 self.input_sample_period <= step["input_sample_period"]
                 and self.output_sample_period >= step["output_sample_period"]
@@ -19,7 +19,6 @@ from .AlgorithmException import AlgorithmException
 import json
 import numpy as np
 from obspy.core import Stream, UTCDateTime
-from scipy.optimize import fmin_l_bfgs_b
 
 
 class SqDistAlgorithm(Algorithm):
@@ -43,6 +42,7 @@ class SqDistAlgorithm(Algorithm):
         statefile=None,
         mag=False,
         smooth=1,
+        autosave=True,
     ):
         Algorithm.__init__(self, inchannels=None, outchannels=None)
         self.alpha = alpha
@@ -56,6 +56,9 @@ class SqDistAlgorithm(Algorithm):
         self.statefile = statefile
         self.mag = mag
         self.smooth = smooth
+        # save state after each process call,
+        # long running processes disable this and call save_state() themselves
+        self.autosave = autosave
         # state variables
         self.yhat0 = yhat0
         self.s0 = s0
@@ -284,7 +287,8 @@ class SqDistAlgorithm(Algorithm):
         self.next_starttime = trace.stats.starttime + (
             trace.stats.delta * trace.stats.npts
         )
-        self.save_state()
+        if self.autosave:
+            self.save_state()
         # create updated traces
         channel = trace.stats.channel
         # TODO: consider trimming yhat instead of adding NaNs to raw, even if
@@ -736,6 +740,9 @@ class SqDistAlgorithm(Algorithm):
             error = np.sqrt(np.nanmean(np.square(np.subtract(yobs, yhat))))
             return error
 
+        # scipy.optimize is slow to import, and only needed here
+        from scipy.optimize import fmin_l_bfgs_b
+
         parameters = fmin_l_bfgs_b(
             func, x0=initial_values, args=(), bounds=boundaries, approx_grad=True
         )
@@ -6,10 +6,13 @@ and can be run using uvicorn, or any other ASGI server:
     uvicorn geomagio.api:app
 
 """
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from starlette.responses import RedirectResponse
 
 from .db import database
+from .metrics import REQUEST_LATENCY
 from . import secure
 from . import ws
 
@@ -19,6 +22,23 @@ app.mount("/ws/secure", secure.app)
 app.mount("/ws", ws.app)
 
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # mounted applications add the matched route to the request scope
+    route = request.scope.get("route")
+    REQUEST_LATENCY.observe(
+        time.perf_counter() - start,
+        method=request.method,
+        route=request.scope.get("root_path", "") + route.path
+        if route is not None
+        else "unmatched",
+        status=response.status_code,
+    )
+    return response
+
+
 @app.on_event("startup")
 async def on_startup():
     await database.connect()
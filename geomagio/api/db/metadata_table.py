@@ -1,14 +1,33 @@
 from datetime import datetime
 import enum
+import time
+from typing import AsyncIterable, AsyncIterator, Dict, List
 
 from obspy import UTCDateTime
-from sqlalchemy import or_, Boolean, Column, Index, Integer, JSON, String, Table, Text
+from sqlalchemy import (
+    null,
+    or_,
+    Boolean,
+    Column,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Table,
+    Text,
+)
 import sqlalchemy_utc
 
 from ...metadata import Metadata, MetadataCategory
+from ..metrics import DB_QUERY_LATENCY
 from .common import database, sqlalchemy_metadata
 
 
+# rows per insert statement in create_metadata_many,
+# each row has 18 parameters and sqlite may limit statements to 999
+INSERT_BATCH_SIZE = 50
+
+
 """Metadata database model.
 
 See pydantic model geomagio.metadata.Metadata
@@ -83,16 +102,54 @@ async def create_metadata(meta: Metadata) -> Metadata:
     query = metadata.insert()
     values = meta.datetime_dict(exclude={"id"}, exclude_none=True)
     query = query.values(**values)
-    metadata.id = await database.execute(query)
+    with DB_QUERY_LATENCY.time(operation="create_metadata"):
+        metadata.id = await database.execute(query)
     return metadata
 
 
+async def create_metadata_many(
+    metas: AsyncIterable[Metadata], batch_size: int = INSERT_BATCH_SIZE
+) -> int:
+    """Create metadata in one transaction, using multiple row inserts.
+
+    Nothing is created if any insert fails, or metas raises an exception.
+
+    Returns
+    -------
+    number of rows created.
+    """
+    count = 0
+    batch = []
+    async with database.transaction():
+        async for meta in metas:
+            values = meta.datetime_dict(exclude={"id"})
+            if values["metadata"] is None:
+                # store sql null, like create_metadata, instead of json null
+                values["metadata"] = null()
+            batch.append(values)
+            if len(batch) >= batch_size:
+                count += await _insert_metadata(batch)
+                batch = []
+        if batch:
+            count += await _insert_metadata(batch)
+    return count
+
+
+async def _insert_metadata(batch: List[Dict]) -> int:
+    """Insert rows with one statement."""
+    query = metadata.insert().values(batch)
+    with DB_QUERY_LATENCY.time(operation="create_metadata_many"):
+        await database.execute(query)
+    return len(batch)
+
+
 async def delete_metadata(id: int) -> None:
     query = metadata.delete().where(metadata.c.id == id)
-    await database.execute(query)
+    with DB_QUERY_LATENCY.time(operation="delete_metadata"):
+        await database.execute(query)
 
 
-async def get_metadata(
+def get_metadata_query(
     *,  # make all params keyword
     id: int = None,
     network: str = None,
@@ -104,19 +161,39 @@ async def get_metadata(
     endtime: datetime = None,
     data_valid: bool = None,
     metadata_valid: bool = None,
+    after_id: int = None,
+    limit: int = None,
 ):
+    """Build a query for metadata, ordered by id.
+
+    network, station, channel, and location are converted to upper case,
+    and match exactly unless they contain a LIKE wildcard ("%" or "_").
+    When any of them is given, the others match any value except null.
+
+    after_id and limit page through results:
+    request the next page using the id of the last row as after_id.
+    """
     query = metadata.select()
     if id is not None:
         query = query.where(metadata.c.id == id)
     if category:
         query = query.where(metadata.c.category == category)
     if network or station or channel or location:
-        query = (
-            query.where(metadata.c.network.like(network or "%"))
-            .where(metadata.c.station.like(station or "%"))
-            .where(metadata.c.channel.like(channel or "%"))
-            .where(metadata.c.location.like(location or "%"))
-        )
+        for column, value in (
+            (metadata.c.network, network),
+            (metadata.c.station, station),
+            (metadata.c.channel, channel),
+            (metadata.c.location, location),
+        ):
+            if not value:
+                query = query.where(column != None)
+                continue
+            value = value.upper()
+            if "%" in value or "_" in value:
+                query = query.where(column.like(value))
+            else:
+                # exact match can use index_station_metadata
+                query = query.where(column == value)
     if starttime:
         query = query.where(
             or_(metadata.c.endtime == None, metadata.c.endtime > starttime)
@@ -129,12 +206,48 @@ async def get_metadata(
         query = query.where(metadata.c.data_valid == data_valid)
     if metadata_valid is not None:
         query = query.where(metadata.c.metadata_valid == metadata_valid)
-    rows = await database.fetch_all(query)
+    if after_id is not None:
+        query = query.where(metadata.c.id > after_id)
+    query = query.order_by(metadata.c.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+async def get_metadata(**kwargs) -> List[Metadata]:
+    """Get metadata, see get_metadata_query for parameters."""
+    query = get_metadata_query(**kwargs)
+    with DB_QUERY_LATENCY.time(operation="get_metadata"):
+        rows = await database.fetch_all(query)
     return [Metadata(**row) for row in rows]
 
 
+async def iterate_metadata(**kwargs) -> AsyncIterator[Metadata]:
+    """Iterate over metadata as rows are read from the database.
+
+    See get_metadata_query for parameters.
+    """
+    query = get_metadata_query(**kwargs)
+    rows = database.iterate(query).__aiter__()
+    # only time spent reading rows, not while the caller consumes them
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                row = await rows.__anext__()
+            except StopAsyncIteration:
+                break
+            finally:
+                elapsed += time.perf_counter() - start
+            yield Metadata(**row)
+    finally:
+        DB_QUERY_LATENCY.observe(elapsed, operation="iterate_metadata")
+
+
 async def update_metadata(meta: Metadata) -> None:
     query = metadata.update().where(metadata.c.id == meta.id)
     values = meta.datetime_dict(exclude={"id"})
     query = query.values(**values)
-    await database.execute(query)
+    with DB_QUERY_LATENCY.time(operation="update_metadata"):
+        await database.execute(query)
@@ -0,0 +1,193 @@
+"""Operational metrics for the web service.
+
+Metrics are kept in process memory, and rendered using the prometheus
+text exposition format by the "/ws/metrics" endpoint.
+
+    from geomagio.api.metrics import DB_QUERY_LATENCY
+
+    with DB_QUERY_LATENCY.time(operation="get_metadata"):
+        rows = await database.fetch_all(query)
+
+Each worker process keeps its own metrics.
+"""
+import bisect
+import contextlib
+import threading
+import time
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+# default histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], **extra) -> str:
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Metric(object):
+    """Base class for labeled metrics.
+
+    Parameters
+    ----------
+    name: metric name
+    help: metric description
+    labels: names of labels, values are passed as keyword arguments
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def render(self) -> List[str]:
+        """Lines in text exposition format."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> Iterable[str]:
+        raise NotImplementedError("_render_samples not implemented")
+
+
+class Counter(Metric):
+    """Value that only increases."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self.values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def _render_samples(self) -> Iterable[str]:
+        with self.lock:
+            values = sorted(self.values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labels, key)} {value}"
+
+
+class Histogram(Metric):
+    """Distribution of observed values, counted in buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # per label key: [bucket counts..., +Inf count], sum
+        self.values = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            counts, total = self.values.get(key) or ([0] * (len(self.buckets) + 1), 0)
+            counts[index] += 1
+            self.values[key] = (counts, total + value)
+
+    @contextlib.contextmanager
+    def time(self, **labels):
+        """Observe elapsed seconds for a block of code."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _render_samples(self) -> Iterable[str]:
+        with self.lock:
+            values = sorted((key, (list(c), t)) for key, (c, t) in self.values.items())
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bucket, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bucket == float("inf") else repr(bucket)
+                labels = _format_labels(self.labels, key, le=le)
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labels, key)
+            yield f"{self.name}_sum{labels} {total}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry(object):
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in text exposition format."""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUEST_LATENCY = REGISTRY.register(
+    Histogram(
+        "geomag_request_duration_seconds",
+        "Request latency by route.",
+        labels=("method", "route", "status"),
+    )
+)
+ERRORS = REGISTRY.register(
+    Counter("geomag_errors_total", "Error responses by status code.", labels=("code",))
+)
+DATA_FETCH_LATENCY = REGISTRY.register(
+    Histogram(
+        "geomag_data_fetch_duration_seconds",
+        "Latency of timeseries requests to the upstream data server.",
+        labels=("factory",),
+    )
+)
+BYTES_SERVED = REGISTRY.register(
+    Counter(
+        "geomag_data_bytes_total",
+        "Bytes of formatted timeseries data served.",
+        labels=("format",),
+    )
+)
+SAMPLES_SERVED = REGISTRY.register(
+    Counter(
+        "geomag_data_samples_total",
+        "Timeseries samples served.",
+        labels=("format",),
+    )
+)
+DB_QUERY_LATENCY = REGISTRY.register(
+    Histogram(
+        "geomag_db_query_duration_seconds",
+        "Latency of database queries.",
+        labels=("operation",),
+    )
+)
@@ -18,6 +18,9 @@ class MetadataQuery(BaseModel):
     location: str = None
     data_valid: bool = None
     metadata_valid: bool = True
+    # keyset pagination, request rows after the last id of the previous page
+    after_id: int = None
+    limit: int = None
 
     def datetime_dict(self, **kwargs):
         values = self.dict(**kwargs)
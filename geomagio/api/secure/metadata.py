@@ -14,13 +14,16 @@ Configuration:
     REVIEWER_GROUP        - update is restricted the reviewer group.
 """
 import os
-from typing import List
+from typing import AsyncIterator, List
 
 from fastapi import APIRouter, Body, Depends, Request, Response
+from fastapi.responses import StreamingResponse
 from obspy import UTCDateTime
+from pydantic import ValidationError
 
 from ...metadata import Metadata, MetadataCategory
 from ..db import metadata_table
+from ..ws.metadata import get_metadata_ndjson, get_metadata_response
 from .login import require_user, User
 from .MetadataQuery import MetadataQuery
 from ... import pydantic_utcdatetime
@@ -57,6 +60,8 @@ async def get_metadata(
     location: str = None,
     data_valid: bool = None,
     metadata_valid: bool = True,
+    after_id: int = None,
+    limit: int = None,
 ):
     query = MetadataQuery(
         category=category,
@@ -68,9 +73,91 @@ async def get_metadata(
         location=location,
         data_valid=data_valid,
         metadata_valid=metadata_valid,
+        after_id=after_id,
+        limit=limit,
     )
-    metas = await metadata_table.get_metadata(**query.datetime_dict(exclude={"id"}))
-    return metas
+    return get_metadata_response(query)
+
+
+@router.post("/metadata/bulk")
+async def create_metadata_bulk(
+    request: Request,
+    user: User = Depends(require_user()),
+):
+    """Create metadata from newline delimited JSON, one Metadata per line.
+
+    Either all lines are created, or none are.
+    """
+    try:
+        count = await metadata_table.create_metadata_many(
+            read_metadata_ndjson(request.stream())
+        )
+    except ValueError as e:
+        return Response(str(e), status_code=400, media_type="text/plain")
+    return {"count": count}
+
+
+@router.get("/metadata/bulk")
+async def get_metadata_bulk(
+    category: MetadataCategory = None,
+    starttime: UTCDateTime = None,
+    endtime: UTCDateTime = None,
+    network: str = None,
+    station: str = None,
+    channel: str = None,
+    location: str = None,
+    data_valid: bool = None,
+    metadata_valid: bool = True,
+    after_id: int = None,
+    limit: int = None,
+):
+    """Export metadata as newline delimited JSON, one Metadata per line."""
+    query = MetadataQuery(
+        category=category,
+        starttime=starttime,
+        endtime=endtime,
+        network=network,
+        station=station,
+        channel=channel,
+        location=location,
+        data_valid=data_valid,
+        metadata_valid=metadata_valid,
+        after_id=after_id,
+        limit=limit,
+    )
+    return StreamingResponse(
+        get_metadata_ndjson(query), media_type="application/x-ndjson"
+    )
+
+
+async def read_metadata_ndjson(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[Metadata]:
+    """Parse newline delimited JSON as it is received.
+
+    Raises
+    ------
+    ValueError
+        with the line number of the first line that is not valid Metadata.
+    """
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield _parse_metadata_line(line, line_number)
+    if buffer.strip():
+        yield _parse_metadata_line(buffer, line_number + 1)
+
+
+def _parse_metadata_line(line: bytes, line_number: int) -> Metadata:
+    try:
+        return Metadata.parse_raw(line)
+    except ValidationError as e:
+        raise ValueError(f"line {line_number}: {e}")
 
 
 @router.get("/metadata/{id}", response_model=Metadata)
@@ -0,0 +1,90 @@
+import gzip
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request, Response
+
+
+class StaticJson(object):
+    """JSON content that does not change for the life of the process.
+
+    Content is encoded and compressed once, and served with strong ETags
+    so clients that poll get a 304 response when they already have it.
+
+    Attributes
+    ----------
+    body: encoded json.
+    gzip_body: gzip compressed json.
+    etag: ETag of body.
+    gzip_etag: ETag of gzip_body.
+    """
+
+    def __init__(self, content: Any):
+        # same encoding as fastapi JSONResponse
+        self.body = json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        self.gzip_body = gzip.compress(self.body, compresslevel=9, mtime=0)
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        # each encoding is a different representation, with its own strong ETag
+        self.gzip_etag = f'"{digest}-gzip"'
+
+    def response(self, request: Request) -> Response:
+        """Respond to a request for this content.
+
+        Returns
+        -------
+        304 response when If-None-Match has a current ETag,
+        otherwise content, gzip compressed when the client accepts gzip.
+        """
+        use_gzip = accepts_gzip(request.headers.get("accept-encoding", ""))
+        etag = use_gzip and self.gzip_etag or self.etag
+        headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and matches_etag(if_none_match, [self.etag, self.gzip_etag]):
+            return Response(status_code=304, headers=headers)
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+        return Response(
+            content=use_gzip and self.gzip_body or self.body,
+            headers=headers,
+            media_type="application/json",
+        )
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip."""
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def matches_etag(if_none_match: str, etags: list) -> bool:
+    """Whether an If-None-Match header matches any of etags.
+
+    Uses weak comparison, as required for If-None-Match.
+    """
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag in etags:
+            return True
+    return False
@@ -7,7 +7,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, PlainTextResponse, RedirectResponse
 from obspy import UTCDateTime
 
-from . import algorithms, data, elements, metadata, observatories
+from ..metrics import ERRORS
+from . import algorithms, data, elements, metadata, metrics, observatories
 
 
 ERROR_CODE_MESSAGES = {
@@ -29,6 +30,7 @@ app = FastAPI(docs_url="/docs", root_path="/ws")
 app.include_router(algorithms.router)
 app.include_router(data.router)
 app.include_router(elements.router)
+app.include_router(metrics.router)
 app.include_router(observatories.router)
 
 if METADATA_ENDPOINT:
@@ -78,6 +80,7 @@ def format_error(
     status_code: int, exception: str, format: str, request: Request
 ) -> Response:
     """Assign error_body value based on error format."""
+    ERRORS.inc(code=status_code)
     if format == "json":
         return json_error(status_code, exception, request.url)
     else:
@@ -9,6 +9,7 @@ from ... import TimeseriesFactory, TimeseriesUtility
 from ...edge import EdgeFactory
 from ...iaga2002 import IAGA2002Writer
 from ...imfjson import IMFJSONWriter
+from ..metrics import BYTES_SERVED, DATA_FETCH_LATENCY, SAMPLES_SERVED
 from .DataApiQuery import (
     DEFAULT_ELEMENTS,
     DataApiQuery,
@@ -121,7 +122,10 @@ def format_timeseries(
     else:
         data = IAGA2002Writer.format(timeseries, elements)
         media_type = "text/plain"
-    return Response(data, media_type=media_type)
+    response = Response(data, media_type=media_type)
+    BYTES_SERVED.inc(len(response.body), format=format.value)
+    SAMPLES_SERVED.inc(sum(len(trace) for trace in timeseries), format=format.value)
+    return response
 
 
 def get_timeseries(data_factory: TimeseriesFactory, query: DataApiQuery) -> Stream:
@@ -133,14 +137,15 @@ def get_timeseries(data_factory: TimeseriesFactory, query: DataApiQuery) -> Stre
     query: parameters for the data to read
     """
     # get data
-    timeseries = data_factory.get_timeseries(
-        starttime=query.starttime,
-        endtime=query.endtime,
-        observatory=query.id,
-        channels=query.elements,
-        type=query.data_type,
-        interval=TimeseriesUtility.get_interval_from_delta(query.sampling_period),
-    )
+    with DATA_FETCH_LATENCY.time(factory=type(data_factory).__name__):
+        timeseries = data_factory.get_timeseries(
+            starttime=query.starttime,
+            endtime=query.endtime,
+            observatory=query.id,
+            channels=query.elements,
+            type=query.data_type,
+            interval=TimeseriesUtility.get_interval_from_delta(query.sampling_period),
+        )
     return timeseries
 
 
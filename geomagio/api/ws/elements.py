@@ -1,16 +1,12 @@
-from typing import Dict
-
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
 from .Element import ELEMENTS
+from .StaticJson import StaticJson
 
 
-router = APIRouter()
-
-
-@router.get("/elements/")
-def get_elements() -> Dict:
-    return {
+# elements do not change, so the response is encoded once
+ELEMENTS_JSON = StaticJson(
+    {
         "type": "FeatureCollection",
         "features": [
             {
@@ -22,3 +18,12 @@ def get_elements() -> Dict:
             for e in ELEMENTS
         ],
     }
+)
+
+
+router = APIRouter()
+
+
+@router.get("/elements/")
+def get_elements(request: Request) -> Response:
+    return ELEMENTS_JSON.response(request)
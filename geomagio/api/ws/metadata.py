@@ -1,6 +1,7 @@
-from typing import List
+from typing import AsyncIterator, List
 
 from fastapi import APIRouter, Body, Response
+from fastapi.responses import StreamingResponse
 from obspy import UTCDateTime
 
 from ...metadata import Metadata, MetadataCategory
@@ -10,6 +11,30 @@ from ..db import metadata_table
 router = APIRouter()
 
 
+async def get_metadata_json(query: MetadataQuery) -> AsyncIterator[str]:
+    """Format metadata matching query as a JSON array, one row at a time."""
+    separator = "["
+    async for meta in metadata_table.iterate_metadata(
+        **query.datetime_dict(exclude={"id"})
+    ):
+        yield separator + meta.json()
+        separator = ","
+    yield "[]" if separator == "[" else "]"
+
+
+async def get_metadata_ndjson(query: MetadataQuery) -> AsyncIterator[str]:
+    """Format metadata matching query as newline delimited JSON."""
+    async for meta in metadata_table.iterate_metadata(
+        **query.datetime_dict(exclude={"id"})
+    ):
+        yield meta.json() + "\n"
+
+
+def get_metadata_response(query: MetadataQuery) -> StreamingResponse:
+    """Stream metadata matching query as a JSON array."""
+    return StreamingResponse(get_metadata_json(query), media_type="application/json")
+
+
 @router.get("/metadata", response_model=List[Metadata])
 async def get_metadata(
     category: MetadataCategory = None,
@@ -21,6 +46,8 @@ async def get_metadata(
     location: str = None,
     data_valid: bool = None,
     metadata_valid: bool = True,
+    after_id: int = None,
+    limit: int = None,
 ):
     query = MetadataQuery(
         category=category,
@@ -32,6 +59,7 @@ async def get_metadata(
         location=location,
         data_valid=data_valid,
         metadata_valid=metadata_valid,
+        after_id=after_id,
+        limit=limit,
     )
-    metas = await metadata_table.get_metadata(**query.datetime_dict(exclude={"id"}))
-    return metas
+    return get_metadata_response(query)
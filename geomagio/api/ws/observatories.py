@@ -1,24 +1,30 @@
-from typing import Dict
+from fastapi import APIRouter, Request, Response
 
-from fastapi import APIRouter, Response
+from .Observatory import OBSERVATORIES
+from .StaticJson import StaticJson
 
-from .Observatory import OBSERVATORIES, OBSERVATORY_INDEX
+
+# observatories do not change, so responses are encoded once
+OBSERVATORIES_JSON = StaticJson(
+    {
+        "type": "FeatureCollection",
+        "features": [o.geojson() for o in OBSERVATORIES],
+    }
+)
+OBSERVATORY_JSON = {o.id: StaticJson(o.geojson()) for o in OBSERVATORIES}
 
 
 router = APIRouter()
 
 
 @router.get("/observatories/")
-def get_observatories() -> Dict:
-    return {
-        "type": "FeatureCollection",
-        "features": [o.geojson() for o in OBSERVATORIES],
-    }
+def get_observatories(request: Request) -> Response:
+    return OBSERVATORIES_JSON.response(request)
 
 
 @router.get("/observatories/{id}")
-async def get_observatory_by_id(id: str) -> Dict:
+async def get_observatory_by_id(id: str, request: Request) -> Response:
     try:
-        return OBSERVATORY_INDEX[id].geojson()
+        return OBSERVATORY_JSON[id].response(request)
     except KeyError:
         return Response(status_code=404)
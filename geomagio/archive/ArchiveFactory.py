@@ -0,0 +1,352 @@
+"""Factory that stores timeseries in memory mapped binary files."""
+from __future__ import absolute_import
+
+import numpy
+import obspy.core
+import os
+import struct
+import tempfile
+
+from .. import TimeseriesUtility
+from ..ObservatoryMetadata import ObservatoryMetadata
+from ..TimeseriesFactory import TimeseriesFactory
+from ..TimeseriesFactoryException import TimeseriesFactoryException
+
+
+# pattern for archive file names, relative to archive directory
+ARCHIVE_FILE_PATTERN = "%(OBS)s/%(type)s/%(interval)s/%(channel)s.bin"
+
+# magic, version, sample interval in nanoseconds, starttime in nanoseconds
+ARCHIVE_HEADER = struct.Struct("<8sI4xqq")
+# header is padded so samples are aligned
+ARCHIVE_HEADER_SIZE = 64
+ARCHIVE_MAGIC = b"GEOMAGIO"
+ARCHIVE_VERSION = 1
+# one little endian float per sample, nan for missing samples
+ARCHIVE_DTYPE = numpy.dtype("<f8")
+
+
+class ArchiveFactory(TimeseriesFactory):
+    """TimeseriesFactory for memory mapped binary archive files.
+
+    Each observatory, type, interval, and channel is stored in one file,
+    a fixed size header followed by one float64 per sample.
+    Sample positions are computed from the header, so reads map the file
+    and slice the requested range without parsing, and writes overwrite
+    samples in place.
+
+    Parameters
+    ----------
+    directory : str
+        archive directory, files are named using ARCHIVE_FILE_PATTERN.
+    observatoryMetadata : ObservatoryMetadata
+        metadata set on traces that are read, optional.
+
+    Notes
+    -----
+    Missing (nan) samples in written timeseries do not replace samples
+    that already exist in the archive.
+    """
+
+    def __init__(self, directory=".", observatoryMetadata=None, **kwargs):
+        TimeseriesFactory.__init__(self, **kwargs)
+        self.directory = directory
+        self.observatoryMetadata = observatoryMetadata or ObservatoryMetadata()
+
+    def get_timeseries(
+        self,
+        starttime,
+        endtime,
+        observatory=None,
+        channels=None,
+        type=None,
+        interval=None,
+    ):
+        """Get timeseries data.
+
+        Parameters
+        ----------
+        starttime : UTCDateTime
+            time of first sample.
+        endtime : UTCDateTime
+            time of last sample.
+        observatory : str
+            observatory code.
+        channels : array_like
+            list of channels to load.
+        type : {'definitive', 'provisional', 'quasi-definitive', 'variation'}
+            data type.
+        interval : {'day', 'hour', 'minute', 'second', 'tenhertz'}
+            data interval.
+
+        Returns
+        -------
+        obspy.core.Stream
+            timeseries object with requested data, channels that are not
+            in the archive are filled with nan.
+
+        Raises
+        ------
+        TimeseriesFactoryException
+            if an archive file is invalid.
+        """
+        observatory = observatory or self.observatory
+        channels = channels or self.channels
+        type = type or self.type
+        interval = interval or self.interval
+        timeseries = obspy.core.Stream()
+        for channel in channels:
+            timeseries += self._get_trace(
+                starttime=starttime,
+                endtime=endtime,
+                observatory=observatory,
+                channel=channel,
+                type=type,
+                interval=interval,
+            )
+        return timeseries
+
+    def put_timeseries(
+        self,
+        timeseries,
+        starttime=None,
+        endtime=None,
+        channels=None,
+        type=None,
+        interval=None,
+    ):
+        """Store timeseries data.
+
+        Parameters
+        ----------
+        timeseries : obspy.core.Stream
+            stream containing traces to store.
+        starttime : UTCDateTime
+            time of first sample in timeseries to store.
+            uses first sample if unspecified.
+        endtime : UTCDateTime
+            time of last sample in timeseries to store.
+            uses last sample if unspecified.
+        channels : array_like
+            list of channels to store, optional.
+            uses default if unspecified.
+        type : {'definitive', 'provisional', 'quasi-definitive', 'variation'}
+            data type, optional.
+            uses default if unspecified.
+        interval : {'day', 'hour', 'minute', 'second', 'tenhertz'}
+            data interval, optional.
+            uses default if unspecified.
+
+        Raises
+        ------
+        TimeseriesFactoryException
+            if an archive file is invalid, or the timeseries does not
+            match samples already in the archive.
+        """
+        if len(timeseries) == 0:
+            # no data to put
+            return
+        channels = channels or self.channels
+        type = type or self.type
+        interval = interval or self.interval
+        for channel in channels:
+            for trace in timeseries.select(channel=channel):
+                trace = trace.slice(starttime, endtime)
+                if trace.stats.npts == 0:
+                    continue
+                self._put_trace(trace=trace, type=type, interval=interval)
+
+    def get_path(self, observatory, channel, type, interval):
+        """Get the archive file for a timeseries.
+
+        Parameters
+        ----------
+        observatory : str
+            observatory code.
+        channel : str
+            channel code.
+        type : {'definitive', 'provisional', 'quasi-definitive', 'variation'}
+            data type.
+        interval : {'day', 'hour', 'minute', 'second', 'tenhertz'}
+            data interval.
+
+        Returns
+        -------
+        str
+            path to archive file.
+        """
+        return os.path.join(
+            self.directory,
+            ARCHIVE_FILE_PATTERN
+            % {
+                "OBS": observatory.upper(),
+                "channel": channel,
+                "interval": interval,
+                "type": type,
+            },
+        )
+
+    def _get_trace(self, starttime, endtime, observatory, channel, type, interval):
+        """Read one channel from the archive.
+
+        Returns
+        -------
+        obspy.core.Trace
+            a view of the archive file when the archive contains the
+            requested range, otherwise a copy padded with nan.
+        """
+        delta_ns = _get_delta_ns(interval)
+        path = self.get_path(observatory, channel, type, interval)
+        if os.path.isfile(path):
+            origin_ns, data = _read_archive(path, delta_ns)
+        else:
+            # align empty traces with the epoch
+            origin_ns, data = 0, numpy.empty(0, dtype=ARCHIVE_DTYPE)
+        # first sample at or after starttime, last at or before endtime
+        first = -((origin_ns - starttime.ns) // delta_ns)
+        last = (endtime.ns - origin_ns) // delta_ns
+        if first >= 0 and last < len(data):
+            # copy on write mapping, callers may modify samples
+            values = numpy.asarray(data[first : last + 1])
+        else:
+            values = numpy.full(max(last - first + 1, 0), numpy.nan)
+            start = max(first, 0)
+            end = min(last + 1, len(data))
+            if start < end:
+                values[start - first : end - first] = data[start:end]
+        stats = obspy.core.Stats()
+        # default network, observatory metadata may set another
+        stats.network = "NT"
+        stats.station = observatory
+        stats.starttime = obspy.core.UTCDateTime(ns=origin_ns + first * delta_ns)
+        stats.delta = delta_ns / 1e9
+        self.observatoryMetadata.set_metadata(
+            stats, observatory, channel, type, interval
+        )
+        trace = obspy.core.Trace(header=stats)
+        trace.data = values
+        return trace
+
+    def _put_trace(self, trace, type, interval):
+        """Write one trace to the archive."""
+        delta_ns = _get_delta_ns(interval)
+        if round(trace.stats.delta * 1e9) != delta_ns:
+            raise TimeseriesFactoryException(
+                "Trace %s sample interval %s does not match interval %s"
+                % (trace.id, trace.stats.delta, interval)
+            )
+        values = trace.data
+        if numpy.ma.isMaskedArray(values):
+            values = values.astype(ARCHIVE_DTYPE).filled(numpy.nan)
+        values = numpy.asarray(values, dtype=ARCHIVE_DTYPE)
+        start_ns = trace.stats.starttime.ns
+        path = self.get_path(trace.stats.station, trace.stats.channel, type, interval)
+        if not os.path.isfile(path):
+            _write_archive(path, delta_ns, start_ns, values)
+            return
+        origin_ns, data = _read_archive(path, delta_ns, mode="r")
+        if (start_ns - origin_ns) % delta_ns != 0:
+            raise TimeseriesFactoryException(
+                "Trace %s starttime %s is not aligned with archive %s"
+                % (trace.id, trace.stats.starttime, path)
+            )
+        first = (start_ns - origin_ns) // delta_ns
+        if first < 0:
+            # rewrite archive with earlier origin
+            data = numpy.concatenate((numpy.full(-first, numpy.nan), data))
+            _write_archive(path, delta_ns, start_ns, data)
+            first = 0
+        end = first + len(values)
+        count = _get_archive_size(path)
+        if end > count:
+            with open(path, "ab") as f:
+                numpy.full(end - count, numpy.nan, dtype=ARCHIVE_DTYPE).tofile(f)
+        archive = numpy.memmap(
+            path,
+            dtype=ARCHIVE_DTYPE,
+            mode="r+",
+            offset=ARCHIVE_HEADER_SIZE + first * ARCHIVE_DTYPE.itemsize,
+            shape=(len(values),),
+        )
+        valid = ~numpy.isnan(values)
+        archive[valid] = values[valid]
+        archive.flush()
+
+
+def _get_archive_size(path):
+    """Number of samples in archive file."""
+    return (os.path.getsize(path) - ARCHIVE_HEADER_SIZE) // ARCHIVE_DTYPE.itemsize
+
+
+def _get_delta_ns(interval):
+    """Sample interval in nanoseconds."""
+    return int(round(TimeseriesUtility.get_delta_from_interval(interval) * 1e9))
+
+
+def _read_archive(path, delta_ns, mode="c"):
+    """Map samples from an archive file.
+
+    Parameters
+    ----------
+    path : str
+        archive file.
+    delta_ns : int
+        expected sample interval in nanoseconds.
+    mode : str
+        numpy.memmap mode, default copy on write.
+
+    Returns
+    -------
+    tuple(int, numpy.ndarray)
+        time of first sample in nanoseconds, and samples.
+
+    Raises
+    ------
+    TimeseriesFactoryException
+        if the header is invalid, or the sample interval does not match.
+    """
+    with open(path, "rb") as f:
+        header = f.read(ARCHIVE_HEADER.size)
+    if len(header) != ARCHIVE_HEADER.size:
+        raise TimeseriesFactoryException("Invalid archive header in %s" % path)
+    magic, version, file_delta_ns, origin_ns = ARCHIVE_HEADER.unpack(header)
+    if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+        raise TimeseriesFactoryException("Invalid archive header in %s" % path)
+    if file_delta_ns != delta_ns:
+        raise TimeseriesFactoryException(
+            "Archive %s sample interval %s does not match %s"
+            % (path, file_delta_ns / 1e9, delta_ns / 1e9)
+        )
+    count = _get_archive_size(path)
+    if count <= 0:
+        # empty files cannot be mapped
+        return origin_ns, numpy.empty(0, dtype=ARCHIVE_DTYPE)
+    data = numpy.memmap(
+        path,
+        dtype=ARCHIVE_DTYPE,
+        mode=mode,
+        offset=ARCHIVE_HEADER_SIZE,
+        shape=(count,),
+    )
+    return origin_ns, data
+
+
+def _write_archive(path, delta_ns, origin_ns, values):
+    """Create or replace an archive file.
+
+    Files are written to a temporary file and renamed, so readers never
+    see a partial header.
+    """
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    header = ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, delta_ns, origin_ns)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header.ljust(ARCHIVE_HEADER_SIZE, b"\0"))
+            numpy.asarray(values, dtype=ARCHIVE_DTYPE).tofile(f)
+        os.replace(temp_path, path)
+    except Exception:
+        os.remove(temp_path)
+        raise
@@ -0,0 +1,11 @@
+"""IO Module for Binary Archive Format
+"""
+from __future__ import absolute_import
+
+from .ArchiveFactory import ArchiveFactory, ARCHIVE_FILE_PATTERN
+
+
+__all__ = [
+    "ArchiveFactory",
+    "ARCHIVE_FILE_PATTERN",
+]
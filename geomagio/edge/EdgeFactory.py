@@ -17,7 +17,7 @@ import obspy.core
 from datetime import datetime
 from obspy.clients import earthworm
 
-from .. import ChannelConverter, TimeseriesUtility
+from .. import ChannelConverter, Metrics, TimeseriesUtility
 from ..TimeseriesFactory import TimeseriesFactory
 from ..TimeseriesFactoryException import TimeseriesFactoryException
 from ..ObservatoryMetadata import ObservatoryMetadata
@@ -486,13 +486,22 @@ class EdgeFactory(TimeseriesFactory):
         location = self._get_edge_location(observatory, channel, type, interval)
         network = self._get_edge_network(observatory, channel, type, interval)
         edge_channel = self._get_edge_channel(observatory, channel, type, interval)
-        try:
-            data = self.client.get_waveforms(
-                network, station, location, edge_channel, starttime, endtime
-            )
-        except TypeError:
-            # get_waveforms() fails if no data is returned from Edge
-            data = obspy.core.Stream()
+        with Metrics.timer(
+            "get_waveforms",
+            host=self.host,
+            port=self.port,
+            sncl=".".join((network, station, location, edge_channel)),
+            starttime=starttime,
+            endtime=endtime,
+        ) as fields:
+            try:
+                data = self.client.get_waveforms(
+                    network, station, location, edge_channel, starttime, endtime
+                )
+            except TypeError:
+                # get_waveforms() fails if no data is returned from Edge
+                data = obspy.core.Stream()
+            fields.update(Metrics.get_stream_fields(data))
 
         # make sure data is 32bit int
         for trace in data:
@@ -0,0 +1,571 @@
+"""Local stand-in for an Edge server, for offline testing.
+
+FakeEdge serves data from memory (optionally loaded from miniseed files)
+using the same protocols as an Edge server:
+
+- earthworm waveserver protocol, read by EdgeFactory
+  (obspy.clients.earthworm)
+- CWB query protocol, read by MiniSeedFactory
+  (obspy.clients.neic)
+- RawInput protocol, written by EdgeFactory (RawInputClient)
+- MiniSeed input protocol, written by MiniSeedFactory (MiniSeedInputClient)
+
+Latency and bandwidth may be limited to simulate a remote server.
+
+    with FakeEdge(files=["data.mseed"], latency=0.1) as edge:
+        factory = EdgeFactory(host=edge.host, port=edge.waveserver_port)
+"""
+from __future__ import absolute_import, print_function
+
+import argparse
+import io
+import re
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+import numpy
+from obspy.core import Stream, Trace, UTCDateTime, read
+from obspy.io.mseed.util import get_record_information
+
+from .. import TimeseriesUtility
+from .RawInputClient import PACKETHEAD, PACKSTR, TAG, FORCEOUT
+
+
+# maximum number of samples in each waveserver tracebuf packet
+TRACEBUF_SAMPLES = 1000
+# waveserver tracebuf2 header, see obspy.clients.earthworm.waveserver
+TRACEBUF_HEADER = "<2i3d7s9s4s3s2s3s2s2s"
+# size of RawInput packet header
+RAW_HEADER_SIZE = struct.calcsize(PACKSTR)
+
+
+class FakeEdgeData(object):
+    """Thread safe in memory waveform storage.
+
+    Parameters
+    ----------
+    stream : obspy.core.Stream
+        initial data, optional.
+    """
+
+    def __init__(self, stream=None):
+        self.lock = threading.Lock()
+        # obspy.core.Stream for each (network, station, location, channel)
+        # data is stored as float64, so gaps can be represented by nan
+        self.streams = {}
+        # original data type for each key, used when serving data
+        self.dtypes = {}
+        if stream is not None:
+            self.add(stream)
+
+    def add(self, stream):
+        """Add traces to storage.
+
+        When new data overlaps existing data, new data is used.
+
+        Parameters
+        ----------
+        stream : obspy.core.Stream
+            traces to add.
+        """
+        with self.lock:
+            for trace in stream:
+                stats = trace.stats
+                key = (stats.network, stats.station, stats.location, stats.channel)
+                self.dtypes.setdefault(key, trace.data.dtype)
+                trace = Trace(trace.data.astype(numpy.float64), stats.copy())
+                existing = self.streams.get(key, Stream())
+                self.streams[key] = TimeseriesUtility.merge_streams(
+                    existing, Stream([trace])
+                )
+
+    def get(self, network, station, location, channel, starttime, endtime):
+        """Get data for one channel.
+
+        Parameters
+        ----------
+        network : str
+        station : str
+        location : str
+        channel : str
+        starttime : obspy.core.UTCDateTime
+        endtime : obspy.core.UTCDateTime
+
+        Returns
+        -------
+        obspy.core.Stream
+            copy of data in [starttime, endtime], gaps are not included.
+            data uses the type it was originally stored with.
+        """
+        key = (network, station, location, channel)
+        with self.lock:
+            stream = self.streams.get(key)
+            if stream is None:
+                return Stream()
+            stream = stream.slice(starttime, endtime).copy()
+            dtype = self.dtypes[key]
+        # remove gaps
+        stream = TimeseriesUtility.mask_stream(stream).split()
+        stream = TimeseriesUtility.unmask_stream(stream)
+        for trace in stream:
+            trace.data = trace.data.astype(dtype)
+        return stream
+
+    def keys(self):
+        """Get stored (network, station, location, channel) tuples."""
+        with self.lock:
+            return list(self.streams.keys())
+
+
+class FakeEdgeServer(socketserver.ThreadingTCPServer):
+    """TCP server with shared data, latency and bandwidth settings.
+
+    Parameters
+    ----------
+    address : tuple
+        (host, port) to listen on, port 0 picks an unused port.
+    handler : socketserver.BaseRequestHandler
+        protocol handler.
+    data : FakeEdgeData
+        shared data storage.
+    latency : float
+        seconds to wait before responding to each request.
+    bandwidth : float
+        maximum bytes per second sent for each request, 0 for unlimited.
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address, handler, data, latency=0, bandwidth=0):
+        self.data = data
+        self.latency = latency
+        self.bandwidth = bandwidth
+        socketserver.ThreadingTCPServer.__init__(self, address, handler)
+
+
+class FakeEdgeInputServer(FakeEdgeServer):
+    """TCP server that handles one connection at a time, in order.
+
+    Connections are accepted in the order they were made, so once a new
+    connection is handled, data written by earlier connections is stored.
+    """
+
+    def process_request(self, request, client_address):
+        socketserver.TCPServer.process_request(self, request, client_address)
+
+
+class _FakeEdgeHandler(socketserver.BaseRequestHandler):
+    """Base handler with latency and bandwidth limits."""
+
+    def read_until(self, terminator):
+        """Read bytes from socket, up to and including terminator."""
+        buf = b""
+        while not buf.endswith(terminator):
+            data = self.request.recv(1)
+            if not data:
+                break
+            buf += data
+        return buf
+
+    def read_bytes(self, size):
+        """Read exactly size bytes, or fewer when socket is closed."""
+        buf = b""
+        while len(buf) < size:
+            data = self.request.recv(size - len(buf))
+            if not data:
+                break
+            buf += data
+        return buf
+
+    def send(self, data):
+        """Send data, limited by server bandwidth."""
+        bandwidth = self.server.bandwidth
+        if not bandwidth:
+            self.request.sendall(data)
+            return
+        chunk = max(1, int(bandwidth / 10))
+        for i in range(0, len(data), chunk):
+            start = time.time()
+            self.request.sendall(data[i : i + chunk])
+            remaining = len(data[i : i + chunk]) / bandwidth - (time.time() - start)
+            if remaining > 0:
+                time.sleep(remaining)
+
+    def wait(self):
+        """Simulate server latency."""
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+
+class WaveServerHandler(_FakeEdgeHandler):
+    """Earthworm waveserver protocol (GETSCNLRAW and MENU requests)."""
+
+    def handle(self):
+        request = self.read_until(b"\n").decode("ascii").split()
+        if not request:
+            return
+        self.wait()
+        command = request[0]
+        if command == "GETSCNLRAW:" and len(request) == 8:
+            try:
+                self.get_scnl_raw(*request[1:])
+                return
+            except ValueError:
+                # invalid start or end time
+                pass
+        elif command in ("MENU:", "MENUSCNL:") and len(request) >= 2:
+            self.menu(request[1])
+            return
+        # unknown or malformed request, flag as bad
+        rid = len(request) > 1 and request[1] or "ERROR"
+        self.send(("%s FB\n" % rid).encode())
+
+    def get_scnl_raw(self, rid, station, channel, network, location, start, end):
+        starttime = UTCDateTime(float(start))
+        endtime = UTCDateTime(float(end))
+        location = "" if location == "--" else location
+        stream = self.server.data.get(
+            network, station, location, channel, starttime, endtime
+        )
+        header = "%s 0 %s %s %s %s" % (
+            rid,
+            station,
+            channel,
+            network,
+            location or "--",
+        )
+        if len(stream) == 0:
+            self.send((header + " FG\n").encode())
+            return
+        packets = b"".join(self.get_tracebufs(stream))
+        header += " F %s %f %f %d\n" % (
+            self.get_datatype(stream),
+            stream[0].stats.starttime.timestamp,
+            stream[-1].stats.endtime.timestamp,
+            len(packets),
+        )
+        self.send(header.encode() + packets)
+
+    def get_datatype(self, stream):
+        if numpy.issubdtype(stream[0].data.dtype, numpy.integer):
+            return "i4"
+        return "f8"
+
+    def get_tracebufs(self, stream):
+        """Convert stream to tracebuf2 packets."""
+        datatype = self.get_datatype(stream)
+        for trace in stream:
+            stats = trace.stats
+            data = trace.data.astype("<" + datatype)
+            for i in range(0, len(data), TRACEBUF_SAMPLES):
+                samples = data[i : i + TRACEBUF_SAMPLES]
+                start = stats.starttime + i * stats.delta
+                header = struct.pack(
+                    TRACEBUF_HEADER,
+                    0,
+                    len(samples),
+                    start.timestamp,
+                    (start + (len(samples) - 1) * stats.delta).timestamp,
+                    stats.sampling_rate,
+                    stats.station.encode(),
+                    stats.network.encode(),
+                    stats.channel.encode(),
+                    (stats.location or "--").encode(),
+                    b"20",
+                    datatype.encode(),
+                    b"\x00\x00",
+                    b"\x00\x00",
+                )
+                yield header + samples.tobytes()
+
+    def menu(self, rid):
+        entries = []
+        for network, station, location, channel in self.server.data.keys():
+            stream = self.server.data.get(
+                network,
+                station,
+                location,
+                channel,
+                UTCDateTime(0),
+                UTCDateTime(2 ** 31),
+            )
+            if len(stream) == 0:
+                continue
+            entries.append(
+                "0 %s %s %s %s %f %f %s"
+                % (
+                    station,
+                    channel,
+                    network,
+                    location or "--",
+                    stream[0].stats.starttime.timestamp,
+                    stream[-1].stats.endtime.timestamp,
+                    self.get_datatype(stream),
+                )
+            )
+        self.send(("%s %s\n" % (rid, " ".join(entries))).encode())
+
+
+class QueryServerHandler(_FakeEdgeHandler):
+    """CWB query protocol, used by obspy.clients.neic."""
+
+    def handle(self):
+        line = self.read_until(b"\t").decode("ascii")
+        args = re.findall(r"'([^']*)'", line)
+        options = dict(zip(args[::2], args[1::2]))
+        if "-s" not in options:
+            return
+        self.wait()
+        seedname = options["-s"]
+        starttime = UTCDateTime(options["-b"])
+        endtime = starttime + float(options["-d"])
+        # seedname is NNSSSSSCCCLL, "." matches any character
+        pattern = re.compile(seedname)
+        stream = Stream()
+        for key in self.server.data.keys():
+            network, station, location, channel = key
+            name = "%-2s%-5s%s%-2s" % (network, station, channel, location)
+            if pattern.fullmatch(name):
+                stream += self.server.data.get(
+                    network, station, location, channel, starttime, endtime
+                )
+        buf = io.BytesIO()
+        if len(stream) > 0:
+            for trace in stream:
+                if numpy.issubdtype(trace.data.dtype, numpy.integer):
+                    trace.data = trace.data.astype(numpy.int32)
+            stream.write(buf, format="MSEED", reclen=512)
+        self.send(buf.getvalue() + b"<EOR>")
+
+
+class RawInputHandler(_FakeEdgeHandler):
+    """RawInput protocol, written by RawInputClient."""
+
+    def handle(self):
+        while True:
+            header = self.read_bytes(RAW_HEADER_SIZE)
+            if len(header) < RAW_HEADER_SIZE:
+                break
+            (
+                packethead,
+                nsamp,
+                seedname,
+                year,
+                doy,
+                ratemantissa,
+                ratedivisor,
+                activity,
+                ioclock,
+                quality,
+                timingquality,
+                secs,
+                usecs,
+                sequence,
+            ) = struct.unpack(PACKSTR, header)
+            if packethead != PACKETHEAD:
+                break
+            if nsamp == TAG or nsamp == FORCEOUT:
+                continue
+            samples = self.read_bytes(nsamp * 4)
+            data = numpy.frombuffer(samples, dtype=">i4").astype(numpy.int32)
+            seedname = seedname.decode()
+            stats = {
+                "network": seedname[0:2].strip(),
+                "station": seedname[2:7].strip(),
+                "channel": seedname[7:10].strip(),
+                "location": seedname[10:12].strip(),
+                "starttime": UTCDateTime(year=year, julday=doy) + secs + usecs / 1e6,
+                "sampling_rate": self.get_rate(ratemantissa, ratedivisor),
+            }
+            self.server.data.add(Stream([Trace(data, stats)]))
+
+    def get_rate(self, mantissa, divisor):
+        """Convert SEED rate factor and multiplier to samples per second."""
+        rate = float(mantissa) if mantissa > 0 else -1.0 / mantissa
+        rate *= float(divisor) if divisor > 0 else -1.0 / divisor
+        return rate
+
+
+class MiniSeedInputHandler(_FakeEdgeHandler):
+    """MiniSeed input protocol, written by MiniSeedInputClient."""
+
+    def handle(self):
+        buf = b""
+        while True:
+            data = self.request.recv(8192)
+            if not data:
+                break
+            buf += data
+            buf = self.add_records(buf)
+
+    def add_records(self, buf):
+        """Add complete records from buf, and return remaining bytes."""
+        while len(buf) >= 128:
+            info = get_record_information(io.BytesIO(buf))
+            size = info["record_length"]
+            if len(buf) < size:
+                break
+            self.server.data.add(read(io.BytesIO(buf[:size]), format="MSEED"))
+            buf = buf[size:]
+        return buf
+
+
+class FakeEdge(object):
+    """Run fake Edge servers in background threads.
+
+    Parameters
+    ----------
+    host : str
+        address to listen on.
+    files : array_like
+        miniseed files to load.
+    stream : obspy.core.Stream
+        data to load.
+    latency : float
+        seconds to wait before responding to read requests.
+    bandwidth : float
+        maximum bytes per second sent for each read request, 0 for unlimited.
+    waveserver_port : int
+        port for earthworm waveserver protocol, 0 picks an unused port.
+    query_port : int
+        port for CWB query protocol, 0 picks an unused port.
+    rawinput_port : int
+        port for RawInput protocol, 0 picks an unused port.
+    miniseed_port : int
+        port for MiniSeed input protocol, 0 picks an unused port.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        files=None,
+        stream=None,
+        latency=0,
+        bandwidth=0,
+        waveserver_port=0,
+        query_port=0,
+        rawinput_port=0,
+        miniseed_port=0,
+    ):
+        self.host = host
+        self.data = FakeEdgeData(stream)
+        for filename in files or []:
+            self.data.add(read(filename))
+        self.servers = {
+            name: server(
+                (host, port), handler, self.data, latency=latency, bandwidth=bandwidth
+            )
+            for name, server, handler, port in (
+                ("waveserver", FakeEdgeServer, WaveServerHandler, waveserver_port),
+                ("query", FakeEdgeServer, QueryServerHandler, query_port),
+                ("rawinput", FakeEdgeInputServer, RawInputHandler, rawinput_port),
+                ("miniseed", FakeEdgeInputServer, MiniSeedInputHandler, miniseed_port),
+            )
+        }
+        self.threads = []
+
+    @property
+    def waveserver_port(self):
+        return self.servers["waveserver"].server_address[1]
+
+    @property
+    def query_port(self):
+        return self.servers["query"].server_address[1]
+
+    @property
+    def rawinput_port(self):
+        return self.servers["rawinput"].server_address[1]
+
+    @property
+    def miniseed_port(self):
+        return self.servers["miniseed"].server_address[1]
+
+    def start(self):
+        """Start serving in background threads."""
+        for server in self.servers.values():
+            thread = threading.Thread(
+                target=server.serve_forever, kwargs={"poll_interval": 0.1}
+            )
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    def flush(self, timeout=10):
+        """Wait until data written to the input ports has been stored.
+
+        Writers return once data is sent, before it is stored.
+        Call this before reading data that was just written.
+
+        Parameters
+        ----------
+        timeout : float
+            seconds to wait for each input port.
+        """
+        for port in (self.rawinput_port, self.miniseed_port):
+            with socket.create_connection((self.host, port), timeout) as s:
+                s.shutdown(socket.SHUT_WR)
+                # returns when server closes connection
+                s.recv(1)
+
+    def stop(self):
+        """Stop serving, and close sockets."""
+        for server in self.servers.values():
+            server.shutdown()
+            server.server_close()
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+def main(args=None):
+    """Run a fake Edge server until interrupted."""
+    parser = argparse.ArgumentParser(
+        description="Serve miniseed files using Edge protocols, for testing."
+    )
+    parser.add_argument("files", nargs="*", help="miniseed files to serve")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--latency", default=0, type=float, help="seconds")
+    parser.add_argument(
+        "--bandwidth", default=0, type=float, help="bytes per second, 0 is unlimited"
+    )
+    parser.add_argument("--waveserver-port", default=2060, type=int)
+    parser.add_argument("--query-port", default=2061, type=int)
+    parser.add_argument("--rawinput-port", default=7981, type=int)
+    parser.add_argument("--miniseed-port", default=7974, type=int)
+    args = parser.parse_args(args)
+    edge = FakeEdge(
+        host=args.host,
+        files=args.files,
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        waveserver_port=args.waveserver_port,
+        query_port=args.query_port,
+        rawinput_port=args.rawinput_port,
+        miniseed_port=args.miniseed_port,
+    )
+    with edge:
+        print(
+            "waveserver %d, query %d, rawinput %d, miniseed %d"
+            % (
+                edge.waveserver_port,
+                edge.query_port,
+                edge.rawinput_port,
+                edge.miniseed_port,
+            )
+        )
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -17,7 +17,7 @@ import numpy.ma
 import obspy.core
 from obspy.clients.neic import client as miniseed
 
-from .. import ChannelConverter, TimeseriesUtility
+from .. import ChannelConverter, Metrics, TimeseriesUtility
 from ..Metadata import get_instrument
 from ..TimeseriesFactory import TimeseriesFactory
 from ..TimeseriesFactoryException import TimeseriesFactoryException
@@ -528,9 +528,18 @@ class MiniSeedFactory(TimeseriesFactory):
         location = self._get_edge_location(observatory, channel, type, interval)
         network = self._get_edge_network(observatory, channel, type, interval)
         edge_channel = self._get_edge_channel(observatory, channel, type, interval)
-        data = self.client.get_waveforms(
-            network, station, location, edge_channel, starttime, endtime
-        )
+        with Metrics.timer(
+            "get_waveforms",
+            host=self.host,
+            port=self.port,
+            sncl=".".join((network, station, location, edge_channel)),
+            starttime=starttime,
+            endtime=endtime,
+        ) as fields:
+            data = self.client.get_waveforms(
+                network, station, location, edge_channel, starttime, endtime
+            )
+            fields.update(Metrics.get_stream_fields(data))
         data.merge()
         if data.count() == 0:
             data += TimeseriesUtility.create_empty_trace(
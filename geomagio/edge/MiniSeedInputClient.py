@@ -3,6 +3,8 @@ import io
 import socket
 import sys
 
+from .. import Metrics
+
 
 class MiniSeedInputClient(object):
     """Client to write MiniSeed formatted data to Edge.
@@ -48,7 +50,7 @@ class MiniSeedInputClient(object):
             attempts += 1
             try:
                 s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                s.connect(self.host, self.port)
+                s.connect((self.host, self.port))
                 break
             except socket.error as e:
                 if attempts >= max_attempts:
@@ -73,4 +75,7 @@ class MiniSeedInputClient(object):
         buf = io.BytesIO()
         stream.write(buf, format="MSEED")
         # send data
-        self.socket.sendall(buf)
+        with Metrics.timer(
+            "socket_send", host=self.host, port=self.port, bytes=buf.tell()
+        ):
+            self.socket.sendall(buf.getvalue())
@@ -5,6 +5,7 @@ import socket  # noqa
 import struct
 import sys
 from datetime import datetime
+from .. import Metrics
 from ..TimeseriesFactoryException import TimeseriesFactoryException
 from obspy.core import UTCDateTime
 from time import sleep
@@ -228,7 +229,10 @@ class RawInputClient:
         try:
             if self.socket is None:
                 self._open_socket()
-            self.socket.sendall(buf)
+            with Metrics.timer(
+                "socket_send", host=self.host, port=self.port, bytes=len(buf)
+            ):
+                self.socket.sendall(buf)
             self.sequence += 1
         except socket.error as v:
             error = "Socket error %d" % v[0]
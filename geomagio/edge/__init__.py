@@ -2,9 +2,17 @@
 """
 from __future__ import absolute_import
 
-from .EdgeFactory import EdgeFactory
-from .LocationCode import LocationCode
-from .MiniSeedFactory import MiniSeedFactory
-from .RawInputClient import RawInputClient
+from .. import LazyImport
+
+# LocationCode is used to parse arguments, without importing factories
+__getattr__, __dir__ = LazyImport.lazy_import(
+    __name__,
+    {
+        "EdgeFactory": ".EdgeFactory:EdgeFactory",
+        "LocationCode": ".LocationCode:LocationCode",
+        "MiniSeedFactory": ".MiniSeedFactory:MiniSeedFactory",
+        "RawInputClient": ".RawInputClient:RawInputClient",
+    },
+)
 
 __all__ = ["EdgeFactory", "LocationCode", "MiniSeedFactory", "RawInputClient"]
@@ -32,6 +32,8 @@ class IAGA2002Factory(TimeseriesFactory):
     IAGA2002Parser
     """
 
+    fixed_width_rows = True
+
     def __init__(self, **kwargs):
         TimeseriesFactory.__init__(self, **kwargs)
 
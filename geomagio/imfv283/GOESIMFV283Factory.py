@@ -1,13 +1,20 @@
 """Factory to load IMFV283 files from an input StreamIMFV283Factory."""
 from __future__ import absolute_import, print_function, unicode_literals
 
+from concurrent.futures import ThreadPoolExecutor
+from .GOESMessageCache import GOESMessageCache
 from .IMFV283Factory import IMFV283Factory
 import subprocess
 import sys
-from obspy.core import Stream
+from obspy.core import Stream, UTCDateTime
 import os
 
 
+# seconds after transmission before messages are cached as complete,
+# servers may receive messages several transmission intervals late
+CACHE_SETTLE_TIME = 3600
+
+
 class GOESIMFV283Factory(IMFV283Factory):
     """Timeseries Factory for IMFV283 formatted files loaded from the goes
         server.
@@ -21,10 +28,18 @@ class GOESIMFV283Factory(IMFV283Factory):
     getdcpmessages: String
         The path and filename to be executed. ie ./opendcs/bin/getDcpMessages
     server: string array
-        An array of server names to retrive data from. Currently only using
-        first server.
+        An array of server names to retrive data from. All servers are
+        queried at the same time, and messages from servers that respond
+        are combined.
     user: String
         The goes user.
+    cache_directory: String
+        The directory where retrieved messages are stored, optional.
+        When set, only time windows that have not already been retrieved
+        are requested from the servers.
+    cache_settle_time: int
+        Seconds before the current time that windows are cached as
+        retrieved, default CACHE_SETTLE_TIME.
 
     Notes
     -----
@@ -36,6 +51,10 @@ class GOESIMFV283Factory(IMFV283Factory):
     which can easily be 20 minutes off the time of the data. To compensate we
     ask for 30 minutes before and after the range requested.
 
+    Messages can reach the servers late, so windows are only cached as
+    retrieved up to cache_settle_time before the request, and later
+    requests ask for newer messages again.
+
     See Also
     --------
     IMFV283Factory
@@ -49,6 +68,8 @@ class GOESIMFV283Factory(IMFV283Factory):
         password=None,
         server=None,
         user=None,
+        cache_directory=None,
+        cache_settle_time=CACHE_SETTLE_TIME,
         **kwargs
     ):
         IMFV283Factory.__init__(self, None, **kwargs)
@@ -58,6 +79,8 @@ class GOESIMFV283Factory(IMFV283Factory):
         self.user = user
         self.password = password
         self.javaerror = b"FATAL"
+        self.cache = cache_directory and GOESMessageCache(cache_directory)
+        self.cache_settle_time = cache_settle_time
 
     def get_timeseries(
         self,
@@ -75,7 +98,6 @@ class GOESIMFV283Factory(IMFV283Factory):
         """
         observatory = observatory or self.observatory
         channels = channels or self.channels
-        self.criteria_file_name = observatory + ".sc"
         timeseries = Stream()
         output = self._retrieve_goes_messages(starttime, endtime, observatory)
         timeseries += self.parse_string(output)
@@ -111,7 +133,7 @@ class GOESIMFV283Factory(IMFV283Factory):
             )
 
     def _retrieve_goes_messages(self, starttime, endtime, observatory):
-        """Retrieve goes messages, using getdcpmessages commandline tool.
+        """Retrieve goes messages, using the cache when configured.
 
         Parameters
         ----------
@@ -122,6 +144,96 @@ class GOESIMFV283Factory(IMFV283Factory):
         observatory: str
             observatory code.
 
+        Returns
+        -------
+        String
+            Messages from getDcpMessages
+        """
+        start = starttime - 2200
+        end = endtime + 1800
+        if self.cache is None:
+            return self._get_dcp_messages(start, end, observatory) or b""
+        now = UTCDateTime()
+        # messages cannot be received after now,
+        # and may still be received for windows that have not settled
+        settled = now - self.cache_settle_time
+        windows = self.cache.get_missing_windows(observatory, start, min(end, now))
+        if windows:
+            with ThreadPoolExecutor(max_workers=len(windows)) as executor:
+                outputs = executor.map(
+                    lambda window: self._get_dcp_messages(
+                        window[0], window[1], observatory
+                    ),
+                    windows,
+                )
+                for (window_start, window_end), output in zip(windows, outputs):
+                    if output is not None:
+                        self.cache.add_messages(
+                            observatory,
+                            window_start,
+                            min(window_end, settled),
+                            output,
+                        )
+        return self.cache.get_messages(observatory, start, end)
+
+    def _get_dcp_messages(self, starttime, endtime, observatory):
+        """Retrieve goes messages from all servers at the same time.
+
+        Parameters
+        ----------
+        starttime: obspy.core.UTCDateTime
+            start of window, by time messages were received.
+        endtime: obspy.core.UTCDateTime
+            end of window, by time messages were received.
+        observatory: str
+            observatory code.
+
+        Returns
+        -------
+        String
+            Messages from servers that responded, or None if no server
+            responded.
+        """
+        criteria_file = os.path.join(
+            self.directory,
+            "%s_%s_%s.sc"
+            % (
+                observatory,
+                starttime.strftime("%Y%j%H%M%S"),
+                endtime.strftime("%Y%j%H%M%S"),
+            ),
+        )
+        self._fill_criteria_file(starttime, endtime, observatory, criteria_file)
+        try:
+            with ThreadPoolExecutor(max_workers=len(self.server)) as executor:
+                outputs = list(
+                    executor.map(
+                        lambda server: self._run_getdcpmessages(server, criteria_file),
+                        self.server,
+                    )
+                )
+        finally:
+            os.remove(criteria_file)
+        outputs = [output for output in outputs if output is not None]
+        if not outputs:
+            return None
+        # servers return many of the same messages
+        messages = []
+        for output in outputs:
+            messages.extend(output.splitlines())
+        return b"\n".join(dict.fromkeys(messages))
+
+    def _run_getdcpmessages(self, server, criteria_file):
+        """Retrieve goes messages from one server, using getdcpmessages
+        commandline tool.
+
+        Parameters
+        ----------
+        server: str
+            server name.
+        criteria_file: str
+            search criteria file, from _fill_criteria_file.
+
         Notes
         -----
         See page 37-38
@@ -139,41 +251,48 @@ class GOESIMFV283Factory(IMFV283Factory):
         Returns
         -------
         String
-            Messages from getDcpMessages
+            Messages from getDcpMessages, or None if server could not be
+            reached.
         """
-        self._fill_criteria_file(starttime, endtime, observatory)
-
-        for server in self.server:
-            print(server, file=sys.stderr)
-            proc = subprocess.Popen(
-                [
-                    self.getdcpmessages,
-                    "-h",
-                    server,
-                    "-u",
-                    self.user,
-                    "-P",
-                    self.password,
-                    "-f",
-                    self.directory + "/" + self.criteria_file_name,
-                    "-t",
-                    "60",
-                    "-n",
-                ],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            (output, error) = proc.communicate()
-            print(error, file=sys.stderr)
-            if error.find(self.javaerror) >= 0:
-                print("Error: could not connect to %s" % server, file=sys.stderr)
-                continue
-            break
-
+        print(server, file=sys.stderr)
+        proc = subprocess.Popen(
+            [
+                self.getdcpmessages,
+                "-h",
+                server,
+                "-u",
+                self.user,
+                "-P",
+                self.password,
+                "-f",
+                criteria_file,
+                "-t",
+                "60",
+                "-n",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        (output, error) = proc.communicate()
+        print(error, file=sys.stderr)
+        if error.find(self.javaerror) >= 0:
+            print("Error: could not connect to %s" % server, file=sys.stderr)
+            return None
         return output
 
-    def _fill_criteria_file(self, starttime, endtime, observatory):
-        """Set Criteria Filename
+    def _fill_criteria_file(self, starttime, endtime, observatory, criteria_file):
+        """Write Criteria File
+
+        Parameters
+        ----------
+        starttime: obspy.core.UTCDateTime
+            start of window, by time messages were received.
+        endtime: obspy.core.UTCDateTime
+            end of window, by time messages were received.
+        observatory: str
+            observatory code.
+        criteria_file: str
+            path of criteria file to write.
 
         Notes
         -----
@@ -183,7 +302,7 @@ class GOESIMFV283Factory(IMFV283Factory):
             ftp://hazards.cr.usgs.gov/web/geomag-algorithms/
                     DCS Tools Users Guide_4-4.pdf
 
-        Sets the criteria filename to the observatory code with a .sc extension
+        Criteria file contents
             First 3 lines are comments.
             DAPS_SINCE: The time after which messages are to be retrieved.
             DAPS_UNTIL: The time before which messages are to be retrieved.
@@ -194,24 +313,20 @@ class GOESIMFV283Factory(IMFV283Factory):
             ASCENDING_TIME: Do Not sort messages into ascending time.
             RT_SETTLE_DELAY: Do wait to prevent duplicate messages.
         """
-        start = starttime - 2200
-        end = endtime + 1800
-
-        criteria_file = self.directory + "/" + self.criteria_file_name
         buf = []
         buf.append("#\n# LRGS Search Criteria\n#\n")
         buf.append("DAPS_SINCE: ")
-        buf.append(start.datetime.strftime("%y/%j %H:%M:%S\n"))
+        buf.append(starttime.datetime.strftime("%y/%j %H:%M:%S\n"))
         buf.append("DAPS_UNTIL: ")
-        buf.append(end.datetime.strftime("%y/%j %H:%M:%S\n"))
+        buf.append(endtime.datetime.strftime("%y/%j %H:%M:%S\n"))
         buf.append("NETWORK_LIST: " + observatory.lower() + ".nl\n")
         buf.append("DAPS_STATUS: N\n")
         buf.append("RETRANSMITTED: N\n")
         buf.append("ASCENDING_TIME: false\n")
         buf.append("RT_SETTLE_DELAY: true\n")
         criteria_dir = os.path.dirname(criteria_file)
-        if not os.path.exists(criteria_dir):
-            os.makedirs(criteria_dir)
+        if criteria_dir and not os.path.exists(criteria_dir):
+            os.makedirs(criteria_dir, exist_ok=True)
         with open(criteria_file, "wb") as fh:
             fh.write("".join(buf).encode())
             fh.close()
@@ -0,0 +1,192 @@
+"""Local store of GOES messages, by transmission time."""
+from __future__ import absolute_import
+
+import json
+import os
+import threading
+
+from obspy.core import UTCDateTime
+
+
+class GOESMessageCache(object):
+    """Local store of GOES messages, by transmission time.
+
+    Messages for each observatory are stored in one file per day of
+    transmission, and the time windows that have already been retrieved are
+    stored in a json file, so only new windows need to be requested::
+
+        {directory}/{OBS}/{YYYYJJJ}.msg
+        {directory}/{OBS}/windows.json
+
+    Removing an observatory directory resets its cache.
+
+    Parameters
+    ----------
+    directory : str
+        directory where messages are stored.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.lock = threading.Lock()
+
+    def add_messages(self, observatory, starttime, endtime, messages):
+        """Store messages retrieved for a time window.
+
+        Parameters
+        ----------
+        observatory : str
+            observatory code.
+        starttime : obspy.core.UTCDateTime
+            start of retrieved window.
+        endtime : obspy.core.UTCDateTime
+            end of retrieved window.
+            when not after starttime, messages are stored but the window
+            is not, so it is requested again.
+        messages : bytes
+            newline separated messages, lines that are not messages are
+            ignored.
+        """
+        days = {}
+        for line in messages.splitlines():
+            transmission_time = get_transmission_time(line)
+            if transmission_time is not None:
+                day = transmission_time.strftime("%Y%j")
+                days.setdefault(day, []).append(line)
+        directory = os.path.join(self.directory, observatory.upper())
+        with self.lock:
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+            for day, lines in days.items():
+                path = self._get_message_file(observatory, day)
+                existing = set(self._read_lines(path))
+                new_lines = []
+                for line in lines:
+                    if line not in existing:
+                        existing.add(line)
+                        new_lines.append(line)
+                if new_lines:
+                    with open(path, "ab") as f:
+                        f.write(b"".join(line + b"\n" for line in new_lines))
+            if starttime < endtime:
+                windows = self._read_windows(observatory)
+                windows.append((starttime.timestamp, endtime.timestamp))
+                self._write_windows(observatory, windows)
+
+    def get_messages(self, observatory, starttime, endtime):
+        """Get stored messages transmitted during a time window.
+
+        Parameters
+        ----------
+        observatory : str
+            observatory code.
+        starttime : obspy.core.UTCDateTime
+            start of window.
+        endtime : obspy.core.UTCDateTime
+            end of window.
+
+        Returns
+        -------
+        bytes
+            newline separated messages.
+        """
+        messages = []
+        day = UTCDateTime(starttime.date)
+        while day <= endtime:
+            path = self._get_message_file(observatory, day.strftime("%Y%j"))
+            for line in self._read_lines(path):
+                if starttime <= get_transmission_time(line) <= endtime:
+                    messages.append(line)
+            day += 86400
+        return b"\n".join(messages)
+
+    def get_missing_windows(self, observatory, starttime, endtime):
+        """Get parts of a time window that have not been retrieved.
+
+        Parameters
+        ----------
+        observatory : str
+            observatory code.
+        starttime : obspy.core.UTCDateTime
+            start of window.
+        endtime : obspy.core.UTCDateTime
+            end of window.
+
+        Returns
+        -------
+        list
+            list of (starttime, endtime) tuples.
+        """
+        missing = []
+        start = starttime.timestamp
+        end = endtime.timestamp
+        with self.lock:
+            windows = self._read_windows(observatory)
+        for window_start, window_end in windows:
+            if window_end < start:
+                continue
+            if window_start > end:
+                break
+            if window_start > start:
+                missing.append((UTCDateTime(start), UTCDateTime(window_start)))
+            start = max(start, window_end)
+        if start < end:
+            missing.append((UTCDateTime(start), UTCDateTime(end)))
+        return missing
+
+    def _get_message_file(self, observatory, day):
+        return os.path.join(self.directory, observatory.upper(), day + ".msg")
+
+    def _get_windows_file(self, observatory):
+        return os.path.join(self.directory, observatory.upper(), "windows.json")
+
+    def _read_lines(self, path):
+        if not os.path.isfile(path):
+            return []
+        with open(path, "rb") as f:
+            return f.read().splitlines()
+
+    def _read_windows(self, observatory):
+        """Read retrieved windows, sorted by start, as timestamps."""
+        path = self._get_windows_file(observatory)
+        if not os.path.isfile(path):
+            return []
+        with open(path, "r") as f:
+            return [tuple(window) for window in json.load(f)]
+
+    def _write_windows(self, observatory, windows):
+        """Merge overlapping windows and write them."""
+        merged = []
+        for start, end in sorted(windows):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        path = self._get_windows_file(observatory)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(merged, f)
+        os.replace(temp_path, path)
+
+
+def get_transmission_time(message):
+    """Get the transmission time of a GOES message.
+
+    Parameters
+    ----------
+    message : bytes
+        message, starting with the 8 character platform id followed by the
+        transmission time formatted as YYDDDHHMMSS.
+
+    Returns
+    -------
+    obspy.core.UTCDateTime
+        transmission time, or None if message is not valid.
+    """
+    transmission = message[8:19]
+    if len(transmission) != 11 or not transmission.isdigit():
+        return None
+    try:
+        return UTCDateTime(b"20" + transmission[0:5] + b"T" + transmission[5:])
+    except (TypeError, ValueError):
+        return None
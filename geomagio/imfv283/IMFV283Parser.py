@@ -18,6 +18,11 @@ MSG_SIZE_100B = 190
 MSG_SIZE_300B = 191
 BIAS = 8192
 SHIFT = 1048576
+# encoded message data, 3 ness bytes for every 2 goes bytes
+NESS_SIZE = 189
+GOES_SIZE = 126
+# header bits that double the scale of each channel
+SCALE_BITS = numpy.array([0x20, 0x10, 0x8, 0x4])
 
 # Documentation list the second channel as D, but we know that for
 # USGS, it's actually E. Since only USGS and Canada (YXZF) use GOES
@@ -66,13 +71,15 @@ class IMFV283Parser(object):
     def parse(self, data):
         """Parse a string containing IMFV283 formatted data.
 
+        Messages are validated one at a time, then decoded together.
+
         Parameters
         ----------
         data : str
             IMFV283 formatted file contents.
         """
-        lines = data.splitlines()
-        for line in lines:
+        messages = []
+        for line in data.splitlines():
             # if line isn't at least 37 characters, there's no need to proceed.
             if len(line) <= HEADER_SIZE:
                 sys.stderr.write("Bad Header length\n")
@@ -87,13 +94,34 @@ class IMFV283Parser(object):
                     sys.stderr.write("Incorrect data Length \n")
                     continue
 
-                goes_data = self._process_ness_block(
-                    line, imfv283_codes.OBSERVATORIES[msg_header["obs"]], data_len
-                )
+                domsat = imfv283_codes.OBSERVATORIES[msg_header["obs"]]
+                offset = self._get_data_offset(data_len)
+                ness_block = line[offset : offset + NESS_SIZE]
+                if len(ness_block) != NESS_SIZE:
+                    raise IndexError("ness block is too short")
+            except (KeyError, IndexError, ValueError):
+                sys.stderr.write("Incorrect data line ")
+                sys.stderr.write(str(line))
+                continue
+            messages.append((line, msg_header, ness_block, domsat))
+        if not messages:
+            return
 
-                goes_header = self._parse_goes_header(goes_data)
-                data = self._get_data(goes_header, goes_data)
-                self._post_process(data, msg_header, goes_header)
+        goes_data = self._process_ness_blocks(
+            numpy.frombuffer(b"".join(m[2] for m in messages), dtype=numpy.uint8),
+            swap_hdr=numpy.array([m[3]["swap_hdr"] for m in messages], dtype=bool),
+            swap_data=numpy.array([m[3]["swap_data"] for m in messages], dtype=bool),
+        )
+        goes_headers = self._parse_goes_headers(goes_data)
+        data = self._get_data(goes_headers, goes_data)
+        for index, (line, msg_header, _, _) in enumerate(messages):
+            goes_header = {
+                "day": int(goes_headers["day"][index]),
+                "minute": int(goes_headers["minute"][index]),
+                "orient": int(goes_headers["orient"][index]),
+            }
+            try:
+                self._post_process(data[index], msg_header, goes_header)
             except (KeyError, IndexError, ValueError):
                 sys.stderr.write("Incorrect data line ")
                 sys.stderr.write(str(line))
@@ -161,39 +189,32 @@ class IMFV283Parser(object):
         # otherwise return reported data_time
         return (data_time, transmit_time, False)
 
-    def _get_data(self, header, data):
-        """get data from data packet
+    def _get_data(self, headers, data):
+        """get data from data packets
 
         Parameters
         ----------
-        header : dict
-            contains the header information for the data packet
-        data : bytearray
-            contains the encoded channel data
+        headers : dict
+            header arrays for the data packets, from _parse_goes_headers.
+        data : numpy.ndarray
+            uint8 array with one row of encoded data per packet.
         Returns
         -------
-        dict
-            dictionary of channel data arrays.
+        numpy.ndarray
+            array of shape (packets, 4, 12), with 12 samples of each
+            channel in nanotesla, and numpy.nan for missing samples.
         """
-        parse_data = {}
-        channels = CHANNELS[header["orient"]]
-        for channel in channels:
-            parse_data[channel] = []
-
-        bytecount = 30
-        for cnt in range(0, 12):
-            # get data in 2 byte pairs as integers.
-            d1 = 0x100 * data[bytecount] + data[bytecount + 1]
-            d2 = 0x100 * data[bytecount + 2] + data[bytecount + 3]
-            d3 = 0x100 * data[bytecount + 4] + data[bytecount + 5]
-            d4 = 0x100 * data[bytecount + 6] + data[bytecount + 7]
-            bytecount += 8
-
-            parse_data[channels[0]].append(d1)
-            parse_data[channels[1]].append(d2)
-            parse_data[channels[2]].append(d3)
-            parse_data[channels[3]].append(d4)
-
+        # get data in 2 byte pairs as integers, 12 samples of 4 channels.
+        values = (data[:, 30::2].astype(numpy.uint16) << 8) | data[:, 31::2]
+        values = values.reshape(-1, 12, 4).transpose(0, 2, 1)
+        parse_data = numpy.ascontiguousarray(values, dtype=numpy.float64)
+        parse_data[values == DEAD_VALUE] = numpy.nan
+        # Data values need to be scaled, offset and shifted into the
+        # correct 10th nanotesla value.
+        # For our convenience we convert to nanotesla values.
+        parse_data *= headers["scale"][:, :, numpy.newaxis]
+        parse_data += (headers["offset"] * BIAS - SHIFT)[:, :, numpy.newaxis]
+        parse_data /= 10.0
         return parse_data
 
     def _get_data_offset(self, data_len):
@@ -217,47 +238,36 @@ class IMFV283Parser(object):
             return HEADER_SIZE + 1
         return HEADER_SIZE
 
-    def _parse_goes_header(self, data):
-        """parse goes data header
+    def _parse_goes_headers(self, data):
+        """parse goes data headers
 
         Parameters
         ----------
-        data : bytearray
-            The bytearray containing the goes data packet.
+        data : numpy.ndarray
+            uint8 array with one row per goes data packet.
         Returns
         -------
         dict
             dictionary containing the required values for decoding the
-            data packet.
+            data packets, as arrays with one element (or row) per packet.
         """
+        data = data.astype(numpy.int64)
         header = {}
 
         # day of year and minute of day are combined into 3 bytes
-        header["day"] = data[0] + 0x100 * (data[1] & 0xF)
-        header["minute"] = (data[2] & 0xFF) * 0x10 + data[1] / 0x10
+        header["day"] = data[:, 0] + 0x100 * (data[:, 1] & 0xF)
+        header["minute"] = data[:, 2] * 0x10 + (data[:, 1] >> 4)
 
         # offset values for each channel are in bytes 3,4,5,6 respectively.
-        header["offset"] = data[3:7]
+        header["offset"] = data[:, 3:7]
 
         # Not used.  alert_capable = (goes_block[7] & 0x01)
         # orient code. The orientation of the instrument (HEZF, etc.)
-        header["orient"] = data[7] / 0x40
+        header["orient"] = data[:, 7] >> 6
 
-        # scale values bits 0,1,2,3 of byte 7.
+        # scale values bits 5,4,3,2 of byte 7.
         # Either 1 if bit not set, 2 if bit is set.
-        scale1 = 1
-        scale2 = 1
-        scale3 = 1
-        scale4 = 1
-        if (data[7] & 0x20) > 0:
-            scale1 = 2
-        if (data[7] & 0x10) > 0:
-            scale2 = 2
-        if (data[7] & 0x8) > 0:
-            scale3 = 2
-        if (data[7] & 0x4) > 0:
-            scale4 = 2
-        header["scale"] = [scale1, scale2, scale3, scale4]
+        header["scale"] = ((data[:, 7:8] & SCALE_BITS) > 0) + 1
 
         return header
 
@@ -292,8 +302,8 @@ class IMFV283Parser(object):
 
         Parameters
         ----------
-        data: dict
-            parsed data by channel
+        data: numpy.ndarray
+            parsed data, one row per channel
         msg_header: dict
             parsed header of the message
         goes_header: dict
@@ -314,75 +324,48 @@ class IMFV283Parser(object):
             sys.stderr.write("data over twice as old as the message\n")
             return
 
-        scale = goes_header["scale"]
-        offset = goes_header["offset"]
         orientation = goes_header["orient"]
         for channel, loc in zip(CHANNELS[orientation], range(0, 4)):
-            stats = obspy.core.Stats()
-            stats.channel = channel
-            stats.sampling_rate = 0.0166666666667
-            stats.starttime = goes_time
-            stats.npts = 12
-            stats.station = msg_header["obs"]
-
-            numpy_data = numpy.array(data[channel], dtype=numpy.float64)
-            numpy_data[numpy_data == DEAD_VALUE] = numpy.nan
-            # Data values need to be scaled, offset and shifted into the
-            # correct 10th nanotesla value.
-            # For our convenience we convert to nanotesla values.
-            numpy_data = numpy.multiply(numpy_data, scale[loc])
-            numpy_data = numpy.add(numpy_data, offset[loc] * BIAS - SHIFT)
-            numpy_data = numpy.divide(numpy_data, 10.0)
-
-            trace = obspy.core.Trace(numpy_data, stats)
+            # Trace copies its header, so pass a dict instead of building Stats
+            stats = {
+                "channel": channel,
+                "sampling_rate": 0.0166666666667,
+                "starttime": goes_time,
+                "station": msg_header["obs"],
+            }
+
+            trace = obspy.core.Trace(data[loc], stats)
             self.stream += trace
 
-    def _process_ness_block(self, msg, domsat, data_len):
-        """process the "ness" block of data into an IMFV283 data block.
+    def _process_ness_blocks(self, ness_blocks, swap_hdr, swap_data):
+        """process "ness" blocks of data into IMFV283 data blocks.
 
         Parameters
         ----------
-        msg : array
-            unsigned chars
-        domsat : dict
-            Dictionary of observatory dependent information used to decode
-            ness block.
-        data_len : int
-            data_len provided by the message header.
-        """
-        goes_block = bytearray(126)
-        ness_byte = 0
-        goes_byte = 0
+        ness_blocks : numpy.ndarray
+            uint8 array of ness blocks, 189 bytes per message.
+        swap_hdr : numpy.ndarray
+            bool array, whether to swap header bytes of each message.
+        swap_data : numpy.ndarray
+            bool array, whether to swap data bytes of each message.
 
-        if data_len == MSG_SIZE_300B:
-            offset = HEADER_SIZE + 1
-        else:
-            offset = HEADER_SIZE
-
-        for cnt in range(0, 63):
-            # Convert 3 byte "pair" into ordinal values for manipulation.
-            byte3 = msg[offset + ness_byte + 2]
-            byte2 = msg[offset + ness_byte + 1]
-            byte1 = msg[offset + ness_byte]
-            if not isinstance(byte1, int):
-                # in python 3, these are already ints
-                # python 2 returns characters, which need to be converted
-                byte3 = ord(byte3)
-                byte2 = ord(byte2)
-                byte1 = ord(byte1)
-
-            goes_value1 = (byte3 & 0x3F) + ((byte2 & 0x3) * 0x40)
-            goes_value2 = ((byte2 // 0x4) & 0xF) + ((byte1 & 0xF) * 0x10)
-
-            # swap the bytes depending on domsat information.
-            if domsat["swap_hdr"] and cnt <= 11 or domsat["swap_data"] and cnt > 11:
-                goes_block[goes_byte] = goes_value2
-                goes_block[goes_byte + 1] = goes_value1
-            else:
-                goes_block[goes_byte] = goes_value1
-                goes_block[goes_byte + 1] = goes_value2
-
-            ness_byte += 3
-            goes_byte += 2
-
-        return goes_block
+        Returns
+        -------
+        numpy.ndarray
+            uint8 array of shape (messages, 126).
+        """
+        # Convert 3 byte "pairs" into 2 values.
+        ness = ness_blocks.reshape(-1, 63, 3)
+        byte1, byte2, byte3 = ness[:, :, 0], ness[:, :, 1], ness[:, :, 2]
+        goes_value1 = (byte3 & 0x3F) | ((byte2 & 0x3) << 6)
+        goes_value2 = ((byte2 >> 2) & 0xF) | ((byte1 & 0xF) << 4)
+
+        # swap the bytes depending on domsat information.
+        # the first 12 pairs are header, the rest are data.
+        is_header = numpy.arange(63) <= 11
+        swap = numpy.where(is_header, swap_hdr[:, None], swap_data[:, None])
+        goes_block = numpy.empty((len(ness), 63, 2), dtype=numpy.uint8)
+        goes_block[:, :, 0] = numpy.where(swap, goes_value2, goes_value1)
+        goes_block[:, :, 1] = numpy.where(swap, goes_value1, goes_value2)
+
+        return goes_block.reshape(-1, GOES_SIZE)
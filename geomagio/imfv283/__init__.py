@@ -6,6 +6,7 @@ Based on documentation at:
 from __future__ import absolute_import
 
 from .GOESIMFV283Factory import GOESIMFV283Factory
+from .GOESMessageCache import GOESMessageCache
 from .IMFV283Factory import IMFV283Factory
 from .StreamIMFV283Factory import StreamIMFV283Factory
 from .IMFV283Parser import IMFV283Parser
@@ -13,6 +14,7 @@ from .IMFV283Parser import IMFV283Parser
 
 __all__ = [
     "GOESIMFV283Factory",
+    "GOESMessageCache",
     "IMFV283Factory",
     "StreamIMFV283Factory",
     "IMFV283Parser",
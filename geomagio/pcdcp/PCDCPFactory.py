@@ -35,6 +35,8 @@ class PCDCPFactory(TimeseriesFactory):
     PCDCPParser
     """
 
+    fixed_width_rows = True
+
     def __init__(
         self,
         temperatures=False,
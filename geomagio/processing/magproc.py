@@ -1,7 +1,8 @@
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import os
 import sys
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from dateutil.relativedelta import relativedelta
 from obspy.core import UTCDateTime, Stream
@@ -11,11 +12,15 @@ from ..algorithm.FilterAlgorithm import FilterAlgorithm
 from ..edge import EdgeFactory
 from ..pcdcp import PCDCPFactory, PCDCP_FILE_PATTERN
 from ..residual import WebAbsolutesFactory, CalFileFactory
+from ..TimeseriesFactory import TimeseriesFactory
+from ..TimeseriesUtility import merge_streams
 from ..Util import get_intervals
 
 
 CAL_TEMPLATE = "{OBSERVATORY}/{OBSERVATORY}{YEAR}PCD.cal"
 PCDCP_TEMPLATE = f"%(OBS)s/{PCDCP_FILE_PATTERN}"
+# seconds of data in each edge request
+READ_INTERVAL = 7 * 86400
 
 
 def main():
@@ -36,6 +41,7 @@ def prepfiles(
     minute_path: str = os.getenv("MINUTE_PATH", "file://c:/USGSDCP"),
     temperature_path: str = os.getenv("TEMPERATURE_PATH", "file://c:/DEG"),
     edge_host: str = os.getenv("EDGE_HOST", "cwbpub.cr.usgs.gov"),
+    max_workers: int = os.cpu_count() or 1,
 ):
     month_start = datetime(year, month, 1)
     month_end = month_start + relativedelta(months=1)
@@ -46,26 +52,29 @@ def prepfiles(
         observatory=observatory,
         template="file://" + os.path.join(calibration_path, CAL_TEMPLATE),
     )
-
-    intervals = get_intervals(UTCDateTime(month_start), UTCDateTime(month_end))
-    for interval in intervals:
-        # Variation data
-        write_variation_data(
-            host=edge_host,
-            starttime=interval["start"],
-            endtime=interval["end"],
-            observatory=observatory,
-            second_template="file://" + os.path.join(second_path, PCDCP_TEMPLATE),
-            minute_template="file://" + os.path.join(minute_path, PCDCP_TEMPLATE),
-        )
-        # Temperature data
-        write_temperature_data(
-            host=edge_host,
-            starttime=interval["start"],
-            endtime=interval["end"],
-            observatory=observatory,
-            template="file://" + os.path.join(temperature_path, PCDCP_TEMPLATE),
-        )
+    # one factory, and one filter run, for the whole month
+    factory = EdgeFactory(host=edge_host)
+    # Variation data
+    write_variation_data(
+        host=edge_host,
+        starttime=UTCDateTime(month_start),
+        endtime=UTCDateTime(month_end),
+        observatory=observatory,
+        second_template="file://" + os.path.join(second_path, PCDCP_TEMPLATE),
+        minute_template="file://" + os.path.join(minute_path, PCDCP_TEMPLATE),
+        factory=factory,
+        max_workers=max_workers,
+    )
+    # Temperature data
+    write_temperature_data(
+        host=edge_host,
+        starttime=UTCDateTime(month_start),
+        endtime=UTCDateTime(month_end),
+        observatory=observatory,
+        template="file://" + os.path.join(temperature_path, PCDCP_TEMPLATE),
+        factory=factory,
+        max_workers=max_workers,
+    )
 
 
 def write_cal_file(
@@ -111,24 +120,106 @@ def write_pcdcp_file(
     )
 
 
+def write_pcdcp_files(
+    starttime: UTCDateTime,
+    endtime: UTCDateTime,
+    timeseries: Stream,
+    observatory: str,
+    interval: str,
+    channels: List[str],
+    template: str = PCDCP_FILE_PATTERN,
+    temperatures=False,
+    max_workers: Optional[int] = None,
+):
+    """Write one PCDCP file per day, in parallel.
+
+    Each day is sliced from timeseries and written by a worker process,
+    see write_pcdcp_file for parameters.
+    """
+    days = get_intervals(starttime, endtime)
+    delta = timeseries[0].stats.delta if len(timeseries) else 0
+    arguments = [
+        dict(
+            starttime=day["start"],
+            endtime=day["end"],
+            timeseries=timeseries.slice(day["start"], day["end"] - delta),
+            observatory=observatory,
+            interval=interval,
+            channels=channels,
+            template=template,
+            temperatures=temperatures,
+        )
+        for day in days
+    ]
+    if max_workers == 1 or len(arguments) <= 1:
+        for kwargs in arguments:
+            write_pcdcp_file(**kwargs)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(write_pcdcp_file, **kwargs) for kwargs in arguments]
+        for future in futures:
+            # raise any errors
+            future.result()
+
+
+def read_timeseries(
+    factory: TimeseriesFactory,
+    starttime: UTCDateTime,
+    endtime: UTCDateTime,
+    delta: float,
+    read_interval: int = READ_INTERVAL,
+    **kwargs,
+) -> Stream:
+    """Read a long interval using a few large requests.
+
+    Parameters
+    ----------
+    factory: source of data.
+    starttime: time of first sample.
+    endtime: time of last sample.
+    delta: seconds between samples.
+    read_interval: seconds of data in each request.
+    kwargs: other arguments for factory.get_timeseries.
+
+    Returns
+    -------
+    merged data from all requests.
+    """
+    intervals = get_intervals(starttime, endtime, size=read_interval, align=False)
+    streams = [
+        factory.get_timeseries(
+            starttime=interval["start"],
+            # intervals are [start, end), except the last which includes endtime
+            endtime=(interval["end"] - delta if interval["end"] < endtime else endtime),
+            **kwargs,
+        )
+        for interval in intervals
+    ]
+    return merge_streams(*streams)
+
+
 def write_temperature_data(
     host: str,
     starttime: UTCDateTime,
     endtime: UTCDateTime,
     observatory: str,
     template: str = PCDCP_FILE_PATTERN,
+    factory: Optional[TimeseriesFactory] = None,
+    max_workers: Optional[int] = None,
 ) -> Stream:
     algorithm = FilterAlgorithm(input_sample_period=60.0, output_sample_period=3600.0)
-    factory = EdgeFactory(host=host)
+    factory = factory or EdgeFactory(host=host)
     # load minute temperature data
     f_starttime, f_endtime = algorithm.get_input_interval(starttime, endtime)
     print(
         f"Loading minute temperature data for {observatory} [{f_starttime}, {f_endtime}]",
         file=sys.stderr,
     )
-    timeseries_temp = factory.get_timeseries(
+    timeseries_temp = read_timeseries(
+        factory=factory,
         starttime=f_starttime,
         endtime=f_endtime,
+        delta=60.0,
         observatory=observatory,
         channels=["UK1", "UK2", "UK3", "UK4"],
         type="variation",
@@ -141,7 +232,7 @@ def write_temperature_data(
     )
     timeseries_temperature = algorithm.process(timeseries_temp)
     # write data
-    write_pcdcp_file(
+    write_pcdcp_files(
         starttime=starttime,
         endtime=endtime,
         timeseries=timeseries_temperature,
@@ -150,6 +241,7 @@ def write_temperature_data(
         channels=["UK1", "UK2", "UK3", "UK4"],
         template=template,
         temperatures=True,
+        max_workers=max_workers,
     )
 
 
@@ -160,18 +252,22 @@ def write_variation_data(
     observatory: str,
     second_template: str = PCDCP_FILE_PATTERN,
     minute_template: str = PCDCP_FILE_PATTERN,
+    factory: Optional[TimeseriesFactory] = None,
+    max_workers: Optional[int] = None,
 ):
     algorithm = FilterAlgorithm(input_sample_period=1.0, output_sample_period=60.0)
-    factory = EdgeFactory(host=host)
+    factory = factory or EdgeFactory(host=host)
     # load second data
     f_starttime, f_endtime = algorithm.get_input_interval(starttime, endtime)
     print(
         f"Loading second variation data for {observatory} [{f_starttime}, {f_endtime}]",
         file=sys.stderr,
     )
-    timeseries_second = factory.get_timeseries(
+    timeseries_second = read_timeseries(
+        factory=factory,
         starttime=f_starttime,
         endtime=f_endtime,
+        delta=1.0,
         observatory=observatory,
         channels=["H", "E", "Z", "F"],
         type="variation",
@@ -184,7 +280,7 @@ def write_variation_data(
     )
     timeseries_minute = algorithm.process(timeseries_second)
     # write files
-    write_pcdcp_file(
+    write_pcdcp_files(
         starttime=starttime,
         endtime=endtime,
         timeseries=timeseries_second.trim(starttime, endtime),
@@ -192,8 +288,9 @@ def write_variation_data(
         interval="second",
         channels=["H", "E", "Z", "F"],
         template=second_template,
+        max_workers=max_workers,
     )
-    write_pcdcp_file(
+    write_pcdcp_files(
         starttime=starttime,
         endtime=endtime,
         timeseries=timeseries_minute,
@@ -201,4 +298,5 @@ def write_variation_data(
         interval="minute",
         channels=["H", "E", "Z", "F"],
         template=minute_template,
+        max_workers=max_workers,
     )
@@ -2,6 +2,7 @@ from typing import List, Tuple
 from typing_extensions import Literal
 
 import numpy as np
+from obspy import UTCDateTime
 from pydantic import BaseModel
 
 from .Absolute import Absolute
@@ -16,6 +17,17 @@ from .Measurement import AverageMeasurement, Measurement, average_measurement
 from .Reading import Reading
 
 
+# measurement fields, in order of columns packed by _MeasurementArrays
+MEASUREMENT_FIELDS = ("angle", "residual", "time", "h", "e", "z", "f")
+# measurement types, in order of type indexes packed by _MeasurementArrays
+MEASUREMENT_TYPES = list(mt)
+_TYPE_INDEX = {t: i for i, t in enumerate(MEASUREMENT_TYPES)}
+_MEASUREMENT_DTYPE = np.dtype(
+    [("reading", np.int64), ("type", np.int64)]
+    + [(field, np.float64) for field in MEASUREMENT_FIELDS]
+)
+
+
 def calculate(reading: Reading, adjust_reference: bool = True) -> Reading:
     """Calculate absolutes and scale value using residual method.
 
@@ -67,6 +79,166 @@ def calculate(reading: Reading, adjust_reference: bool = True) -> Reading:
     return calculated
 
 
+def calculate_many(
+    readings: List[Reading], adjust_reference: bool = True
+) -> List[Reading]:
+    """Calculate absolutes and scale values for many readings at once.
+
+    Measurements from all readings are packed into arrays,
+    so each step of the calculation runs once for all readings.
+    Results are the same as calling calculate for each reading,
+    except readings without measurements needed for a value
+    have NaN values instead of raising an exception.
+
+    Parameters
+    -------
+    readings: readings to calculate absolutes from.
+    adjust_reference: adjust absolutes to first WEST_DOWN measurement.
+
+    Returns
+    -------
+    new reading objects with calculated absolutes and scale_value.
+    NOTE: rest of each reading object is shallow copy,
+        measurements are shared with the original reading.
+    """
+    if not readings:
+        return []
+    arrays = _MeasurementArrays(readings)
+    azimuth = np.array([r.azimuth for r in readings], dtype=np.float64)
+    hemisphere = np.array([r.hemisphere for r in readings], dtype=np.float64)
+    pier_correction = np.array([r.pier_correction for r in readings], dtype=np.float64)
+    # reference measurement, used to adjust absolutes
+    reference = arrays.first(mt.WEST_DOWN)
+    # calculate inclination, see calculate_I
+    mean_h, mean_e, mean_z, mean_f = [
+        arrays.average(field, INCLINATION_TYPES) for field in ("h", "e", "z", "f")
+    ]
+    angle, residual, h, e, z, f = [
+        arrays.type_averages(field, INCLINATION_TYPES)
+        for field in ("angle", "residual", "h", "e", "z", "f")
+    ]
+    residual[np.isnan(residual)] = 0.0
+    shift = np.array([t.shift for t in INCLINATION_TYPES])
+    meridian = np.array([t.meridian for t in INCLINATION_TYPES])
+    direction = np.array([t.direction for t in INCLINATION_TYPES])
+    inclination = arrays.average("angle", [mt.SOUTH_DOWN])
+    inclination[inclination >= 90] -= 180
+    # loop until inclination of each reading converges
+    active = np.flatnonzero(~np.isnan(inclination))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        while len(active):
+            last_inclination = inclination[active]
+            inclination_radians = np.radians(last_inclination)[:, np.newaxis]
+            f[active] = (
+                mean_f[active, np.newaxis]
+                + (h[active] - mean_h[active, np.newaxis]) * np.cos(inclination_radians)
+                + (z[active] - mean_z[active, np.newaxis]) * np.sin(inclination_radians)
+                + (e[active] ** 2 - mean_e[active, np.newaxis] ** 2)
+                / (2 * mean_f[active, np.newaxis])
+            )
+            inclination[active] = np.average(
+                shift
+                + meridian
+                * (
+                    angle[active]
+                    + direction
+                    * (
+                        hemisphere[active, np.newaxis]
+                        * np.degrees(np.arcsin(residual[active] / f[active]))
+                    )
+                ),
+                axis=1,
+            )
+            active = active[np.abs(last_inclination - inclination[active]) > 0.0001]
+        corrected_f = np.average(f, axis=1) + pier_correction
+        # calculate H and Z absolutes, see calculate_HZ_absolutes
+        inclination_radians = np.radians(inclination)
+        h_abs = corrected_f * np.cos(inclination_radians)
+        z_abs = corrected_f * np.sin(inclination_radians)
+        h_b = np.sqrt(h_abs ** 2 - mean_e ** 2) - mean_h
+        z_b = z_abs - mean_z
+        if adjust_reference:
+            h_abs = np.sqrt((h_b + reference["h"]) ** 2 + reference["e"] ** 2)
+            z_abs = z_b + reference["z"]
+        # calculate D absolute, see calculate_D_absolute
+        average_mark = arrays.average("angle", MARK_TYPES)
+        mark_up = arrays.average("angle", [mt.FIRST_MARK_UP])
+        mark_down = arrays.average("angle", [mt.FIRST_MARK_DOWN])
+        average_mark += np.where(mark_up < mark_down, 90, -90)
+        angle, residual, h, e = [
+            arrays.type_averages(field, DECLINATION_TYPES)
+            for field in ("angle", "residual", "h", "e")
+        ]
+        residual[np.isnan(residual)] = 0.0
+        meridian = np.array([t.meridian for t in DECLINATION_TYPES])
+        h = h + h_b[:, np.newaxis]
+        meridian = np.average(
+            angle
+            + np.degrees(meridian * np.arcsin(residual / np.sqrt(h ** 2 + e ** 2)))
+            - np.degrees(np.arctan(e / h)),
+            axis=1,
+        )
+        d_shift = np.where(azimuth > 180, -180, 0)
+        d_b = (meridian - average_mark) + azimuth + d_shift
+        if adjust_reference:
+            reference_h, reference_e = reference["h"], reference["e"]
+        else:
+            reference_h = arrays.average("h", DECLINATION_TYPES)
+            reference_e = arrays.average("e", DECLINATION_TYPES)
+        d_abs = d_b + np.degrees(np.arctan(reference_e / (reference_h + h_b)))
+        # calculate scale, see calculate_scale_value
+        m1 = arrays.first(mt.NORTH_DOWN_SCALE)
+        m2 = arrays.first(mt.NORTH_DOWN_SCALE, last=True)
+        field_change = np.degrees(
+            (
+                -np.sin(inclination_radians) * (m2["h"] - m1["h"])
+                + np.cos(inclination_radians) * (m2["z"] - m1["z"])
+            )
+            / corrected_f
+        ) + (m2["angle"] - m1["angle"])
+        scale_value = (
+            corrected_f * field_change / np.abs(m2["residual"] - m1["residual"])
+        )
+    has_scale = arrays.type_counts[:, _TYPE_INDEX[mt.NORTH_DOWN_SCALE]] > 0
+    d_starttime, d_endtime = arrays.times(DECLINATION_TYPES)
+    i_starttime, i_endtime = arrays.times(INCLINATION_TYPES)
+    # create new reading objects
+    calculated = []
+    for i, reading in enumerate(readings):
+        calculated.append(
+            reading.copy(
+                update={
+                    "absolutes": [
+                        Absolute(
+                            element="D",
+                            absolute=d_abs[i],
+                            baseline=d_b[i],
+                            shift=d_shift[i],
+                            starttime=d_starttime[i],
+                            endtime=d_endtime[i],
+                        ),
+                        Absolute(
+                            element="H",
+                            baseline=h_b[i],
+                            absolute=h_abs[i],
+                            starttime=i_starttime[i],
+                            endtime=i_endtime[i],
+                        ),
+                        Absolute(
+                            element="Z",
+                            baseline=z_b[i],
+                            absolute=z_abs[i],
+                            starttime=i_starttime[i],
+                            endtime=i_endtime[i],
+                        ),
+                    ],
+                    "scale_value": scale_value[i] if has_scale[i] else None,
+                }
+            )
+        )
+    return calculated
+
+
 def calculate_D_absolute(
     measurements: List[Measurement],
     azimuth: float,
@@ -269,3 +441,104 @@ def calculate_scale_value(
     residual_change = m2.residual - m1.residual
     scale_value = corrected_f * field_change / np.abs(residual_change)
     return scale_value
+
+
+class _MeasurementArrays(object):
+    """Measurements from many readings, packed into arrays.
+
+    Averages follow average_measurement, where missing and zero values
+    are ignored, and use sums and counts indexed by
+    [reading, MEASUREMENT_TYPES index].
+
+    Parameters
+    ----------
+    readings: readings to pack.
+    """
+
+    def __init__(self, readings: List[Reading]):
+        self.count = len(readings)
+        self.measurements = np.array(
+            [
+                (
+                    i,
+                    _TYPE_INDEX[m.measurement_type],
+                    m.angle,
+                    m.residual,
+                    m.time and m.time.timestamp,
+                    m.h,
+                    m.e,
+                    m.z,
+                    m.f,
+                )
+                for i, reading in enumerate(readings)
+                for m in reading.measurements
+            ],
+            dtype=_MEASUREMENT_DTYPE,
+        )
+        shape = (self.count, len(MEASUREMENT_TYPES))
+        index = (self.measurements["reading"], self.measurements["type"])
+        self.type_counts = np.zeros(shape, dtype=np.int64)
+        np.add.at(self.type_counts, index, 1)
+        self.sums = {}
+        self.counts = {}
+        for field in MEASUREMENT_FIELDS:
+            values = self.measurements[field]
+            valid = ~np.isnan(values) & (values != 0)
+            valid_index = (index[0][valid], index[1][valid])
+            self.sums[field] = np.zeros(shape)
+            np.add.at(self.sums[field], valid_index, values[valid])
+            self.counts[field] = np.zeros(shape)
+            np.add.at(self.counts[field], valid_index, 1)
+        self.starttimes = np.full(shape, np.nan)
+        np.fmin.at(self.starttimes, index, self.measurements["time"])
+        self.endtimes = np.full(shape, np.nan)
+        np.fmax.at(self.endtimes, index, self.measurements["time"])
+
+    def average(self, field: str, types: List[mt]) -> np.ndarray:
+        """Average of field across measurements of types, for each reading."""
+        columns = [_TYPE_INDEX[t] for t in types]
+        return self._divide(
+            self.sums[field][:, columns].sum(axis=1),
+            self.counts[field][:, columns].sum(axis=1),
+        )
+
+    def type_averages(self, field: str, types: List[mt]) -> np.ndarray:
+        """Average of field within each type, for each reading."""
+        columns = [_TYPE_INDEX[t] for t in types]
+        return self._divide(
+            self.sums[field][:, columns], self.counts[field][:, columns]
+        )
+
+    def first(self, measurement_type: mt, last: bool = False) -> np.ndarray:
+        """First (or last) measurement of type, for each reading.
+
+        Readings without a measurement of type have NaN values.
+        """
+        measurements = self.measurements[
+            self.measurements["type"] == _TYPE_INDEX[measurement_type]
+        ]
+        if last:
+            measurements = measurements[::-1]
+        readings, index = np.unique(measurements["reading"], return_index=True)
+        result = np.zeros(self.count, dtype=_MEASUREMENT_DTYPE)
+        for field in MEASUREMENT_FIELDS:
+            result[field] = np.nan
+        result[readings] = measurements[index]
+        return result
+
+    def times(self, types: List[mt]) -> Tuple[List, List]:
+        """Time of first and last measurement of types, for each reading."""
+        columns = [_TYPE_INDEX[t] for t in types]
+        with np.errstate(invalid="ignore"):
+            starttimes = np.fmin.reduce(self.starttimes[:, columns], axis=1)
+            endtimes = np.fmax.reduce(self.endtimes[:, columns], axis=1)
+        return (
+            [None if np.isnan(t) else UTCDateTime(t) for t in starttimes],
+            [None if np.isnan(t) else UTCDateTime(t) for t in endtimes],
+        )
+
+    def _divide(self, sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averages = sums / counts
+        averages[averages == 0] = np.nan
+        return averages
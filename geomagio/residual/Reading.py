@@ -12,6 +12,9 @@ from .Measurement import AverageMeasurement, Measurement, average_measurement
 from .MeasurementType import MeasurementType
 
 
+ORDINATE_CHANNELS = ("H", "E", "Z", "F")
+
+
 class Reading(BaseModel):
     """A collection of absolute measurements.
 
@@ -55,16 +58,12 @@ class Reading(BaseModel):
         timeseries_factory: source of data.
         default_existing: keep existing values if data not found.
         """
-        mean = average_measurement(self.measurements)
-        data = timeseries_factory.get_timeseries(
+        load_ordinates(
+            readings=[self],
             observatory=observatory,
-            channels=("H", "E", "Z", "F"),
-            interval="second",
-            type="variation",
-            starttime=mean.time,
-            endtime=mean.endtime,
+            timeseries_factory=timeseries_factory,
+            default_existing=default_existing,
         )
-        self.update_measurement_ordinates(data, default_existing)
 
     def update_measurement_ordinates(self, data: Stream, default_existing: bool = True):
         """Update ordinates.
@@ -74,26 +73,66 @@ class Reading(BaseModel):
         data: source of data.
         default_existing: keep existing values if data not found.
         """
-        for measurement in self.measurements:
-            if not measurement.time:
-                continue
-            measurement.h = TimeseriesUtility.get_trace_value(
-                traces=data.select(channel="H"),
-                time=measurement.time,
-                default=default_existing and measurement.h or None,
-            )
-            measurement.e = TimeseriesUtility.get_trace_value(
-                traces=data.select(channel="E"),
-                time=measurement.time,
-                default=default_existing and measurement.e or None,
-            )
-            measurement.z = TimeseriesUtility.get_trace_value(
-                traces=data.select(channel="Z"),
-                time=measurement.time,
-                default=default_existing and measurement.z or None,
-            )
-            measurement.f = TimeseriesUtility.get_trace_value(
-                traces=data.select(channel="F"),
-                time=measurement.time,
-                default=default_existing and measurement.f or None,
+        measurements = [m for m in self.measurements if m.time]
+        times = [m.time for m in measurements]
+        for channel in ORDINATE_CHANNELS:
+            element = channel.lower()
+            values = TimeseriesUtility.get_trace_values(
+                traces=data.select(channel=channel),
+                times=times,
+                defaults=[
+                    default_existing and getattr(m, element) or None
+                    for m in measurements
+                ],
             )
+            for measurement, value in zip(measurements, values):
+                setattr(measurement, element, value)
+
+
+def load_ordinates(
+    readings: List[Reading],
+    observatory: str,
+    timeseries_factory: TimeseriesFactory,
+    default_existing: bool = True,
+    max_gap: float = 3600,
+):
+    """Load ordinates for many readings from a timeseries factory.
+
+    Reading time windows that are less than max_gap seconds apart are
+    merged, so data is requested once per merged window instead of
+    once per reading.
+
+    Parameters
+    ----------
+    readings: readings to update.
+    observatory: the observatory to load.
+    timeseries_factory: source of data.
+    default_existing: keep existing values if data not found.
+    max_gap: merge windows separated by at most this many seconds.
+    """
+    windows = []
+    for reading in readings:
+        mean = average_measurement(reading.measurements)
+        if mean is None or mean.time is None:
+            continue
+        windows.append((mean.time, mean.endtime, reading))
+    windows.sort(key=lambda window: window[0])
+    groups = []
+    for starttime, endtime, reading in windows:
+        if groups and starttime - groups[-1][1] <= max_gap:
+            group = groups[-1]
+            group[1] = max(group[1], endtime)
+            group[2].append(reading)
+        else:
+            groups.append([starttime, endtime, [reading]])
+    for starttime, endtime, group in groups:
+        data = timeseries_factory.get_timeseries(
+            observatory=observatory,
+            channels=ORDINATE_CHANNELS,
+            interval="second",
+            type="variation",
+            starttime=starttime,
+            endtime=endtime,
+        )
+        for reading in group:
+            reading.update_measurement_ordinates(data, default_existing)
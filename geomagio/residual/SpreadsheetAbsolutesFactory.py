@@ -1,5 +1,8 @@
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
 import os
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import numpy
 from obspy.core import UTCDateTime
@@ -234,10 +237,22 @@ class SpreadsheetAbsolutesFactory(object):
     base_directory: directory where spreadsheets exist.
         Assumed structure is base/OBS/YEAR/OBS/*.xlsm
         Where each xlsm file is named OBS-YEARJULHHMM.xlsm
+    cache_directory: directory where parsed readings are cached, optional.
+        Cached readings are used until the spreadsheet path,
+        modification time, or size changes.
+    max_workers: number of processes used to parse spreadsheets.
+        default is number of CPUs, 1 parses in the calling process.
     """
 
-    def __init__(self, base_directory="/Volumes/geomag/pub/observatories"):
+    def __init__(
+        self,
+        base_directory="/Volumes/geomag/pub/observatories",
+        cache_directory: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ):
         self.base_directory = base_directory
+        self.cache_directory = cache_directory
+        self.max_workers = max_workers or os.cpu_count() or 1
 
     def get_readings(
         self,
@@ -247,7 +262,7 @@ class SpreadsheetAbsolutesFactory(object):
         include_measurements: bool = True,
     ) -> List[Reading]:
         """Read spreadsheet files between starttime/endtime."""
-        readings = []
+        paths = []
         start_filename = f"{observatory}-{starttime.datetime:%Y%j%H%M}.xlsm"
         end_filename = f"{observatory}-{endtime.datetime:%Y%j%H%M}.xlsm"
         for year in range(starttime.year, endtime.year + 1):
@@ -258,9 +273,46 @@ class SpreadsheetAbsolutesFactory(object):
             for (dirpath, _, filenames) in os.walk(observatory_directory):
                 for filename in filenames:
                     if start_filename <= filename < end_filename:
-                        readings.append(
-                            self.parse_spreadsheet(os.path.join(dirpath, filename))
-                        )
+                        paths.append(os.path.join(dirpath, filename))
+        return self.parse_spreadsheets(paths, include_measurements)
+
+    def parse_spreadsheets(
+        self, paths: List[str], include_measurements=True
+    ) -> List[Reading]:
+        """Parse many residual spreadsheet files.
+
+        Cached readings are used when available,
+        other files are parsed by a pool of processes and then cached.
+
+        Returns
+        -------
+        readings in the same order as paths.
+        """
+        readings = [self._read_cache(path, include_measurements) for path in paths]
+        parse_paths = [path for path, r in zip(paths, readings) if r is None]
+        if not parse_paths:
+            return readings
+        if self.max_workers == 1 or len(parse_paths) == 1:
+            parsed = [
+                _parse_spreadsheet_json(path, include_measurements)
+                for path in parse_paths
+            ]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(parse_paths))
+            ) as executor:
+                parsed = list(
+                    executor.map(
+                        _parse_spreadsheet_json,
+                        parse_paths,
+                        [include_measurements] * len(parse_paths),
+                    )
+                )
+        parsed = dict(zip(parse_paths, parsed))
+        for i, path in enumerate(paths):
+            if readings[i] is None:
+                self._write_cache(path, include_measurements, parsed[path])
+                readings[i] = Reading.parse_raw(parsed[path])
         return readings
 
     def parse_spreadsheet(self, path: str, include_measurements=True) -> Reading:
@@ -399,6 +451,71 @@ class SpreadsheetAbsolutesFactory(object):
             "precision": measurement_sheet["H8"].value,
         }
 
+    def _get_cache_key(self, path: str, include_measurements: bool) -> Dict:
+        """Values that identify one version of a parsed spreadsheet."""
+        stat = os.stat(path)
+        return {
+            "path": os.path.abspath(path),
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "include_measurements": include_measurements,
+        }
+
+    def _get_cache_path(self, path: str, include_measurements: bool) -> str:
+        """Path of cache file for one spreadsheet."""
+        name = f"{os.path.abspath(path)}:{include_measurements}"
+        return os.path.join(
+            self.cache_directory,
+            hashlib.sha1(name.encode("utf8")).hexdigest() + ".json",
+        )
+
+    def _read_cache(self, path: str, include_measurements: bool) -> Optional[Reading]:
+        """Read a cached reading.
+
+        Returns
+        -------
+        cached reading, or None if not cached or spreadsheet changed.
+        """
+        if not self.cache_directory:
+            return None
+        try:
+            with open(self._get_cache_path(path, include_measurements)) as f:
+                cached = json.load(f)
+            if cached["key"] != self._get_cache_key(path, include_measurements):
+                return None
+            return Reading.parse_obj(cached["reading"])
+        except Exception:
+            # missing or invalid cache file
+            return None
+
+    def _write_cache(self, path: str, include_measurements: bool, reading: str):
+        """Cache reading json for a spreadsheet."""
+        if not self.cache_directory:
+            return
+        os.makedirs(self.cache_directory, exist_ok=True)
+        cache_path = self._get_cache_path(path, include_measurements)
+        # write to temporary file and rename, so readers never see partial files
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(
+                '{"key": %s, "reading": %s}'
+                % (json.dumps(self._get_cache_key(path, include_measurements)), reading)
+            )
+        os.replace(temp_path, cache_path)
+
+
+def _parse_spreadsheet_json(path: str, include_measurements: bool) -> str:
+    """Parse a spreadsheet in a worker process.
+
+    Returns
+    -------
+    reading json, which is smaller to send between processes than a Reading.
+    """
+    reading = SpreadsheetAbsolutesFactory().parse_spreadsheet(
+        path=path, include_measurements=include_measurements
+    )
+    return reading.json()
+
 
 def convert_precision(angle, precision="DMS"):
     """
@@ -1,7 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
+import codecs
 import json
-import urllib
-from typing import Dict, IO, List, Mapping
+import os
+import re
+from typing import Dict, Iterable, IO, List, Mapping, Optional, Union
 
+import httpx
 from obspy.core import UTCDateTime
 
 from .Absolute import Absolute
@@ -10,13 +14,44 @@ from .MeasurementType import MeasurementType
 from .Reading import Reading
 
 
+# start of "data" array in web absolutes json
+DATA_ARRAY = re.compile(r'"data"\s*:\s*\[')
+
+
 class WebAbsolutesFactory(object):
-    """Read absolutes from web absolutes service."""
+    """Read absolutes from web absolutes service.
+
+    Large time ranges are split into windows of request_interval seconds,
+    which are requested at the same time using one pooled http client.
+    Windows are aligned to multiples of request_interval, so windows that
+    ended more than review_interval seconds ago can be cached and reused by
+    later requests.
+
+    Parameters
+    ----------
+    url: web absolutes service url.
+    cache_directory: directory where readings are cached, optional.
+    request_interval: seconds of observations in each request.
+    review_interval: seconds after which readings are no longer changed.
+    max_workers: maximum number of requests at the same time.
+    timeout: seconds to wait for each request.
+    """
 
     def __init__(
-        self, url: str = "https://geomag.usgs.gov/baselines/observation.json.php"
+        self,
+        url: str = "https://geomag.usgs.gov/baselines/observation.json.php",
+        cache_directory: Optional[str] = None,
+        request_interval: int = 30 * 86400,
+        review_interval: int = 90 * 86400,
+        max_workers: int = 4,
+        timeout: float = 60,
     ):
         self.url = url
+        self.cache_directory = cache_directory
+        self.request_interval = request_interval
+        self.review_interval = review_interval
+        self.max_workers = max_workers
+        self.timeout = timeout
 
     def get_readings(
         self,
@@ -25,27 +60,122 @@ class WebAbsolutesFactory(object):
         endtime: UTCDateTime,
         include_measurements: bool = True,
     ) -> List[Reading]:
-        """Get readings from the Web Absolutes Service."""
-        args = urllib.parse.urlencode(
-            {
-                "observatory": observatory,
-                "starttime": starttime.isoformat(),
-                "endtime": endtime.isoformat(),
-                "includemeasurements": include_measurements and "true" or "false",
-            }
-        )
-        with urllib.request.urlopen(f"{self.url}?{args}") as data:
-            return self.parse_json(data)
+        """Get readings from the Web Absolutes Service.
+
+        Returns
+        -------
+        readings with observation time between starttime and endtime.
+        """
+        windows = self._get_windows(starttime, endtime)
+        with httpx.Client(timeout=self.timeout) as client:
+            if len(windows) == 1 or self.max_workers == 1:
+                results = [
+                    self._get_window_readings(
+                        client, observatory, start, end, include_measurements
+                    )
+                    for start, end in windows
+                ]
+            else:
+                with ThreadPoolExecutor(
+                    max_workers=min(self.max_workers, len(windows))
+                ) as executor:
+                    results = list(
+                        executor.map(
+                            lambda window: self._get_window_readings(
+                                client, observatory, *window, include_measurements
+                            ),
+                            windows,
+                        )
+                    )
+        return [
+            reading
+            for readings in results
+            for reading in readings
+            if _in_range(reading, starttime, endtime)
+        ]
 
-    def parse_json(self, jsonstr: IO[str]) -> List[Reading]:
+    def parse_json(self, jsonstr: IO[Union[bytes, str]]) -> List[Reading]:
         """Parse readings from the web absolutes JSON format."""
-        readings = []
-        response = json.load(jsonstr)
-        for data in response["data"]:
+        return list(self.parse_json_chunks(iter(lambda: jsonstr.read(65536), None)))
+
+    def parse_json_chunks(
+        self, chunks: Iterable[Union[bytes, str]]
+    ) -> Iterable[Reading]:
+        """Parse readings from the web absolutes JSON format, as it is read.
+
+        Parameters
+        ----------
+        chunks: parts of json response, in order.
+            iteration stops at the first empty chunk.
+
+        Returns
+        -------
+        generator of readings, as each observation is parsed.
+        """
+        for data in _iter_json_array(chunks, DATA_ARRAY):
             metadata = self._parse_metadata(data)
-            readings.extend(
-                [self._parse_reading(metadata, r) for r in data["readings"]]
+            for r in data["readings"]:
+                yield self._parse_reading(metadata, r)
+
+    def _get_windows(self, starttime: UTCDateTime, endtime: UTCDateTime) -> List:
+        """Split a time range into windows aligned to request_interval."""
+        interval = self.request_interval
+        start = int(starttime.timestamp // interval) * interval
+        windows = []
+        while start <= endtime.timestamp:
+            windows.append((UTCDateTime(start), UTCDateTime(start + interval)))
+            start += interval
+        return windows
+
+    def _get_window_readings(
+        self,
+        client: httpx.Client,
+        observatory: str,
+        starttime: UTCDateTime,
+        endtime: UTCDateTime,
+        include_measurements: bool,
+    ) -> List[Reading]:
+        """Get readings for one window, using cache when reviewed."""
+        cache_path = None
+        if self.cache_directory and endtime < UTCDateTime.now() - self.review_interval:
+            cache_path = os.path.join(
+                self.cache_directory,
+                observatory,
+                "{}_{}_{}.json".format(
+                    starttime.strftime("%Y%m%dT%H%M%S"),
+                    endtime.strftime("%Y%m%dT%H%M%S"),
+                    include_measurements and "measurements" or "absolutes",
+                ),
             )
+            try:
+                with open(cache_path) as f:
+                    return [Reading.parse_obj(r) for r in json.load(f)]
+            except (OSError, ValueError):
+                # not cached yet
+                pass
+        with client.stream(
+            "GET",
+            self.url,
+            params={
+                "observatory": observatory,
+                "starttime": starttime.isoformat(),
+                "endtime": endtime.isoformat(),
+                "includemeasurements": include_measurements and "true" or "false",
+            },
+        ) as response:
+            response.raise_for_status()
+            readings = [
+                reading
+                for reading in self.parse_json_chunks(response.iter_bytes())
+                # windows share endpoints, each observation belongs to one
+                if not _in_range(reading, endtime, endtime)
+            ]
+        if cache_path:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            temp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as f:
+                f.write("[" + ",".join(r.json() for r in readings) + "]")
+            os.replace(temp_path, cache_path)
         return readings
 
     def _parse_absolute(self, element: str, data: Mapping) -> Absolute:
@@ -107,3 +237,67 @@ class WebAbsolutesFactory(object):
                 "pier_correction" in metadata and metadata["pier_correction"] or 0
             ),
         )
+
+
+def _in_range(reading: Reading, starttime: UTCDateTime, endtime: UTCDateTime) -> bool:
+    """Whether observation time of reading is between starttime and endtime.
+
+    Readings without a parseable observation time are included.
+    """
+    try:
+        time = UTCDateTime(reading.metadata["time"])
+    except Exception:
+        return True
+    return starttime <= time <= endtime
+
+
+def _iter_json_array(chunks: Iterable[Union[bytes, str]], start: re.Pattern):
+    """Parse elements of a json array, as chunks are read.
+
+    Parameters
+    ----------
+    chunks: parts of json document, in order.
+    start: pattern that matches the start of the array.
+
+    Returns
+    -------
+    generator of parsed array elements.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf8")()
+    chunks = iter(chunks)
+    buffer = ""
+    position = None
+    done = False
+    while True:
+        if not done:
+            chunk = next(chunks, "")
+            if not chunk:
+                done = True
+            elif isinstance(chunk, bytes):
+                buffer += text_decoder.decode(chunk)
+            else:
+                buffer += chunk
+        if position is None:
+            match = start.search(buffer)
+            if not match:
+                if done:
+                    raise ValueError("array not found")
+                continue
+            position = match.end()
+        while True:
+            # skip whitespace and separators between elements
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position < len(buffer) and buffer[position] == "]":
+                return
+            try:
+                element, position = decoder.raw_decode(buffer, position)
+            except ValueError:
+                if done:
+                    raise
+                break
+            yield element
+        # discard parsed elements
+        buffer = buffer[position:]
+        position = 0
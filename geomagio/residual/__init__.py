@@ -8,6 +8,7 @@ from .Calculation import (
     calculate_D_absolute,
     calculate_HZ_absolutes,
     calculate_I,
+    calculate_many,
     calculate_scale_value,
 )
 from .CalFileFactory import CalFileFactory
@@ -18,7 +19,7 @@ from .MeasurementType import (
     INCLINATION_TYPES,
     MARK_TYPES,
 )
-from .Reading import Reading
+from .Reading import Reading, load_ordinates
 from .SpreadsheetAbsolutesFactory import SpreadsheetAbsolutesFactory
 from .WebAbsolutesFactory import WebAbsolutesFactory
 
@@ -31,9 +32,11 @@ __all__ = [
     "calculate_D_absolute",
     "calculate_HZ_absolutes",
     "calculate_I",
+    "calculate_many",
     "calculate_scale_value",
     "DECLINATION_TYPES",
     "INCLINATION_TYPES",
+    "load_ordinates",
     "MARK_TYPES",
     "Measurement",
     "MeasurementType",
@@ -1,12 +1,15 @@
 #! /usr/bin/env python
-from geomagio import Controller, TimeseriesFactory
+from geomagio import Controller, Metrics, TimeseriesFactory
 from geomagio.algorithm import Algorithm
 
 # needed to read outputs generated by Controller and test data
 from geomagio.iaga2002 import IAGA2002Factory
 
 # needed to emulate geomag.py script
-from geomagio.Controller import _main, parse_args
+from geomagio.Controller import _main, get_daemon_job, get_job_graph, parse_args
+
+# needed to capture daemon job logs
+from io import StringIO
 
 # needed to copy SqDistAlgorithm statefile
 from shutil import copy
@@ -16,6 +19,7 @@ from tempfile import gettempdir
 
 from numpy.testing import assert_allclose, assert_equal
 from obspy.core import UTCDateTime
+import pytest
 
 
 def test_controller():
@@ -211,3 +215,243 @@ def test_controller_update_sqdist():
     )
     expected = expected_factory.get_timeseries(starttime=starttime1, endtime=endtime6)
     assert_allclose(actual, expected)
+
+
+def test_controller_run_pipelined():
+    """Controller_test.test_controller_run_pipelined().
+
+    Process a day in hourly chunks and compare to a single run.
+    """
+    tmp_dir = gettempdir()
+    fake_argv = [
+        "--input",
+        "iaga2002",
+        "--input-url",
+        "file://etc/controller/{obs}{date:%Y%m%d}_XYZF_{t}{i}.{i}",
+        "--observatory",
+        "BOU",
+        "--inchannels",
+        "X",
+        "Y",
+        "Z",
+        "F",
+        "--interval",
+        "minute",
+        "--starttime",
+        "2018-10-24T00:00:00Z",
+        "--endtime",
+        "2018-10-24T23:59:00Z",
+        "--output",
+        "iaga2002",
+        "--output-url",
+        "file://" + tmp_dir + "/{obs}{date:%Y%m%d}_pipelined_{t}{i}.{i}",
+        "--pipeline-chunk-size",
+        "3600",
+        "--pipeline-queue-depth",
+        "2",
+    ]
+    args = parse_args(fake_argv)
+    args.observatory = ("BOU",)
+    args.output_observatory = ("BOU",)
+    input_factory = IAGA2002Factory(
+        urlTemplate="file://etc/controller/{obs}{date:%Y%m%d}_XYZF_{t}{i}.{i}",
+        urlInterval=86400,
+        observatory="BOU",
+        channels=["X", "Y", "Z", "F"],
+    )
+    output_factory = IAGA2002Factory(
+        urlTemplate="file://" + tmp_dir + "/{obs}{date:%Y%m%d}_pipelined_{t}{i}.{i}",
+        urlInterval=86400,
+        observatory="BOU",
+        channels=["X", "Y", "Z", "F"],
+    )
+    controller = Controller(input_factory, output_factory, Algorithm())
+    pipeline = controller.run_pipelined(args, chunk_size=3600, queue_depth=2)
+    assert_equal([m["count"] for m in pipeline.get_metrics()], [24, 24, 24])
+    expected = input_factory.get_timeseries(
+        starttime=args.starttime, endtime=args.endtime
+    )
+    actual = output_factory.get_timeseries(
+        starttime=args.starttime, endtime=args.endtime
+    )
+    for channel in ["X", "Y", "Z", "F"]:
+        assert_allclose(
+            actual.select(channel=channel)[0].data,
+            expected.select(channel=channel)[0].data,
+        )
+
+
+def test_get_daemon_job(monkeypatch):
+    """Controller_test.test_get_daemon_job().
+
+    Daemon jobs reuse factories and algorithms between runs,
+    and stateful algorithms save state using the job checkpoint.
+    """
+    tmp_dir = gettempdir()
+    arguments = [
+        "--input",
+        "iaga2002",
+        "--input-url",
+        "file://etc/controller/{obs}{date:%Y%m%d}_XYZF_{t}{i}.{i}",
+        "--observatory",
+        "BOU",
+        "--inchannels",
+        "X",
+        "Y",
+        "Z",
+        "F",
+        "--interval",
+        "minute",
+        "--starttime",
+        "2018-10-24T00:00:00Z",
+        "--endtime",
+        "2018-10-24T00:59:00Z",
+        "--output",
+        "iaga2002",
+        "--output-url",
+        "file://" + tmp_dir + "/{obs}{date:%Y%m%d}_daemon_{t}{i}.{i}",
+    ]
+    # daemon arguments do not require input and output arguments
+    assert_equal(parse_args(["--daemon", "jobs.json"]).daemon, "jobs.json")
+    assert_equal(parse_args(["--daemon=jobs.json"]).daemon, "jobs.json")
+    args_file = tmp_dir + "/daemon.args"
+    with open(args_file, "w") as f:
+        f.write("--daemon\njobs.json\n")
+    assert_equal(parse_args(["@" + args_file]).daemon, "jobs.json")
+    # other commands still require input and output arguments
+    with pytest.raises(SystemExit):
+        parse_args(["--input", "edge", "--output", "iaga2002"])
+    job = get_daemon_job(name="BOU", arguments=arguments, interval=60, jitter=5)
+    assert_equal(job.checkpoint, None)
+    job.run(out=StringIO())
+    assert_equal(job.get_metrics()["count"], 1)
+    assert_equal(job.get_metrics()["errors"], 0)
+    output_factory = IAGA2002Factory(
+        urlTemplate="file://" + tmp_dir + "/{obs}{date:%Y%m%d}_daemon_{t}{i}.{i}",
+        urlInterval=86400,
+        observatory="BOU",
+        channels=["X"],
+    )
+    actual = output_factory.get_timeseries(
+        starttime=UTCDateTime("2018-10-24T00:00:00Z"),
+        endtime=UTCDateTime("2018-10-24T00:59:00Z"),
+    )
+    assert_equal(actual[0].stats.npts, 60)
+    # stateful algorithms are checkpointed by the daemon
+    job = get_daemon_job(
+        name="BOU sqdist",
+        arguments=arguments
+        + [
+            "--algorithm",
+            "sqdist",
+            "--sqdist-statefile",
+            tmp_dir + "/sqdist_daemon_state.json",
+        ],
+    )
+    assert_equal(job.checkpoint.__self__.autosave, False)
+    # update runs change start and end times, later runs use the job times
+    runs = []
+
+    def run_as_update(self, options, update_count=0):
+        runs.append((options.starttime, options.endtime))
+        options.starttime -= 3600
+        options.endtime -= 3600
+
+    monkeypatch.setattr(Controller, "run_as_update", run_as_update)
+    job = get_daemon_job(name="BOU update", arguments=arguments + ["--update"])
+    job.run(out=StringIO())
+    job.run(out=StringIO())
+    assert_equal(runs[0], runs[1])
+    assert_equal(runs[0][0], UTCDateTime("2018-10-24T00:00:00Z"))
+
+
+def test_get_job_graph():
+    """Controller_test.test_get_job_graph().
+
+    Inputs are read once for all jobs that use them,
+    and jobs can read the output of other jobs.
+    """
+    tmp_dir = gettempdir()
+    output_url = "file://" + tmp_dir + "/{obs}{date:%Y%m%d}_graph_{t}{i}.{i}"
+    config = {
+        "arguments": [
+            "--observatory",
+            "BOU",
+            "--interval",
+            "minute",
+            "--starttime",
+            "2018-10-24T00:00:00Z",
+            "--endtime",
+            "2018-10-24T00:59:00Z",
+        ],
+        "inputs": {
+            "variation": [
+                "--input",
+                "iaga2002",
+                "--input-url",
+                "file://etc/controller/{obs}{date:%Y%m%d}_XYZF_{t}{i}.{i}",
+            ]
+        },
+        "jobs": {
+            "xy": {
+                "input": "variation",
+                "arguments": [
+                    "--inchannels",
+                    "X",
+                    "Y",
+                    "--output",
+                    "iaga2002",
+                    "--output-url",
+                    output_url.replace("graph", "graph_xy"),
+                ],
+            },
+            "zf": {
+                "input": "variation",
+                "arguments": [
+                    "--inchannels",
+                    "Z",
+                    "F",
+                    "--output",
+                    "iaga2002",
+                    "--output-url",
+                    output_url.replace("graph", "graph_zf"),
+                ],
+            },
+            "x": {
+                "input": "xy",
+                "arguments": [
+                    "--inchannels",
+                    "X",
+                    "--rename-output-channel",
+                    "X",
+                    "H",
+                    "--outchannels",
+                    "H",
+                    "--output",
+                    "iaga2002",
+                    "--output-url",
+                    output_url.replace("graph", "graph_x"),
+                ],
+            },
+        },
+    }
+    # job graph arguments do not require input and output arguments
+    assert_equal(parse_args(["--job-graph", "graph.json"]).job_graph, "graph.json")
+    assert_equal(parse_args(["--job-graph=graph.json"]).job_graph, "graph.json")
+    graph = get_job_graph(config)
+    assert_equal(sorted(graph.nodes), ["variation", "x", "xy", "zf"])
+    reads = []
+    recorder = Metrics.MetricsRecorder()
+    recorder.record = lambda name, elapsed, **fields: reads.append(name)
+    Metrics.set_recorder(recorder)
+    try:
+        results = graph.run()
+    finally:
+        Metrics.set_recorder(None)
+    # one read of the input factory, for all channels
+    assert_equal(reads.count("get_timeseries"), 1)
+    assert_equal(len(results["variation"]), 4)
+    assert_equal([t.stats.channel for t in results["xy"]], ["X", "Y"])
+    assert_equal([t.stats.channel for t in results["zf"]], ["Z", "F"])
+    assert_equal([t.stats.channel for t in results["x"]], ["H"])
+    assert_allclose(results["x"][0].data, results["variation"][0].data)
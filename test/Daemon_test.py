@@ -0,0 +1,69 @@
+#! /usr/bin/env python
+from io import StringIO
+import threading
+import time
+
+from geomagio.Daemon import Daemon, DaemonJob
+
+from numpy.testing import assert_equal
+
+
+def test_daemon_job_schedule():
+    """Daemon_test.test_daemon_job_schedule()
+
+    runs are aligned to multiples of interval, and delayed by jitter.
+    """
+    job = DaemonJob("job", lambda: None, interval=60, jitter=10)
+    for _ in range(10):
+        job.schedule(125)
+        assert_equal(180 <= job.next_time < 190, True)
+    job = DaemonJob("job", lambda: None, interval=60)
+    job.schedule(180)
+    assert_equal(job.next_time, 240)
+
+
+def test_daemon_job_run():
+    """Daemon_test.test_daemon_job_run()
+
+    exceptions are counted and logged, and only changed state is saved.
+    """
+    checkpoints = []
+
+    def fail():
+        raise Exception("test failure")
+
+    out = StringIO()
+    job = DaemonJob("fail", fail, checkpoint=lambda: checkpoints.append(1))
+    assert_equal(job.save_checkpoint(), False)
+    job.run(out=out)
+    assert_equal(job.get_metrics()["count"], 1)
+    assert_equal(job.get_metrics()["errors"], 1)
+    assert_equal("job fail failed (test failure)" in out.getvalue(), True)
+    assert_equal(job.save_checkpoint(), True)
+    assert_equal(job.save_checkpoint(), False)
+    assert_equal(len(checkpoints), 1)
+
+
+def test_daemon_run():
+    """Daemon_test.test_daemon_run()
+
+    jobs run on their cadence, a slow job is skipped instead of overlapping,
+    and jobs are checkpointed when the daemon stops.
+    """
+    checkpoints = []
+    fast = DaemonJob(
+        "fast",
+        lambda: None,
+        interval=0.05,
+        checkpoint=lambda: checkpoints.append("fast"),
+    )
+    slow = DaemonJob("slow", lambda: time.sleep(0.12), interval=0.05)
+    daemon = Daemon([fast, slow], checkpoint_interval=60, out=StringIO())
+    threading.Timer(0.5, daemon.stop).start()
+    daemon.run(duration=5)
+    assert_equal(fast.count >= 5, True)
+    assert_equal(fast.skipped, 0)
+    assert_equal(slow.count >= 1, True)
+    assert_equal(slow.skipped >= 1, True)
+    assert_equal(slow.running, False)
+    assert_equal(checkpoints, ["fast"])
@@ -0,0 +1,53 @@
+#! /usr/bin/env python
+import threading
+
+from geomagio.JobGraph import JobGraph
+
+from numpy.testing import assert_equal
+import pytest
+
+
+def test_job_graph_run():
+    """JobGraph_test.test_job_graph_run()
+
+    results are passed to dependent jobs, and independent jobs run at the
+    same time.
+    """
+    # both branches must be running before either can complete
+    barrier = threading.Barrier(2, timeout=5)
+
+    def branch(value, offset):
+        barrier.wait()
+        return value + offset
+
+    graph = JobGraph()
+    graph.add("input", lambda: 1)
+    graph.add("a", lambda x: branch(x, 10), dependencies=["input"])
+    graph.add("b", lambda x: branch(x, 20), dependencies=["input"])
+    graph.add("sum", lambda a, b: a + b, dependencies=["a", "b"])
+    results = graph.run()
+    assert_equal(results, {"input": 1, "a": 11, "b": 21, "sum": 32})
+    assert_equal([m["error"] for m in graph.get_metrics()], [None] * 4)
+
+
+def test_job_graph_exception():
+    """JobGraph_test.test_job_graph_exception()
+
+    independent jobs complete, and the first exception is raised.
+    """
+    completed = []
+
+    def fail():
+        raise Exception("test failure")
+
+    graph = JobGraph()
+    graph.add("fail", fail)
+    graph.add("dependent", completed.append, dependencies=["fail"])
+    graph.add("independent", lambda: completed.append("independent"))
+    with pytest.raises(Exception, match="test failure"):
+        graph.run()
+    assert_equal(completed, ["independent"])
+    metrics = {m["name"]: m for m in graph.get_metrics()}
+    assert_equal(str(metrics["dependent"]["error"]), "test failure")
+    with pytest.raises(ValueError):
+        graph.add("unknown", completed.append, dependencies=["unknown input"])
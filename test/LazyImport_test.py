@@ -0,0 +1,70 @@
+"""Tests for LazyImport module."""
+import subprocess
+import sys
+
+from numpy.testing import assert_equal
+
+
+def run_script(script):
+    """Run script in a new interpreter, and return its output."""
+    return subprocess.check_output([sys.executable, "-c", script]).decode().split()
+
+
+def test_import_on_first_use():
+    """LazyImport_test.test_import_on_first_use()
+
+    Verify packages import attributes on first use, and that classes with the
+    same name as their module are not replaced by the module.
+    """
+    output = run_script(
+        """
+import sys
+import geomagio
+print("geomagio.Controller" in sys.modules)
+import geomagio.Controller
+print(isinstance(geomagio.Controller, type))
+from geomagio import Controller, TimeseriesUtility
+print(Controller.__name__, TimeseriesUtility.__name__)
+"""
+    )
+    assert_equal(output, ["False", "True", "Controller", "geomagio.TimeseriesUtility"])
+
+
+def test_controller_imports():
+    """LazyImport_test.test_controller_imports()
+
+    Verify parsing arguments only imports the selected factories, and not
+    scipy.signal.
+    """
+    output = run_script(
+        """
+import sys
+from geomagio.Controller import get_input_factory, parse_args
+get_input_factory(parse_args([
+    "--input", "iaga2002", "--input-stdin",
+    "--output", "iaga2002", "--output-stdout",
+    "--observatory", "BOU",
+]))
+print("geomagio.iaga2002" in sys.modules)
+print("geomagio.edge.EdgeFactory" in sys.modules)
+print("scipy.signal" in sys.modules)
+"""
+    )
+    assert_equal(output, ["True", "False", "False"])
+
+
+def test_import_subpackages():
+    """LazyImport_test.test_import_subpackages()
+
+    Verify subpackages that are not listed as attributes are imported on
+    first use, like geomagio.edge in bin/geomag_webservice.py.
+    """
+    output = run_script(
+        """
+import geomagio
+print(geomagio.edge.EdgeFactory.__name__)
+print(geomagio.iaga2002.__name__)
+print(hasattr(geomagio, "not_a_module"))
+"""
+    )
+    assert_equal(output, ["EdgeFactory", "geomagio.iaga2002", "False"])
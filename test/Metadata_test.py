@@ -77,3 +77,15 @@ def test_get_instrument_unknown():
         TEST_METADATA,
     )
     assert_equal(matches, [])
+
+
+def test_get_instrument_unsorted():
+    """Request entries from a list that is not sorted by station and time"""
+    other = {"station": "OTHER", "start_time": None, "end_time": None}
+    matches = get_instrument(
+        "TST",
+        UTCDateTime("2020-01-02T00:00:00Z"),
+        UTCDateTime("2020-02-03T01:00:00Z"),
+        [METADATA3, other, METADATA2, METADATA1],
+    )
+    assert_equal(matches, [METADATA1, METADATA2, METADATA3])
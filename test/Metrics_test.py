@@ -0,0 +1,59 @@
+#! /usr/bin/env python
+import io
+import json
+
+from geomagio import Metrics
+from numpy.testing import assert_equal
+from obspy.core import Stream, Trace
+import numpy
+
+
+def test_timer_disabled():
+    """Metrics_test.test_timer_disabled()
+
+    timer yields fields, and records nothing, without a recorder.
+    """
+    assert_equal(Metrics.get_recorder(), None)
+    with Metrics.timer("test", a=1) as fields:
+        fields["b"] = 2
+    assert_equal(fields, {"a": 1, "b": 2})
+
+
+def test_timer_records():
+    """Metrics_test.test_timer_records()
+
+    timer writes one json line per timed block.
+    """
+    out = io.StringIO()
+    Metrics.set_recorder(Metrics.MetricsRecorder(out))
+    try:
+        with Metrics.timer("test", a=1) as fields:
+            fields.update(Metrics.get_stream_fields(Stream([Trace(numpy.zeros(10))])))
+    finally:
+        Metrics.set_recorder(None)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert_equal(len(records), 1)
+    record = records[0]
+    assert_equal(record["name"], "test")
+    assert_equal(record["a"], 1)
+    assert_equal(record["traces"], 1)
+    assert_equal(record["samples"], 10)
+    assert_equal(record["bytes"], 80)
+    assert_equal(record["elapsed"] >= 0, True)
+
+
+def test_instrument(tmpdir):
+    """Metrics_test.test_instrument()
+
+    instrument configures a recorder and profile for a block.
+    """
+    metrics_file = str(tmpdir.join("metrics.jsonl"))
+    profile_file = str(tmpdir.join("profile.out"))
+    with Metrics.instrument(metrics_file=metrics_file, profile_file=profile_file):
+        with Metrics.timer("test"):
+            pass
+    assert_equal(Metrics.get_recorder(), None)
+    with open(metrics_file) as f:
+        assert_equal(json.loads(f.readline())["name"], "test")
+    with open(profile_file, "rb") as f:
+        assert_equal(len(f.read()) > 0, True)
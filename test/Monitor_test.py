@@ -0,0 +1,115 @@
+"""Tests for Monitor module."""
+import json
+
+import numpy
+from numpy.testing import assert_equal
+from obspy.core import Stream, Trace, UTCDateTime
+
+from geomagio.Monitor import GapIndex, Monitor, get_json
+
+
+class FakeFactory(object):
+    """Minute data with gaps, that records requests."""
+
+    def __init__(self, gaps, requests):
+        self.gaps = gaps
+        self.requests = requests
+
+    def get_timeseries(self, starttime, endtime, observatory, channels, type, interval):
+        self.requests.append((observatory, interval, starttime, endtime))
+        npts = int((endtime - starttime) // 60) + 1
+        times = starttime.timestamp + 60 * numpy.arange(npts)
+        stream = Stream()
+        for channel in channels:
+            data = numpy.ones(npts)
+            for start, end in self.gaps.get(channel, []):
+                data[(times >= start.timestamp) & (times <= end.timestamp)] = numpy.nan
+            stream += Trace(
+                data,
+                {"channel": channel, "station": observatory, "starttime": starttime},
+            )
+            stream[-1].stats.delta = 60
+        return stream
+
+
+def test_check():
+    """Monitor_test.test_check()
+
+    Verify later checks only read data since the previous check,
+    and gaps match a check that reads all data.
+    """
+    starttime = UTCDateTime("2020-01-01T00:00:00Z")
+    gaps = {
+        "H": [
+            (UTCDateTime("2020-01-01T00:10:00Z"), UTCDateTime("2020-01-01T00:14:00Z")),
+            (UTCDateTime("2020-01-01T00:55:00Z"), UTCDateTime("2020-01-01T01:05:00Z")),
+        ]
+    }
+    requests = []
+    monitor = Monitor(
+        get_factory=lambda observatory, interval: FakeFactory(gaps, requests),
+        channels=["H", "Z"],
+        max_workers=2,
+    )
+    results = monitor.check(
+        ["BOU", "FRN"], ["minute"], starttime, starttime + 3600 - 60
+    )
+    assert_equal([r["observatory"] for r in results], ["BOU", "FRN"])
+    assert_equal(results[0]["channels"]["H"]["last_time"], gaps["H"][1][0])
+    # gap open at end of last check is read again
+    endtime = starttime + 7200 - 60
+    requests.clear()
+    results = monitor.check(["BOU"], ["minute"], starttime + 600, endtime)
+    assert_equal(requests, [("BOU", "minute", gaps["H"][1][0], endtime)])
+    # same result as reading all data
+    expected = Monitor(
+        get_factory=lambda observatory, interval: FakeFactory(gaps, []),
+        channels=["H", "Z"],
+    ).check(["BOU"], ["minute"], starttime + 600, endtime)
+    assert_equal(results, expected)
+    summary = results[0]["channels"]["H"]
+    assert_equal(summary["gaps"], [[g[0], g[1], g[1] + 60] for g in gaps["H"]])
+    assert_equal(summary["gap_total"], 16)
+    assert_equal(summary["count"], 110)
+    assert_equal(summary["last_time"], endtime)
+    assert_equal(results[0]["channels"]["Z"]["gaps"], [])
+    # no gaps, read from last check
+    requests.clear()
+    monitor.check(["BOU"], ["minute"], starttime + 600, endtime + 60)
+    assert_equal(requests, [("BOU", "minute", endtime, endtime + 60)])
+    parsed = json.loads(get_json(results))
+    assert_equal(parsed[0]["channels"]["H"]["gaps"][0][0], "2020-01-01T00:10:00")
+
+
+def test_check_earlier_start():
+    """Monitor_test.test_check_earlier_start()
+
+    Verify a previous check is not reused when a later check starts earlier,
+    because data before the previous check was not read.
+    """
+    endtime = UTCDateTime("2020-01-02T00:00:00Z")
+    gap_time = endtime - 12 * 3600
+    gaps = {"H": [(gap_time, gap_time)]}
+    requests = []
+    monitor = Monitor(
+        get_factory=lambda observatory, interval: FakeFactory(gaps, requests),
+        channels=["H"],
+    )
+    monitor.check(["BOU"], ["minute"], endtime - 3600, endtime)
+    requests.clear()
+    results = monitor.check(["BOU"], ["minute"], endtime - 86400, endtime + 60)
+    assert_equal(requests, [("BOU", "minute", endtime - 86400, endtime + 60)])
+    assert_equal(
+        results[0]["channels"]["H"]["gaps"], [[gap_time, gap_time, gap_time + 60]]
+    )
+
+
+def test_gap_index(tmpdir):
+    """Monitor_test.test_gap_index()"""
+    path = str(tmpdir / "gaps.json")
+    index = GapIndex(path)
+    gap = [UTCDateTime("2020-01-01T00:00:00Z")] * 3
+    index.update("BOU.variation.minute.H", gap[0], gap[0], [gap])
+    index.save()
+    assert_equal(GapIndex(path).get("BOU.variation.minute.H"), (gap[0], gap[0], [gap]))
+    assert_equal(GapIndex(path).get("BOU.variation.minute.Z"), None)
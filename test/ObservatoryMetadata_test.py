@@ -3,6 +3,7 @@
 from geomagio import ObservatoryMetadata
 from numpy.testing import assert_equal
 import obspy.core
+from obspy.core.util import AttribDict
 
 
 METADATA = {
@@ -66,3 +67,41 @@ def test_set_metadata():
     assert_equal(stats["declination_base"], 20000)
     print(stats)
     assert_equal(stats["data_interval_type"], "Average 1-Second")
+
+
+def test_get_template():
+    """ObservatoryMetadata_test.test_get_template()"""
+    observatorymetadata = ObservatoryMetadata(METADATA, DATA_INTERVAL_TYPE)
+    template = observatorymetadata.get_template("BOU", "variation", "minute")
+    # templates are computed once
+    assert_equal(
+        observatorymetadata.get_template("BOU", "variation", "minute") is template,
+        True,
+    )
+    assert_equal(template["data_type"], "variation")
+    assert_equal(template["station_name"], "Boulder")
+    # stats and dictionaries get the same metadata
+    stats = obspy.core.Stats()
+    header = {}
+    observatorymetadata.set_metadata(stats, "BOU", "MVH", "variation", "minute")
+    observatorymetadata.set_metadata(header, "BOU", "MVH", "variation", "minute")
+    assert_equal(stats["channel"], "MVH")
+    assert_equal(header["channel"], "MVH")
+    for key in template:
+        assert_equal(stats[key], template[key])
+        assert_equal(header[key], template[key])
+    # each trace gets its own copy of mappings, like Stats
+    observatorymetadata = ObservatoryMetadata(
+        {"BOU": {"metadata": {"station_name": "Boulder", "extra": {"a": 1}}}}
+    )
+    stats1 = obspy.core.Stats()
+    stats2 = obspy.core.Stats()
+    observatorymetadata.set_metadata(stats1, "BOU", "MVH", "variation", "minute")
+    observatorymetadata.set_metadata(stats2, "BOU", "MVH", "variation", "minute")
+    assert_equal(isinstance(stats1.extra, AttribDict), True)
+    stats1.extra.a = 2
+    assert_equal(stats2.extra.a, 1)
+    assert_equal(observatorymetadata.metadata["BOU"]["metadata"]["extra"]["a"], 1)
+    # unknown observatories only get channel, type, and interval
+    template = observatorymetadata.get_template("OTHER", "variation", "minute")
+    assert_equal(dict(template), {"data_interval": "minute", "data_type": "variation"})
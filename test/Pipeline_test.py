@@ -0,0 +1,43 @@
+#! /usr/bin/env python
+from geomagio.Pipeline import Pipeline, PipelineStage
+
+from numpy.testing import assert_equal
+import pytest
+
+
+def test_pipeline_run():
+    """Pipeline_test.test_pipeline_run()
+
+    items pass through every stage in order, and metrics are recorded.
+    """
+    pipeline = Pipeline(
+        stages=[
+            PipelineStage("double", lambda x: x * 2),
+            PipelineStage("increment", lambda x: x + 1),
+        ],
+        queue_depth=2,
+    )
+    results = pipeline.run(range(10))
+    assert_equal(results, [x * 2 + 1 for x in range(10)])
+    metrics = pipeline.get_metrics()
+    assert_equal([m["name"] for m in metrics], ["double", "increment"])
+    assert_equal([m["count"] for m in metrics], [10, 10])
+
+
+def test_pipeline_exception():
+    """Pipeline_test.test_pipeline_exception()
+
+    an exception in any stage stops the pipeline and is raised by run.
+    """
+
+    def fail(x):
+        if x == 3:
+            raise ValueError("failed")
+        return x
+
+    pipeline = Pipeline(
+        stages=[PipelineStage("fail", fail), PipelineStage("identity", lambda x: x)],
+        queue_depth=1,
+    )
+    with pytest.raises(ValueError):
+        pipeline.run(range(100))
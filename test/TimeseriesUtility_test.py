@@ -208,6 +208,20 @@ def test_get_trace_values():
         ),
         4,
     )
+    # many values, missing and NaN times use defaults
+    assert_equal(
+        TimeseriesUtility.get_trace_values(
+            traces=stream.select(channel="H"),
+            times=[
+                UTCDateTime("2015-01-01T00:00:01Z"),
+                UTCDateTime("2015-01-01T00:00:03Z"),
+                UTCDateTime("2015-01-01T00:00:00.5Z"),
+                UTCDateTime("2015-01-01T00:00:10Z"),
+            ],
+            defaults=[5, 6, 7, 8],
+        ),
+        [1, 6, 7, 8],
+    )
 
 
 def test_has_all_channels():
@@ -333,6 +347,59 @@ def test_merge_streams():
     assert_almost_equal(merged4.select(channel="H")[0].data, [1, 2, 2, 2, 1, 1])
 
 
+def test_merge_streams_overlap():
+    """TimeseriesUtility_test.test_merge_streams_overlap()
+
+    confirm overlapping data uses the trace with the last endtime,
+    and traces with the same endtime keep earlier data.
+    """
+    starttime = UTCDateTime("2018-01-01T00:00:00Z")
+    trace1 = _create_trace([1, numpy.nan, 1, 1, numpy.nan, 1], "H", starttime)
+    trace2 = _create_trace([2, 2, 2], "H", starttime + 120)
+    trace3 = _create_trace([3, 3, 3], "H", starttime + 360)
+    merged = TimeseriesUtility.merge_streams(Stream([trace1, trace2, trace3]))
+    assert_equal(len(merged), 1)
+    assert_equal(merged[0].stats.starttime, starttime)
+    assert_almost_equal(merged[0].data, [1, numpy.nan, 2, 2, 2, 1, 3, 3, 3])
+    # same endtime
+    trace4 = _create_trace([4, 4], "H", starttime + 120)
+    merged = TimeseriesUtility.merge_streams(Stream([trace1]), Stream([trace4]))
+    assert_almost_equal(merged[0].data, [1, numpy.nan, 1, 1, numpy.nan, 1])
+    # traces not on the same sample grid are rounded by obspy
+    trace5 = _create_trace([5, 5], "H", starttime + 450)
+    merged = TimeseriesUtility.merge_streams(Stream([trace1, trace5]))
+    assert_almost_equal(
+        merged[0].data, [1, numpy.nan, 1, 1, numpy.nan, 1, numpy.nan, numpy.nan, 5, 5]
+    )
+
+
+def test_merge_streams_order():
+    """TimeseriesUtility_test.test_merge_streams_order()
+
+    confirm traces that were combined come first, followed by traces that
+    were not, each sorted by channel.
+    """
+    starttime = UTCDateTime("2018-01-01T00:00:00Z")
+    stream1 = Stream(
+        [
+            _create_trace([1, 1], "Z", starttime),
+            _create_trace([1, 1], "H", starttime),
+            _create_trace([1, 1], "F", starttime),
+        ]
+    )
+    stream2 = Stream(
+        [
+            _create_trace([2, 2], "H", starttime + 240),
+            _create_trace([2, 2], "E", starttime + 240),
+            _create_trace([3, 3], "E", starttime),
+        ]
+    )
+    merged = TimeseriesUtility.merge_streams(stream1, stream2)
+    assert_equal([t.stats.channel for t in merged], ["E", "H", "F", "Z"])
+    assert_almost_equal(merged[0].data, [3, 3, numpy.nan, numpy.nan, 2, 2])
+    assert_almost_equal(merged[3].data, [1, 1])
+
+
 def test_pad_timeseries():
     """TimeseriesUtility_test.test_pad_timeseries()"""
     trace1 = _create_trace([1, 1, 1, 1, 1], "H", UTCDateTime("2018-01-01"))
@@ -87,3 +87,34 @@ def test_process_reverse_polarity():
         desired=expected.select(channel="E")[0].data,
         decimal=2,
     )
+
+
+def test_process_metadata():
+    """algorithm_test.AdjustedAlgorithm_test.test_process_metadata()
+
+    Check each sample is adjusted by the matrix from metadata that covers it.
+    """
+    a = adj(metadata_url="file://etc/adjusted/{observatory}_metadata.json")
+    segments = a.get_matrix_segments("BOU")
+    assert_equal(len(segments), 2)
+    assert_equal(a.get_matrix_segments("BOU") is segments, True)
+
+    with open("etc/adjusted/BOU201601vmin.min") as f:
+        raw = i2.IAGA2002Factory().parse_string(f.read())
+    with open("etc/adjusted/BOU201601adj.min") as f:
+        expected = i2.IAGA2002Factory().parse_string(f.read())
+    adjusted = a.process(raw)
+
+    # first matrix ends 2016-01-15, identity matrix after
+    split = 14 * 1440
+    for channel, raw_channel in [("X", "H"), ("Y", "E"), ("Z", "Z"), ("F", "F")]:
+        assert_almost_equal(
+            actual=adjusted.select(channel=channel)[0].data[:split],
+            desired=expected.select(channel=channel)[0].data[:split],
+            decimal=2,
+        )
+        assert_almost_equal(
+            actual=adjusted.select(channel=channel)[0].data[split:],
+            desired=raw.select(channel=raw_channel)[0].data[split:],
+            decimal=2,
+        )
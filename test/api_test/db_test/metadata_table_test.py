@@ -0,0 +1,140 @@
+import asyncio
+import json
+import time
+
+import databases
+from numpy.testing import assert_equal
+import sqlalchemy
+
+from geomagio.api import metrics
+from geomagio.api.db import metadata_table
+from geomagio.api.secure.MetadataQuery import MetadataQuery
+from geomagio.api.ws.metadata import get_metadata_json
+from geomagio.metadata import Metadata, MetadataCategory
+
+
+def explain_query_plan(query):
+    """Get the sqlite query plan for a query."""
+    engine = sqlalchemy.create_engine("sqlite://")
+    metadata_table.metadata.create(engine)
+    compiled = query.compile(engine)
+    params = [compiled.params[key] for key in compiled.positiontup]
+    cursor = engine.raw_connection().cursor()
+    cursor.execute("EXPLAIN QUERY PLAN " + str(compiled), params)
+    return " ".join(str(row[-1]) for row in cursor.fetchall())
+
+
+def test_get_metadata_query_exact():
+    query = metadata_table.get_metadata_query(
+        network="NT",
+        station="BOU",
+        channel="H",
+        location="R0",
+        category=MetadataCategory.FLAG,
+        after_id=10,
+        limit=5,
+    )
+    sql = str(query)
+    assert_equal("LIKE" in sql, False)
+    assert_equal("ORDER BY metadata.id" in sql, True)
+    assert_equal("LIMIT" in sql, True)
+    plan = explain_query_plan(query)
+    assert_equal("index_station_metadata" in plan, True)
+
+
+def test_get_metadata_query_wildcard():
+    query = metadata_table.get_metadata_query(network="NT", station="B%")
+    sql = str(query)
+    assert_equal("metadata.network = " in sql, True)
+    assert_equal("metadata.station LIKE " in sql, True)
+    # unspecified columns do not match null
+    assert_equal("metadata.channel IS NOT NULL" in sql, True)
+    plan = explain_query_plan(query)
+    assert_equal("index_station_metadata" in plan, True)
+
+
+def test_get_metadata_query_case():
+    # codes are stored in upper case, and matched without case sensitivity
+    query = metadata_table.get_metadata_query(network="nt", station="b%")
+    params = query.compile().params
+    assert_equal("NT" in params.values(), True)
+    assert_equal("B%" in params.values(), True)
+
+
+def test_get_metadata_json(monkeypatch):
+    async def iterate_metadata(**kwargs):
+        for id in range(kwargs["after_id"] + 1, kwargs["after_id"] + 1 + count):
+            yield Metadata(id=id, station="BOU")
+
+    async def get_json(query):
+        return "".join([part async for part in get_metadata_json(query)])
+
+    monkeypatch.setattr(metadata_table, "iterate_metadata", iterate_metadata)
+    count = 2
+    metas = json.loads(asyncio.run(get_json(MetadataQuery(after_id=3, limit=2))))
+    assert_equal([m["id"] for m in metas], [4, 5])
+    assert_equal([m["station"] for m in metas], ["BOU", "BOU"])
+    count = 0
+    assert_equal(asyncio.run(get_json(MetadataQuery(after_id=5))), "[]")
+
+
+def test_iterate_metadata_latency(monkeypatch):
+    class FakeDatabase(object):
+        async def iterate(self, query):
+            for id in range(1, 4):
+                yield {"id": id, "station": "BOU"}
+
+    async def read_slowly():
+        ids = []
+        async for meta in metadata_table.iterate_metadata():
+            ids.append(meta.id)
+            # slow client, should not count as database latency
+            await asyncio.sleep(0.05)
+        return ids
+
+    latency = metrics.Histogram("test_latency", "test", labels=("operation",))
+    monkeypatch.setattr(metadata_table, "database", FakeDatabase())
+    monkeypatch.setattr(metadata_table, "DB_QUERY_LATENCY", latency)
+    start = time.perf_counter()
+    assert_equal(asyncio.run(read_slowly()), [1, 2, 3])
+    elapsed = time.perf_counter() - start
+    counts, total = latency.values[("iterate_metadata",)]
+    assert_equal(sum(counts), 1)
+    assert_equal(total < elapsed - 0.1, True)
+
+
+def test_create_metadata_many(monkeypatch, tmp_path):
+    database = databases.Database("sqlite:///" + str(tmp_path / "metadata.db"))
+    engine = sqlalchemy.create_engine(str(database.url))
+    metadata_table.metadata.create(engine)
+    monkeypatch.setattr(metadata_table, "database", database)
+
+    async def get_metas(count):
+        for i in range(count):
+            yield Metadata(
+                station="BOU",
+                category=MetadataCategory.FLAG,
+                metadata={"index": i} if i % 2 else None,
+            )
+
+    async def create_and_read():
+        await database.connect()
+        try:
+            count = await metadata_table.create_metadata_many(
+                get_metas(7), batch_size=3
+            )
+            metas = [
+                meta
+                async for meta in metadata_table.iterate_metadata(
+                    category=MetadataCategory.FLAG
+                )
+            ]
+        finally:
+            await database.disconnect()
+        return count, metas
+
+    count, metas = asyncio.run(create_and_read())
+    assert_equal(count, 7)
+    assert_equal([m.id for m in metas], list(range(1, 8)))
+    assert_equal(metas[0].metadata, None)
+    assert_equal(metas[1].metadata, {"index": 1})
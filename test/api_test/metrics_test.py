@@ -0,0 +1,70 @@
+from fastapi.testclient import TestClient
+from numpy.testing import assert_equal
+
+from geomagio.api import app
+from geomagio.api.metrics import Counter, Histogram, Registry
+
+
+def test_counter():
+    counter = Counter("test_total", "Test counter.", labels=("code",))
+    counter.inc(code=404)
+    counter.inc(2, code=404)
+    counter.inc(code=500)
+    assert_equal(
+        counter.render(),
+        [
+            "# HELP test_total Test counter.",
+            "# TYPE test_total counter",
+            'test_total{code="404"} 3',
+            'test_total{code="500"} 1',
+        ],
+    )
+
+
+def test_histogram():
+    histogram = Histogram("test_seconds", "Test histogram.", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.1)
+    histogram.observe(5)
+    registry = Registry()
+    registry.register(histogram)
+    assert_equal(
+        registry.render(),
+        "\n".join(
+            [
+                "# HELP test_seconds Test histogram.",
+                "# TYPE test_seconds histogram",
+                'test_seconds_bucket{le="0.1"} 2',
+                'test_seconds_bucket{le="1.0"} 2',
+                'test_seconds_bucket{le="+Inf"} 3',
+                "test_seconds_sum 5.15",
+                "test_seconds_count 3",
+            ]
+        )
+        + "\n",
+    )
+
+
+ELEMENTS_COUNT = (
+    'geomag_request_duration_seconds_count{method="GET",route="/ws/elements/",'
+    'status="200"} '
+)
+
+
+def get_elements_count(metrics: str) -> int:
+    """Number of /ws/elements/ requests in rendered metrics."""
+    for line in metrics.splitlines():
+        if line.startswith(ELEMENTS_COUNT):
+            return int(float(line[len(ELEMENTS_COUNT) :]))
+    return 0
+
+
+def test_metrics_endpoint():
+    client = TestClient(app)
+    before = get_elements_count(client.get("/ws/metrics").text)
+    response = client.get("/ws/elements/")
+    assert_equal(response.status_code, 200)
+    response = client.get("/ws/metrics")
+    assert_equal(response.status_code, 200)
+    assert_equal(response.headers["content-type"].startswith("text/plain"), True)
+    assert_equal(get_elements_count(response.text), before + 1)
@@ -0,0 +1,28 @@
+import asyncio
+
+from numpy.testing import assert_equal
+import pytest
+
+from geomagio.api.secure.metadata import read_metadata_ndjson
+
+
+async def read_all(chunks):
+    async def get_chunks():
+        for chunk in chunks:
+            yield chunk
+
+    return [meta async for meta in read_metadata_ndjson(get_chunks())]
+
+
+def test_read_metadata_ndjson():
+    # lines may be split across chunks, blank lines are ignored
+    metas = asyncio.run(
+        read_all([b'{"station": "BOU"}\n{"sta', b'tion": "FRD"}\n\n{"id": 3}'])
+    )
+    assert_equal([m.station for m in metas], ["BOU", "FRD", None])
+    assert_equal(metas[2].id, 3)
+
+
+def test_read_metadata_ndjson_invalid():
+    with pytest.raises(ValueError, match="line 2"):
+        asyncio.run(read_all([b'{"station": "BOU"}\n', b'{"priority": "high"}\n']))
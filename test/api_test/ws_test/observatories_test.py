@@ -0,0 +1,73 @@
+import gzip
+import json
+
+from fastapi.testclient import TestClient
+from numpy.testing import assert_equal
+
+from geomagio.api.ws import app
+from geomagio.api.ws.elements import ELEMENTS_JSON
+from geomagio.api.ws.Observatory import OBSERVATORIES
+from geomagio.api.ws.StaticJson import accepts_gzip, matches_etag
+
+client = TestClient(app)
+
+
+def test_get_observatories():
+    response = client.get("/observatories/", headers={"Accept-Encoding": "identity"})
+    assert_equal(response.status_code, 200)
+    assert_equal(response.headers["content-type"], "application/json")
+    assert_equal("content-encoding" in response.headers, False)
+    assert_equal(
+        response.json(),
+        {
+            "type": "FeatureCollection",
+            "features": [o.geojson() for o in OBSERVATORIES],
+        },
+    )
+    etag = response.headers["etag"]
+    # gzip is a separate representation, with a separate etag
+    response = client.get("/observatories/", headers={"Accept-Encoding": "gzip"})
+    assert_equal(response.headers["content-encoding"], "gzip")
+    assert_equal(response.headers["etag"] != etag, True)
+    # either etag means the client has the current content
+    for if_none_match in [etag, response.headers["etag"], f'W/{etag}, "other"']:
+        response = client.get(
+            "/observatories/", headers={"If-None-Match": if_none_match}
+        )
+        assert_equal(response.status_code, 304)
+        assert_equal(response.content, b"")
+    response = client.get("/observatories/", headers={"If-None-Match": '"other"'})
+    assert_equal(response.status_code, 200)
+
+
+def test_get_observatory_by_id():
+    response = client.get("/observatories/BOU")
+    assert_equal(response.status_code, 200)
+    assert_equal(response.json()["id"], "BOU")
+    response = client.get("/observatories/XXX")
+    assert_equal(response.status_code, 404)
+
+
+def test_get_elements():
+    response = client.get("/elements/", headers={"Accept-Encoding": "gzip"})
+    assert_equal(response.status_code, 200)
+    assert_equal(response.json()["type"], "FeatureCollection")
+
+
+def test_accepts_gzip():
+    assert_equal(accepts_gzip("gzip, deflate, br"), True)
+    assert_equal(accepts_gzip("deflate, gzip;q=0"), False)
+    assert_equal(accepts_gzip("*;q=0.5"), True)
+    assert_equal(accepts_gzip("identity"), False)
+
+
+def test_matches_etag():
+    assert_equal(matches_etag("*", ['"a"']), True)
+    assert_equal(matches_etag('"b", W/"a"', ['"a"']), True)
+    assert_equal(matches_etag('"b"', ['"a"']), False)
+
+
+def test_static_json():
+    # gzip content is the same json
+    assert_equal(gzip.decompress(ELEMENTS_JSON.gzip_body), ELEMENTS_JSON.body)
+    assert_equal(json.loads(ELEMENTS_JSON.body)["type"], "FeatureCollection")
@@ -0,0 +1,108 @@
+"""Tests for ArchiveFactory class"""
+
+from tempfile import TemporaryDirectory
+
+import numpy
+from numpy.testing import assert_equal
+from obspy.core import Stream, Trace, UTCDateTime
+from geomagio.archive import ArchiveFactory
+from geomagio.ObservatoryMetadata import ObservatoryMetadata
+
+
+def test_get_timeseries_empty():
+    """archive_test.ArchiveFactory_test.test_get_timeseries_empty()
+
+    Verify channels that are not in the archive are filled with nan.
+    """
+    with TemporaryDirectory() as tmp_dir:
+        factory = ArchiveFactory(directory=tmp_dir, observatory="BOU")
+        timeseries = factory.get_timeseries(
+            starttime=UTCDateTime("2020-01-01T00:00:30Z"),
+            endtime=UTCDateTime("2020-01-01T00:09:00Z"),
+            channels=("H", "E"),
+        )
+        assert_equal(len(timeseries), 2)
+        for trace in timeseries:
+            assert_equal(trace.stats.starttime, UTCDateTime("2020-01-01T00:01:00Z"))
+            assert_equal(trace.stats.npts, 9)
+            assert_equal(numpy.isnan(trace.data).all(), True)
+
+
+def test_put_timeseries():
+    """archive_test.ArchiveFactory_test.test_put_timeseries()
+
+    Verify samples are overwritten in place, the archive is extended in both
+    directions, and nan samples do not replace existing samples.
+    """
+    starttime = UTCDateTime("2020-01-01T00:00:00Z")
+    with TemporaryDirectory() as tmp_dir:
+        factory = ArchiveFactory(directory=tmp_dir, observatory="BOU")
+        factory.put_timeseries(_create_stream(starttime, [1, 2, 3, 4, 5]))
+        # overwrite and extend after
+        factory.put_timeseries(_create_stream(starttime + 180, [14, numpy.nan, 16]))
+        # extend before, with a gap
+        factory.put_timeseries(_create_stream(starttime - 180, [-3]))
+        timeseries = factory.get_timeseries(
+            starttime=starttime - 240, endtime=starttime + 360, channels=("H",)
+        )
+        assert_equal(timeseries[0].stats.starttime, starttime - 240)
+        assert_equal(
+            timeseries[0].data,
+            [numpy.nan, -3, numpy.nan, numpy.nan, 1, 2, 3, 14, 5, 16, numpy.nan],
+        )
+        # slices within archive are views of the archive file
+        timeseries = factory.get_timeseries(
+            starttime=starttime, endtime=starttime + 120, channels=("H",)
+        )
+        assert_equal(timeseries[0].data, [1, 2, 3])
+        assert_equal(isinstance(timeseries[0].data.base, numpy.memmap), True)
+        # modifying returned data does not modify archive
+        timeseries[0].data[0] = 100
+        timeseries = factory.get_timeseries(
+            starttime=starttime, endtime=starttime, channels=("H",)
+        )
+        assert_equal(timeseries[0].data, [1])
+
+
+def test_get_timeseries_metadata():
+    """archive_test.ArchiveFactory_test.test_get_timeseries_metadata()
+
+    Verify observatory metadata is set on traces that are read.
+    """
+    starttime = UTCDateTime("2020-01-01T00:00:00Z")
+    metadata = ObservatoryMetadata(
+        metadata={"XYZ": {"metadata": {"network": "XX", "station_name": "Test"}}}
+    )
+    with TemporaryDirectory() as tmp_dir:
+        factory = ArchiveFactory(directory=tmp_dir, observatory="BOU")
+        factory.put_timeseries(_create_stream(starttime, [1, 2]))
+        timeseries = factory.get_timeseries(starttime, starttime + 60, channels=["H"])
+        stats = timeseries[0].stats
+        assert_equal(stats.network, "NT")
+        assert_equal(stats.station_name, "Boulder")
+        assert_equal(stats.data_type, "variation")
+        assert_equal(stats.data_interval, "minute")
+        factory = ArchiveFactory(
+            directory=tmp_dir, observatory="XYZ", observatoryMetadata=metadata
+        )
+        timeseries = factory.get_timeseries(starttime, starttime + 60, channels=["H"])
+        stats = timeseries[0].stats
+        assert_equal(stats.network, "XX")
+        assert_equal(stats.station, "XYZ")
+        assert_equal(stats.station_name, "Test")
+
+
+def _create_stream(starttime, data):
+    trace = Trace(
+        numpy.array(data, dtype=numpy.float64),
+        {
+            "channel": "H",
+            "data_interval": "minute",
+            "data_type": "variation",
+            "delta": 60,
+            "network": "NT",
+            "starttime": starttime,
+            "station": "BOU",
+        },
+    )
+    return Stream([trace])
@@ -0,0 +1,102 @@
+"""Tests for FakeEdge.py"""
+import socket
+
+import numpy
+from numpy.testing import assert_almost_equal, assert_equal
+from obspy.core import Stream, Trace, UTCDateTime
+
+from geomagio.edge import EdgeFactory, MiniSeedFactory
+from geomagio.edge.FakeEdge import FakeEdge
+
+
+def create_stream(channel, data, starttime, delta=60.0):
+    return Stream(
+        [
+            Trace(
+                numpy.array(data, dtype=numpy.float64),
+                {
+                    "channel": channel,
+                    "delta": delta,
+                    "location": "R0",
+                    "network": "NT",
+                    "station": "BOU",
+                    "starttime": starttime,
+                },
+            )
+        ]
+    )
+
+
+def test_edge_factory_round_trip():
+    """edge_test.FakeEdge_test.test_edge_factory_round_trip()
+
+    data written using the RawInput protocol is read using the waveserver
+    protocol.
+    """
+    starttime = UTCDateTime("2020-01-01T00:00:00Z")
+    endtime = starttime + 9 * 60
+    data = [1.0, 2.0, 3.0, numpy.nan, numpy.nan, 6.0, 7.0, 8.0, 9.0, 10.0]
+    with FakeEdge() as edge:
+        factory = EdgeFactory(
+            host=edge.host,
+            port=edge.waveserver_port,
+            write_port=edge.rawinput_port,
+            observatory="BOU",
+            type="variation",
+            interval="minute",
+        )
+        factory.put_timeseries(create_stream("H", data, starttime), channels=["H"])
+        edge.flush()
+        timeseries = factory.get_timeseries(
+            starttime=starttime, endtime=endtime, channels=["H"]
+        )
+    assert_equal(len(timeseries), 1)
+    assert_equal(timeseries[0].stats.starttime, starttime)
+    assert_almost_equal(timeseries[0].data, data)
+
+
+def test_miniseed_factory_round_trip():
+    """edge_test.FakeEdge_test.test_miniseed_factory_round_trip()
+
+    data written using the MiniSeed input protocol is read using the CWB
+    query protocol.
+    """
+    starttime = UTCDateTime("2020-01-01T00:00:00Z")
+    endtime = starttime + 9
+    data = numpy.arange(10, dtype=numpy.float64)
+    with FakeEdge(latency=0.01, bandwidth=100000) as edge:
+        factory = MiniSeedFactory(
+            host=edge.host,
+            port=edge.query_port,
+            write_port=edge.miniseed_port,
+            observatory="BOU",
+            type="variation",
+            interval="second",
+        )
+        factory.put_timeseries(
+            create_stream("U", data, starttime, delta=1.0), channels=["U"]
+        )
+        edge.flush()
+        timeseries = factory.get_timeseries(
+            starttime=starttime, endtime=endtime, channels=["U"]
+        )
+    assert_equal(len(timeseries), 1)
+    assert_almost_equal(timeseries[0].data, data)
+
+
+def test_waveserver_bad_requests():
+    """edge_test.FakeEdge_test.test_waveserver_bad_requests()
+
+    malformed requests are flagged as bad instead of closing the connection.
+    """
+    requests = [
+        (b"UNKNOWN:\n", b"ERROR FB\n"),
+        (b"GETSCNLRAW: 1 BOU H\n", b"1 FB\n"),
+        (b"GETSCNLRAW: 2 BOU H NT R0 start end\n", b"2 FB\n"),
+        (b"MENU:\n", b"ERROR FB\n"),
+    ]
+    with FakeEdge() as edge:
+        for request, expected in requests:
+            with socket.create_connection((edge.host, edge.waveserver_port)) as s:
+                s.sendall(request)
+                assert_equal(s.recv(1024), expected)
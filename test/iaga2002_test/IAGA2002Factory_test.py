@@ -1,9 +1,16 @@
 """Tests for IAGA2002Factory class"""
 
+from tempfile import TemporaryDirectory
+
+import numpy
 from numpy.testing import assert_equal
+from obspy.core import Stream, Trace, UTCDateTime
 from geomagio.iaga2002 import IAGA2002Factory
 
 
+CHANNELS = ["H", "E", "Z", "F"]
+
+
 def test_parse_empty():
     """iaga2002_test.IAGA2002Parser_test.test_parse_empty()
 
@@ -13,3 +20,173 @@ def test_parse_empty():
     parser = IAGA2002Factory()
     stream = parser.parse_string("")
     assert_equal(len(stream), 0)
+
+
+def test_put_timeseries_update():
+    """iaga2002_test.IAGA2002Factory_test.test_put_timeseries_update()
+
+    Verify rows of existing files are updated in place, with the same result
+    as rewriting the file.
+    """
+    starttime = UTCDateTime("2020-01-01T00:00:00Z")
+    with TemporaryDirectory() as tmp_dir:
+        url_template = "file://" + tmp_dir + "/{obs}{date:%Y%m%d}{t}{i}_{name}.{i}"
+        update = IAGA2002Factory(
+            observatory="BOU",
+            urlInterval=86400,
+            urlTemplate=url_template.replace("{name}", "update"),
+        )
+        rewrite = IAGA2002Factory(
+            observatory="BOU",
+            urlInterval=86400,
+            urlTemplate=url_template.replace("{name}", "rewrite"),
+        )
+        rewrite.fixed_width_rows = False
+        updated_in_place = _record_updates(update)
+        for factory in (update, rewrite):
+            factory.put_timeseries(
+                _create_stream(starttime, numpy.arange(60.0)), channels=CHANNELS
+            )
+            # overwrite existing rows, and rows padded with NaN
+            factory.put_timeseries(
+                _create_stream(starttime + 3480, numpy.array([100.0, 101.0, 102.0])),
+                channels=CHANNELS,
+            )
+        assert_equal(updated_in_place, [True])
+        url_file = tmp_dir + "/bou20200101vmin_update.min"
+        with open(url_file, "rb") as updated:
+            with open(url_file.replace("update", "rewrite"), "rb") as rewritten:
+                assert_equal(updated.read(), rewritten.read())
+        data = update.get_timeseries(
+            starttime=starttime, endtime=starttime + 3660, channels=CHANNELS
+        )
+        assert_equal(data[0].data[57:62], [57.0, 100.0, 101.0, 102.0, numpy.nan])
+        # headers changed, file is rewritten
+        stream = _create_stream(starttime + 3600, numpy.array([1.0]))
+        stream[0].stats.station_name = "Boulder"
+        assert_equal(
+            update._update_file(
+                url_file=url_file,
+                timeseries=stream,
+                channels=CHANNELS,
+                type="variation",
+                interval="minute",
+                starttime=starttime,
+                endtime=starttime + 86340,
+            ),
+            False,
+        )
+
+
+def test_put_timeseries_update_overlap():
+    """iaga2002_test.IAGA2002Factory_test.test_put_timeseries_update_overlap()
+
+    Verify conflicting values are resolved the same way when rows are updated
+    in place and when the file is rewritten.
+    """
+    starttime = UTCDateTime("2020-01-01T00:00:00Z")
+    with TemporaryDirectory() as tmp_dir:
+        url_template = "file://" + tmp_dir + "/{obs}{date:%Y%m%d}{t}{i}_{name}.{i}"
+        update = IAGA2002Factory(
+            observatory="BOU",
+            urlInterval=86400,
+            urlTemplate=url_template.replace("{name}", "update"),
+        )
+        rewrite = IAGA2002Factory(
+            observatory="BOU",
+            urlInterval=86400,
+            urlTemplate=url_template.replace("{name}", "rewrite"),
+        )
+        rewrite.fixed_width_rows = False
+        updated_in_place = _record_updates(update)
+        for factory in (update, rewrite):
+            factory.put_timeseries(
+                _create_stream(
+                    starttime, numpy.array([numpy.nan, numpy.nan, numpy.nan, 1, 1])
+                ),
+                channels=CHANNELS,
+            )
+            # existing data continues after new data, and is used where they overlap
+            factory.put_timeseries(
+                _create_stream(starttime + 120, numpy.array([2.0, 2.0])),
+                channels=CHANNELS,
+            )
+            # merged data ends before missing data
+            factory.put_timeseries(
+                _create_stream(starttime + 300, numpy.full(3, numpy.nan)),
+                channels=CHANNELS,
+            )
+        assert_equal(updated_in_place, [True, True])
+        url_file = tmp_dir + "/bou20200101vmin_update.min"
+        with open(url_file, "rb") as updated:
+            with open(url_file.replace("update", "rewrite"), "rb") as rewritten:
+                assert_equal(updated.read(), rewritten.read())
+        data = update.get_timeseries(
+            starttime=starttime, endtime=starttime + 300, channels=["H"]
+        )
+        assert_equal(data[0].data, [numpy.nan, numpy.nan, 2.0, 1.0, 1.0, numpy.nan])
+
+
+def test_get_timeseries_workers():
+    """iaga2002_test.IAGA2002Factory_test.test_get_timeseries_workers()
+
+    Verify files read by worker processes are combined into one trace per
+    channel, with missing files filled with NaN.
+    """
+    starttime = UTCDateTime("2020-01-01T00:00:00Z")
+    with TemporaryDirectory() as tmp_dir:
+        factory = IAGA2002Factory(
+            observatory="BOU",
+            urlInterval=86400,
+            urlTemplate="file://" + tmp_dir + "/{obs}{date:%Y%m%d}{t}{i}.{i}",
+            urlWorkers=2,
+        )
+        for day in (0, 2):
+            factory.put_timeseries(
+                _create_stream(starttime + day * 86400, numpy.arange(1440.0)),
+                channels=CHANNELS,
+            )
+        timeseries = factory.get_timeseries(
+            starttime=starttime + 3600,
+            endtime=starttime + 3 * 86400 - 60,
+            channels=["H", "Z"],
+        )
+    assert_equal(len(timeseries), 2)
+    assert_equal([t.stats.channel for t in timeseries], ["H", "Z"])
+    h = timeseries[0]
+    assert_equal(h.stats.starttime, starttime + 3600)
+    assert_equal(h.stats.npts, 3 * 1440 - 60)
+    assert_equal(h.data[:2], [60.0, 61.0])
+    assert_equal(numpy.isnan(h.data[1380:2820]).all(), True)
+    assert_equal(h.data[-1], 1439.0)
+
+
+def _create_stream(starttime, data):
+    stream = Stream()
+    for channel in CHANNELS:
+        stream += Trace(
+            data.copy(),
+            {
+                "channel": channel,
+                "data_type": "variation",
+                "delta": 60.0,
+                "network": "NT",
+                "starttime": starttime,
+                "station": "BOU",
+            },
+        )
+    return stream
+
+
+def _record_updates(factory):
+    """Record results of factory._update_file calls."""
+    results = []
+    update_file = factory._update_file
+
+    def record_update(**kwargs):
+        result = update_file(**kwargs)
+        results.append(result)
+        return result
+
+    factory._update_file = record_update
+    return results
@@ -0,0 +1,101 @@
+"""Tests for the GOESIMFV283Factory class."""
+import os
+from tempfile import TemporaryDirectory
+
+from numpy.testing import assert_equal
+from obspy import UTCDateTime
+
+from geomagio.imfv283 import GOESIMFV283Factory
+
+from .IMFV283Parser_test import IMFV283_EXAMPLE_FRD
+
+
+FAKE_GETDCPMESSAGES = os.path.join(os.path.dirname(__file__), "fake_getdcpmessages.py")
+
+
+def test_get_timeseries_cache(monkeypatch):
+    """imfv283_test.GOESIMFV283Factory_test.test_get_timeseries_cache()
+
+    Verify all servers are queried, servers that fail are ignored,
+    and windows that were already retrieved are not requested again.
+    """
+    with TemporaryDirectory() as tmp_dir:
+        messages_file = os.path.join(tmp_dir, "messages")
+        with open(messages_file, "wb") as f:
+            f.write(IMFV283_EXAMPLE_FRD + b"\n")
+        log_file = os.path.join(tmp_dir, "log")
+        monkeypatch.setenv("FAKE_GOES_MESSAGES", messages_file)
+        monkeypatch.setenv("FAKE_GOES_LOG", log_file)
+        factory = GOESIMFV283Factory(
+            cache_directory=os.path.join(tmp_dir, "cache"),
+            directory=tmp_dir,
+            getdcpmessages=FAKE_GETDCPMESSAGES,
+            server=["bad.example.com", "lrgs1.example.com", "lrgs2.example.com"],
+            user="test",
+            password="test",
+        )
+        starttime = UTCDateTime("2014-01-23T01:12:00Z")
+        endtime = UTCDateTime("2014-01-23T01:23:00Z")
+        timeseries = factory.get_timeseries(starttime, endtime, observatory="FRD")
+        assert_equal(timeseries.select(channel="H")[0].stats.npts, 12)
+        with open(log_file) as f:
+            requests = f.read().splitlines()
+        assert_equal(
+            sorted(request.split()[0] for request in requests),
+            ["bad.example.com", "lrgs1.example.com", "lrgs2.example.com"],
+        )
+        # repeated request is read from cache
+        timeseries = factory.get_timeseries(starttime, endtime, observatory="FRD")
+        assert_equal(timeseries.select(channel="H")[0].stats.npts, 12)
+        with open(log_file) as f:
+            assert_equal(len(f.read().splitlines()), 3)
+        # later request only asks for new window
+        factory.get_timeseries(starttime, endtime + 600, observatory="FRD")
+        with open(log_file) as f:
+            requests = f.read().splitlines()[3:]
+        assert_equal(len(requests), 3)
+        for request in requests:
+            assert_equal(
+                request.split()[1:], ["2014-01-23T01:53:00", "2014-01-23T02:03:00"]
+            )
+        # criteria files are removed
+        assert_equal(
+            sorted(name for name in os.listdir(tmp_dir) if name.endswith(".sc")), []
+        )
+
+
+def test_get_timeseries_cache_settle(monkeypatch):
+    """imfv283_test.GOESIMFV283Factory_test.test_get_timeseries_cache_settle()
+
+    Verify windows are requested again until messages have settled,
+    because servers may receive messages late.
+    """
+    with TemporaryDirectory() as tmp_dir:
+        messages_file = os.path.join(tmp_dir, "messages")
+        with open(messages_file, "wb") as f:
+            f.write(IMFV283_EXAMPLE_FRD + b"\n")
+        log_file = os.path.join(tmp_dir, "log")
+        monkeypatch.setenv("FAKE_GOES_MESSAGES", messages_file)
+        monkeypatch.setenv("FAKE_GOES_LOG", log_file)
+        settled = UTCDateTime("2014-01-23T01:00:00Z")
+        factory = GOESIMFV283Factory(
+            cache_directory=os.path.join(tmp_dir, "cache"),
+            cache_settle_time=UTCDateTime() - settled,
+            directory=tmp_dir,
+            getdcpmessages=FAKE_GETDCPMESSAGES,
+            server=["lrgs1.example.com"],
+            user="test",
+            password="test",
+        )
+        starttime = UTCDateTime("2014-01-23T01:12:00Z")
+        endtime = UTCDateTime("2014-01-23T01:23:00Z")
+        for _ in range(2):
+            timeseries = factory.get_timeseries(starttime, endtime, observatory="FRD")
+            assert_equal(timeseries.select(channel="H")[0].stats.npts, 12)
+        with open(log_file) as f:
+            requests = [request.split()[1:] for request in f.read().splitlines()]
+        assert_equal(requests[0], ["2014-01-23T00:35:20", "2014-01-23T01:53:00"])
+        # only the window before settled is cached, settled moves with time
+        assert_equal(requests[1][0][:16], "2014-01-23T01:00")
+        assert_equal(requests[1][1], "2014-01-23T01:53:00")
+        assert_equal(len(requests), 2)
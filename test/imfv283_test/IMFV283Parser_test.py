@@ -1,6 +1,7 @@
 """Tests for the IMFV283 Parser class."""
 from __future__ import unicode_literals
 
+import numpy
 from numpy.testing import assert_equal
 from obspy import UTCDateTime
 
@@ -34,11 +35,35 @@ def test_parse_msg_header():
 
 def test_parse_goes_header():
     """imfv283_test.IMFV283Parser_test.test_parse_goes_header()"""
-    goes_data = IMFV283Parser()._process_ness_block(
-        IMFV283_EXAMPLE_VIC, imfv283_codes.OBSERVATORIES["VIC"], 191
+    parser = IMFV283Parser()
+    goes_data = parser._process_ness_blocks(
+        numpy.frombuffer(IMFV283_EXAMPLE_VIC[38:227], dtype=numpy.uint8),
+        swap_hdr=numpy.array([imfv283_codes.OBSERVATORIES["VIC"]["swap_hdr"]]),
+        swap_data=numpy.array([imfv283_codes.OBSERVATORIES["VIC"]["swap_data"]]),
     )
-    goes_header = IMFV283Parser()._parse_goes_header(goes_data)
-    assert_equal(goes_header["day"], 23)
+    goes_header = parser._parse_goes_headers(goes_data)
+    assert_equal(goes_header["day"], [23])
+    assert_equal(goes_header["minute"], [73])
+    assert_equal(goes_header["orient"], [0])
+    assert_equal(goes_header["scale"], [[1, 1, 1, 1]])
+
+
+def test_parse():
+    """imfv283_test.IMFV283Parser_test.test_parse()
+
+    Parse messages from two observatories together, and verify each message
+    is decoded using its own observatory settings.
+    """
+    parser = IMFV283Parser()
+    parser.parse(IMFV283_EXAMPLE_VIC + b"\n" + IMFV283_EXAMPLE_FRD + b"\n")
+    stream = parser.stream
+    assert_equal(len(stream), 8)
+    vic_x = stream.select(station="VIC", channel="X")[0]
+    assert_equal(vic_x.stats.starttime, UTCDateTime("2014-01-23T01:13:00Z"))
+    assert_equal(vic_x.data[:3], [18083.1, 18082.3, 18082.7])
+    frd_e = stream.select(station="FRD", channel="E")[0]
+    assert_equal(frd_e.stats.starttime, UTCDateTime("2014-01-23T01:12:00Z"))
+    assert_equal(frd_e.data[-3:], [-266.8, -267.3, -267.7])
 
 
 def test_estimate_data_time__correct_doy():
@@ -0,0 +1,56 @@
+#! /usr/bin/env python
+"""Stand in for the getDcpMessages command line tool.
+
+Prints messages from the file named by the FAKE_GOES_MESSAGES environment
+variable, that were transmitted during the window in the criteria file.
+Each request is appended to the file named by FAKE_GOES_LOG, as
+"host DAPS_SINCE DAPS_UNTIL".
+Hosts that start with "bad" fail the same way getDcpMessages does when it
+cannot connect.
+"""
+import argparse
+from datetime import datetime
+import os
+import sys
+
+
+def parse_time(value):
+    return datetime.strptime(value.strip(), "%y/%j %H:%M:%S")
+
+
+def main():
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("-h", dest="host")
+    parser.add_argument("-u", dest="user")
+    parser.add_argument("-P", dest="password")
+    parser.add_argument("-f", dest="criteria_file")
+    parser.add_argument("-t", dest="timeout")
+    parser.add_argument("-n", action="store_true")
+    args = parser.parse_args()
+
+    criteria = {}
+    with open(args.criteria_file) as f:
+        for line in f:
+            if ":" in line and not line.startswith("#"):
+                key, value = line.split(":", 1)
+                criteria[key] = value
+    since = parse_time(criteria["DAPS_SINCE"])
+    until = parse_time(criteria["DAPS_UNTIL"])
+    with open(os.environ["FAKE_GOES_LOG"], "a") as f:
+        f.write("%s %s %s\n" % (args.host, since.isoformat(), until.isoformat()))
+
+    if args.host.startswith("bad"):
+        sys.stderr.write("FATAL: could not connect to %s\n" % args.host)
+        return 1
+    with open(os.environ["FAKE_GOES_MESSAGES"], "rb") as f:
+        messages = f.read().splitlines()
+    for message in messages:
+        transmission = message[8:19].decode()
+        transmit_time = datetime.strptime("20" + transmission, "%Y%j%H%M%S")
+        if since <= transmit_time <= until:
+            sys.stdout.buffer.write(message + b"\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
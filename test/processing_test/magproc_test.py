@@ -0,0 +1,144 @@
+"""Tests for magproc."""
+import os
+
+import numpy
+from numpy.testing import assert_equal
+from obspy.core import Stream, Trace, UTCDateTime
+import pytest
+
+from geomagio.pcdcp import PCDCPFactory, PCDCP_FILE_PATTERN
+from geomagio.TimeseriesFactory import TimeseriesFactory
+
+# magproc command line uses typer
+typer = pytest.importorskip("typer")
+from geomagio.processing import magproc
+
+
+def create_stream(starttime, endtime, delta, channels=("H", "E", "Z", "F")):
+    """Create a stream with one sample every delta seconds.
+
+    Sample values are minutes since the unix epoch.
+    """
+    times = numpy.arange(starttime.timestamp, endtime.timestamp + delta, delta)
+    return Stream(
+        [
+            Trace(
+                times / 60.0,
+                {
+                    "network": "NT",
+                    "station": "BOU",
+                    "channel": channel,
+                    "starttime": starttime,
+                    "delta": delta,
+                },
+            )
+            for channel in channels
+        ]
+    )
+
+
+class FakeFactory(TimeseriesFactory):
+    """Factory that records requests, and returns generated data."""
+
+    def __init__(self, delta):
+        super().__init__()
+        self.delta = delta
+        self.requests = []
+
+    def get_timeseries(self, starttime, endtime, channels=None, **kwargs):
+        self.requests.append((starttime, endtime))
+        return create_stream(starttime, endtime, self.delta, channels=channels)
+
+
+def test_read_timeseries():
+    """processing_test.magproc_test.test_read_timeseries()
+
+    Requests are [start, end - delta], except the last which includes endtime,
+    and are merged into one stream.
+    """
+    starttime = UTCDateTime("2020-01-01T00:00:00Z")
+    endtime = UTCDateTime("2020-01-01T00:09:00Z")
+    factory = FakeFactory(delta=60.0)
+    timeseries = magproc.read_timeseries(
+        factory=factory,
+        starttime=starttime,
+        endtime=endtime,
+        delta=60.0,
+        read_interval=240,
+        channels=["H", "Z"],
+    )
+    assert_equal(
+        factory.requests,
+        [
+            (starttime, starttime + 180),
+            (starttime + 240, starttime + 420),
+            (starttime + 480, endtime),
+        ],
+    )
+    assert_equal([t.stats.channel for t in timeseries], ["H", "Z"])
+    for trace in timeseries:
+        assert_equal(trace.stats.starttime, starttime)
+        assert_equal(trace.stats.endtime, endtime)
+        assert_equal(trace.data, create_stream(starttime, endtime, 60.0)[0].data)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_write_pcdcp_files(tmp_path, max_workers):
+    """processing_test.magproc_test.test_write_pcdcp_files()
+
+    One file is written per day, without samples from the next day.
+    """
+    starttime = UTCDateTime("2020-01-01T00:00:00Z")
+    endtime = UTCDateTime("2020-01-03T00:00:00Z")
+    template = "file://" + str(tmp_path) + "/" + PCDCP_FILE_PATTERN
+    # data includes first sample of next day
+    timeseries = create_stream(starttime, endtime, 60.0)
+    magproc.write_pcdcp_files(
+        starttime=starttime,
+        endtime=endtime,
+        timeseries=timeseries,
+        observatory="BOU",
+        interval="minute",
+        channels=["H", "E", "Z", "F"],
+        template=template,
+        max_workers=max_workers,
+    )
+    assert_equal(sorted(os.listdir(tmp_path)), ["BOU2020001.min", "BOU2020002.min"])
+    factory = PCDCPFactory(urlTemplate=template, urlInterval=86400)
+    for day in [starttime, starttime + 86400]:
+        day_end = day + 86400 - 60
+        with open(tmp_path / ("BOU2020%03d.min" % day.julday)) as f:
+            written = factory.parse_string(f.read())
+        h = written.select(channel="H")[0]
+        assert_equal(h.stats.starttime, day)
+        assert_equal(h.stats.endtime, day_end)
+        assert_equal(h.data, create_stream(day, day_end, 60.0)[0].data)
+
+
+def test_write_pcdcp_files_slices(monkeypatch):
+    """processing_test.magproc_test.test_write_pcdcp_files_slices()
+
+    Each day is written with data from that day only.
+    """
+    starttime = UTCDateTime("2020-01-01T00:00:00Z")
+    endtime = UTCDateTime("2020-01-03T00:00:00Z")
+    written = []
+    monkeypatch.setattr(
+        magproc, "write_pcdcp_file", lambda **kwargs: written.append(kwargs)
+    )
+    magproc.write_pcdcp_files(
+        starttime=starttime,
+        endtime=endtime,
+        timeseries=create_stream(starttime, endtime, 60.0),
+        observatory="BOU",
+        interval="minute",
+        channels=["H", "E", "Z", "F"],
+        max_workers=1,
+    )
+    assert_equal(len(written), 2)
+    for kwargs, day in zip(written, [starttime, starttime + 86400]):
+        assert_equal(kwargs["starttime"], day)
+        assert_equal(kwargs["endtime"], day + 86400)
+        for trace in kwargs["timeseries"]:
+            assert_equal(trace.stats.starttime, day)
+            assert_equal(trace.stats.endtime, day + 86400 - 60)
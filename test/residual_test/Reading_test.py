@@ -0,0 +1,78 @@
+import numpy
+from numpy.testing import assert_equal
+from obspy.core import Stream, Trace, UTCDateTime
+
+from geomagio.residual import (
+    load_ordinates,
+    Measurement,
+    MeasurementType,
+    Reading,
+)
+
+
+class RecordingFactory(object):
+    """Timeseries factory that records requests and returns a ramp."""
+
+    def __init__(self):
+        self.requests = []
+
+    def get_timeseries(self, observatory, channels, interval, type, starttime, endtime):
+        self.requests.append((starttime, endtime))
+        npts = int(endtime - starttime) + 1
+        data = numpy.arange(npts, dtype=numpy.float64) + starttime.timestamp
+        data[1] = numpy.nan
+        return Stream(
+            [
+                Trace(
+                    data.copy(),
+                    {"channel": channel, "starttime": starttime, "delta": 1},
+                )
+                for channel in channels
+            ]
+        )
+
+
+def create_reading(*times):
+    return Reading(
+        measurements=[
+            Measurement(
+                measurement_type=MeasurementType.WEST_DOWN,
+                time=UTCDateTime(time),
+                angle=1,
+                h=-1,
+            )
+            for time in times
+        ]
+    )
+
+
+def test_load_ordinates():
+    """residual_test.Reading_test.test_load_ordinates()
+
+    Verify nearby readings are loaded with one request,
+    and values are looked up by measurement time.
+    """
+    readings = [
+        create_reading("2020-01-01T00:00:00Z", "2020-01-01T00:10:00Z"),
+        create_reading("2020-01-01T00:30:00Z", "2020-01-01T00:40:00Z"),
+        create_reading("2020-01-02T00:00:00Z", "2020-01-02T00:00:01Z"),
+        Reading(),
+    ]
+    factory = RecordingFactory()
+    load_ordinates(readings, "BOU", factory)
+    assert_equal(
+        factory.requests,
+        [
+            (UTCDateTime("2020-01-01T00:00:00Z"), UTCDateTime("2020-01-01T00:40:00Z")),
+            (UTCDateTime("2020-01-02T00:00:00Z"), UTCDateTime("2020-01-02T00:00:01Z")),
+        ],
+    )
+    for reading in readings[:2]:
+        for measurement in reading.measurements:
+            assert_equal(measurement.h, measurement.time.timestamp)
+            assert_equal(measurement.f, measurement.time.timestamp)
+    # NaN keeps existing value, unless default_existing is False
+    assert_equal([m.h for m in readings[2].measurements], [1577923200, -1])
+    readings[2].load_ordinates("BOU", factory, default_existing=False)
+    assert_equal([m.h for m in readings[2].measurements], [1577923200, None])
+    assert_equal(len(factory.requests), 3)
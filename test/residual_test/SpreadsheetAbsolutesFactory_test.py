@@ -0,0 +1,43 @@
+import os
+import shutil
+
+from numpy.testing import assert_equal
+from obspy.core import UTCDateTime
+
+from geomagio.residual import SpreadsheetAbsolutesFactory
+
+
+def test_get_readings_cache(tmpdir, monkeypatch):
+    """residual_test.SpreadsheetAbsolutesFactory_test.test_get_readings_cache()
+
+    Verify readings are cached, and spreadsheets are parsed again after they
+    change.
+    """
+    directory = tmpdir.mkdir("DED").mkdir("2014").mkdir("DED")
+    for filename in ["DED-20140952332.xlsm", "DED-20140960000.xlsm"]:
+        shutil.copy("etc/residual/DED-20140952332.xlsm", str(directory / filename))
+    factory = SpreadsheetAbsolutesFactory(
+        base_directory=str(tmpdir), cache_directory=str(tmpdir / "cache")
+    )
+    starttime = UTCDateTime("2014-04-05T00:00:00Z")
+    endtime = UTCDateTime("2014-04-07T00:00:00Z")
+    readings = factory.get_readings("DED", starttime, endtime)
+    assert_equal(len(readings), 2)
+    assert_equal(len(os.listdir(str(tmpdir / "cache"))), 2)
+    # cached readings are not parsed
+    parsed = []
+    parse_spreadsheet = SpreadsheetAbsolutesFactory.parse_spreadsheet
+
+    def record_parse(self, path, include_measurements=True):
+        parsed.append(os.path.basename(path))
+        return parse_spreadsheet(self, path, include_measurements)
+
+    monkeypatch.setattr(SpreadsheetAbsolutesFactory, "parse_spreadsheet", record_parse)
+    cached = factory.get_readings("DED", starttime, endtime)
+    assert_equal(parsed, [])
+    assert_equal([r.json() for r in cached], [r.json() for r in readings])
+    # changed spreadsheets are parsed again
+    os.utime(str(directory / "DED-20140960000.xlsm"), (0, 0))
+    updated = factory.get_readings("DED", starttime, endtime)
+    assert_equal(parsed, ["DED-20140960000.xlsm"])
+    assert_equal([r.json() for r in updated], [r.json() for r in readings])
@@ -0,0 +1,133 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+import json
+import os
+import threading
+from urllib.parse import parse_qs, urlparse
+
+from numpy.testing import assert_equal
+from obspy.core import UTCDateTime
+import pytest
+
+from geomagio.residual import WebAbsolutesFactory
+
+
+def create_observation(time):
+    return {
+        "time": time,
+        "reviewed": "Y",
+        "electronics": {"serial": "0110"},
+        "theodolite": {"serial": "109648"},
+        "mark": {"name": "AZ", "azimuth": 199.1383},
+        "pier": {"name": "MainPCDCP", "correction": -22},
+        "observer": "Observer",
+        "reviewer": "Reviewer",
+        "readings": [
+            {
+                "H": {
+                    "absolute": 20000.0,
+                    "baseline": 100.0,
+                    "start": time,
+                    "end": time,
+                    "valid": True,
+                }
+            }
+        ],
+    }
+
+
+OBSERVATIONS = [
+    create_observation(time)
+    for time in [
+        "2019-01-05T00:00:00Z",
+        "2019-01-31T00:00:00Z",
+        "2019-02-10T00:00:00Z",
+        "2019-03-20T00:00:00Z",
+        "2019-05-01T00:00:00Z",
+    ]
+]
+
+
+class AbsolutesHandler(BaseHTTPRequestHandler):
+    """Serve OBSERVATIONS between starttime and endtime, in small chunks."""
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        self.server.requests.append(query)
+        starttime = UTCDateTime(query["starttime"][0])
+        endtime = UTCDateTime(query["endtime"][0])
+        data = [
+            o for o in OBSERVATIONS if starttime <= UTCDateTime(o["time"]) <= endtime
+        ]
+        body = json.dumps({"data": data}).encode("utf8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        for i in range(0, len(body), 100):
+            self.wfile.write(body[i : i + 100])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), AbsolutesHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_readings(server, tmpdir):
+    """residual_test.WebAbsolutesFactory_test.test_get_readings()
+
+    Verify ranges are split into aligned requests, and reviewed windows are
+    cached.
+    """
+    factory = WebAbsolutesFactory(
+        url=f"http://127.0.0.1:{server.server_port}/observation.json.php",
+        cache_directory=str(tmpdir),
+        request_interval=30 * 86400,
+    )
+    starttime = UTCDateTime("2019-01-10T00:00:00Z")
+    endtime = UTCDateTime("2019-04-01T00:00:00Z")
+    readings = factory.get_readings("BOU", starttime, endtime)
+    assert_equal(
+        [r.metadata["time"] for r in readings],
+        ["2019-01-31T00:00:00Z", "2019-02-10T00:00:00Z", "2019-03-20T00:00:00Z"],
+    )
+    assert_equal(readings[0].absolutes[0].baseline, 100.0)
+    assert_equal(readings[0].pier_correction, -22)
+    # 30 day windows aligned to the epoch
+    assert_equal(
+        sorted(r["starttime"][0] for r in server.requests),
+        [
+            "2018-12-15T00:00:00",
+            "2019-01-14T00:00:00",
+            "2019-02-13T00:00:00",
+            "2019-03-15T00:00:00",
+        ],
+    )
+    assert_equal(len(os.listdir(str(tmpdir / "BOU"))), 4)
+    # reviewed windows are read from cache
+    cached = factory.get_readings("BOU", starttime, endtime)
+    assert_equal(len(server.requests), 4)
+    assert_equal([r.json() for r in cached], [r.json() for r in readings])
+
+
+def test_parse_json():
+    """residual_test.WebAbsolutesFactory_test.test_parse_json()"""
+    jsonstr = json.dumps({"data": OBSERVATIONS[:2], "count": 2})
+    readings = WebAbsolutesFactory().parse_json(io.StringIO(jsonstr))
+    assert_equal(
+        [r.metadata["time"] for r in readings],
+        ["2019-01-05T00:00:00Z", "2019-01-31T00:00:00Z"],
+    )
+    # incomplete json
+    for length in [7, 50]:
+        with pytest.raises(ValueError):
+            list(WebAbsolutesFactory().parse_json_chunks([jsonstr[:length]]))
@@ -1,9 +1,10 @@
-from numpy.testing import assert_almost_equal
+from numpy.testing import assert_almost_equal, assert_equal
 import pytest
 
 from obspy.core import UTCDateTime
 from geomagio.residual import (
     calculate,
+    calculate_many,
     Reading,
     SpreadsheetAbsolutesFactory,
     WebAbsolutesFactory,
@@ -95,6 +96,26 @@ def test_BRW_20133650000():
     )
 
 
+def test_calculate_many():
+    """
+    Compare batch calculations to calculations for each reading.
+    """
+    readings = [
+        get_spreadsheet_absolutes(path="etc/residual/DED-20140952332.xlsm"),
+        get_spreadsheet_absolutes(path="etc/residual/BRW-20133650000.xlsm"),
+    ]
+    for adjust_reference in [True, False]:
+        calculated = calculate_many(readings, adjust_reference=adjust_reference)
+        for reading, actual in zip(readings, calculated):
+            expected = calculate(reading, adjust_reference=adjust_reference)
+            assert_readings_equal(expected=expected, actual=actual, decimal=6)
+            assert_equal(
+                [(a.starttime, a.endtime, a.shift) for a in actual.absolutes],
+                [(a.starttime, a.endtime, a.shift) for a in expected.absolutes],
+            )
+    assert_equal(calculate_many([]), [])
+
+
 def test_BOU_20190702():
     """
     Compare calulations to original absolutes obejct from web absolutes.